@@ -0,0 +1,103 @@
+"""
+Benchmark of the binary block codec against the JSON storage encoding.
+Compares encode/decode throughput and encoded size on generated blocks.
+
+Run from the repository root:
+    python -m benchmarks.codec_benchmark --blocks 200 --transactions 20
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from core.blockchain.block import Block, BlockBuilder
+from core.blockchain.codec import decode_block, encode_block
+from core.blockchain.transaction import TransactionBuilder
+
+
+def build_blocks(count: int, transactions: int) -> List[Block]:
+    """
+    Build a linked sample of blocks of journal entries.
+
+    Args:
+        count: Number of blocks
+        transactions: Transactions per block
+
+    Returns:
+        List of blocks
+    """
+    blocks = []
+    previous_hash = "0" * 64
+    for index in range(count):
+        builder = BlockBuilder(index=index).set_previous_hash(previous_hash).set_created_by("0xabc")
+        for i in range(transactions):
+            builder.add_transaction(TransactionBuilder()
+                                    .set_type("journal_entry")
+                                    .set_module("accounting")
+                                    .set_data({"entry": i, "account": "1000", "amount": 125.5})
+                                    .set_wallet("0xabc")
+                                    .set_signature("signature")
+                                    .build())
+        block = builder.build()
+        previous_hash = block.block_hash
+        blocks.append(block)
+    return blocks
+
+
+def benchmark(blocks: List[Block], rounds: int = 5) -> Dict[str, Any]:
+    """
+    Compare encode/decode throughput and size against the JSON encoding
+    currently used for storage.
+
+    Args:
+        blocks: Sample blocks
+        rounds: Number of passes over the sample
+
+    Returns:
+        Dictionary with blocks per second and total bytes per encoding
+    """
+    def measure(encode, decode) -> Dict[str, Any]:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            payloads = [encode(block) for block in blocks]
+        encode_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for payload in payloads:
+                decode(payload)
+        decode_seconds = time.perf_counter() - started
+
+        count = len(blocks) * rounds
+        return {
+            "bytes": sum(len(payload) for payload in payloads),
+            "encode_blocks_per_second": count / encode_seconds if encode_seconds else 0.0,
+            "decode_blocks_per_second": count / decode_seconds if decode_seconds else 0.0,
+        }
+
+    results = {
+        "json": measure(
+            lambda block: json.dumps(block.to_dict(), separators=(',', ':'),
+                                     ensure_ascii=False).encode('utf-8'),
+            lambda payload: Block.from_dict(json.loads(payload))),
+        "binary": measure(encode_block, decode_block),
+    }
+    json_bytes = results["json"]["bytes"]
+    results["size_ratio"] = results["binary"]["bytes"] / json_bytes if json_bytes else 0.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark(build_blocks(args.blocks, args.transactions), args.rounds)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
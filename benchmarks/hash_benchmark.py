@@ -0,0 +1,97 @@
+"""
+Benchmark of the supported hash algorithms.
+Measures hashing of pre-encoded payloads, encoding plus hashing (as a
+transaction hash is computed) and building a Merkle root over the payload
+hashes, on the hashed fields of generated transactions.
+
+Run from the repository root:
+    python -m benchmarks.hash_benchmark --payloads 10000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from core.blockchain.hash_utils import HASH_ALGORITHMS, HashUtils
+from core.blockchain.merkle_tree import MerkleTree, MERKLE_SCHEME_BINARY
+from core.blockchain.transaction import HASHED_FIELDS, TransactionBuilder
+
+
+def build_payloads(count: int) -> List[Dict[str, Any]]:
+    """
+    Build the hashed fields of sample journal entries.
+
+    Args:
+        count: Number of payloads
+
+    Returns:
+        List of dictionaries as hashed for a transaction
+    """
+    payloads = []
+    for i in range(count):
+        transaction = TransactionBuilder() \
+            .set_type("journal_entry") \
+            .set_module("accounting") \
+            .set_data({"entry": i, "account": "1000", "amount": 125.5}) \
+            .set_wallet("0xabc") \
+            .set_signature("signature") \
+            .build()
+        payloads.append({key: value for key, value in transaction.to_dict().items()
+                         if key in HASHED_FIELDS})
+    return payloads
+
+
+def benchmark(payloads: List[Dict[str, Any]], rounds: int = 5) -> Dict[str, Any]:
+    """
+    Compare the hash algorithms on sample payloads.
+
+    Args:
+        payloads: Sample dictionaries, e.g. the hashed fields of transactions
+        rounds: Number of passes over the sample
+
+    Returns:
+        Dictionary with throughput numbers per algorithm
+    """
+    encoded = [HashUtils.canonical_bytes(payload) for payload in payloads]
+    total_bytes = sum(len(data) for data in encoded) * rounds
+    count = len(payloads) * rounds
+
+    results: Dict[str, Any] = {"payloads": len(payloads), "average_bytes": total_bytes / count if count else 0}
+    for algorithm in HASH_ALGORITHMS:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            hashes = [HashUtils.hash_bytes(data, algorithm) for data in encoded]
+        hash_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for payload in payloads:
+                HashUtils.hash_dict(payload, algorithm)
+        dict_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            MerkleTree(hashes, MERKLE_SCHEME_BINARY, algorithm)
+        merkle_seconds = time.perf_counter() - started
+
+        results[algorithm] = {
+            "hashes_per_second": count / hash_seconds if hash_seconds else 0.0,
+            "megabytes_per_second": total_bytes / hash_seconds / 1e6 if hash_seconds else 0.0,
+            "encoded_hashes_per_second": count / dict_seconds if dict_seconds else 0.0,
+            "merkle_roots_per_second": rounds / merkle_seconds if merkle_seconds else 0.0,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--payloads", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(build_payloads(args.payloads), args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
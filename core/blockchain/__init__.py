@@ -4,23 +4,34 @@ Blockchain module for Web3 Accounting & Audit System.
 This module provides the core blockchain functionality including:
 - Block and transaction structures
 - Chain management and validation
-- Merkle tree for efficient verification
-- Cryptographic hashing utilities
+- Merkle tree over raw digests for efficient verification
+- Cryptographic hashing utilities (SHA-256 or BLAKE2b per chain)
 - Genesis block creation
+- Compact binary codec for blocks and transactions
+- Parallel batch hashing for bulk transaction intake
+- Sealed, read-only blocks with memoized integrity checks
 """
 
-from .hash_utils import HashUtils
-from .merkle_tree import MerkleTree, MerkleNode
+from .hash_utils import HashUtils, HASH_SHA256, HASH_BLAKE2B
+from .merkle_tree import MerkleTree, MerkleNode, MerkleMultiproof, MERKLE_SCHEME_HEX, MERKLE_SCHEME_BINARY
 from .transaction import Transaction, TransactionBuilder
 from .block import Block, BlockBuilder
 from .chain import Blockchain
 from .validator import BlockchainValidator, ValidationError, SecurityValidator
 from .genesis import GenesisBlockCreator
+from .codec import CodecError, CODEC_VERSION
+from .batch_hashing import TransactionBatchHasher
+from .immutable import ImmutableError
 
 __all__ = [
     'HashUtils',
+    'HASH_SHA256',
+    'HASH_BLAKE2B',
     'MerkleTree',
     'MerkleNode',
+    'MerkleMultiproof',
+    'MERKLE_SCHEME_HEX',
+    'MERKLE_SCHEME_BINARY',
     'Transaction',
     'TransactionBuilder',
     'Block',
@@ -30,6 +41,10 @@ __all__ = [
     'ValidationError',
     'SecurityValidator',
     'GenesisBlockCreator',
+    'CodecError',
+    'CODEC_VERSION',
+    'TransactionBatchHasher',
+    'ImmutableError',
 ]
 
 __version__ = '1.0.0'
@@ -4,18 +4,37 @@ Each block contains multiple transactions and is linked to the previous block.
 """
 
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field, asdict
+from typing import Iterable, List, Dict, Any, Optional
+from dataclasses import dataclass, field, fields, asdict
 from .transaction import Transaction
-from .merkle_tree import MerkleTree
-from .hash_utils import HashUtils
+from .immutable import FrozenList, ImmutableError, freeze, thaw
+from .merkle_tree import (MerkleTree, MerkleMultiproof, IncrementalMerkleBuilder,
+                          MERKLE_SCHEME_BINARY, MERKLE_SCHEME_HEX)
+from .hash_utils import HashUtils, HASH_SHA256, HASH_BLAKE2B
+
+
+# Merkle hashing scheme and hash algorithm of each block version
+BLOCK_VERSIONS = {
+    "1.0.0": (MERKLE_SCHEME_HEX, HASH_SHA256),
+    "1.1.0": (MERKLE_SCHEME_BINARY, HASH_SHA256),
+    "2.0.0": (MERKLE_SCHEME_BINARY, HASH_BLAKE2B),
+}
+
+# Version new chains use for each hash algorithm
+DEFAULT_BLOCK_VERSIONS = {
+    HASH_SHA256: "1.0.0",
+    HASH_BLAKE2B: "2.0.0",
+}
 
 
 @dataclass
 class Block:
     """
     Represents a single block in the blockchain.
-    Blocks are immutable once added to the chain.
+    Blocks are immutable once added to the chain: the chain seals them,
+    which freezes their fields and transactions and memoizes the result of
+    verify_integrity, so repeated integrity checks cost O(1) until a deep
+    verification is requested.
     """
 
     # Block identification
@@ -38,11 +57,44 @@ class Block:
 
     def __post_init__(self):
         """Calculate block hash and merkle root after initialization."""
+        self._assign_hash_algorithm()
         if not self.merkle_root and self.transactions:
             self.merkle_root = self._calculate_merkle_root()
         if not self.block_hash:
             self.block_hash = self._calculate_hash()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute unless the block is sealed."""
+        if '_sealed' in self.__dict__:
+            raise ImmutableError(f"Block {self.index} is sealed; cannot set {name}")
+        object.__setattr__(self, name, value)
+
+    @property
+    def sealed(self) -> bool:
+        """Whether the block has been sealed."""
+        return '_sealed' in self.__dict__
+
+    def seal(self, verified: Optional[bool] = None) -> 'Block':
+        """
+        Make the block and its transactions immutable.
+
+        Args:
+            verified: Known result of verify_integrity for the current
+                contents (None leaves it to be computed on first use)
+
+        Returns:
+            The block
+        """
+        if '_sealed' not in self.__dict__:
+            for tx in self.transactions:
+                tx.seal()
+            object.__setattr__(self, 'transactions', FrozenList(self.transactions))
+            object.__setattr__(self, 'metadata', freeze(self.metadata))
+            self.__dict__['_sealed'] = True
+        if verified is not None:
+            self.__dict__['_integrity'] = verified
+        return self
+
     def _calculate_merkle_root(self) -> Optional[str]:
         """
         Calculate Merkle root of all transactions in the block.
@@ -58,12 +110,33 @@ class Block:
         if not transaction_hashes:
             return None
 
-        merkle_tree = MerkleTree(transaction_hashes)
+        try:
+            merkle_tree = MerkleTree(transaction_hashes, self.merkle_scheme, self.hash_algorithm)
+        except ValueError:
+            # Malformed transaction hashes have no root
+            return None
         return merkle_tree.get_root_hash()
 
+    @property
+    def merkle_scheme(self) -> str:
+        """Merkle hashing scheme used by this block's version."""
+        return BLOCK_VERSIONS.get(self.version, (MERKLE_SCHEME_BINARY, HASH_SHA256))[0]
+
+    @property
+    def hash_algorithm(self) -> str:
+        """Hash algorithm used by this block's version."""
+        return BLOCK_VERSIONS.get(self.version, (MERKLE_SCHEME_BINARY, HASH_SHA256))[1]
+
+    def _assign_hash_algorithm(self) -> None:
+        """Make the block's transactions hash with the block's algorithm."""
+        algorithm = self.hash_algorithm
+        for tx in self.transactions:
+            if tx.hash_algorithm != algorithm:
+                tx.hash_algorithm = algorithm
+
     def _calculate_hash(self) -> str:
         """
-        Calculate SHA-256 hash of the block.
+        Calculate hash of the block with its version's algorithm.
 
         Returns:
             Block hash
@@ -79,7 +152,7 @@ class Block:
             'transaction_count': len(self.transactions)
         }
 
-        return HashUtils.hash_dict(hash_data)
+        return HashUtils.hash_dict(hash_data, self.hash_algorithm)
 
     def recalculate_hash(self) -> str:
         """
@@ -93,32 +166,112 @@ class Block:
         self.block_hash = self._calculate_hash()
         return self.block_hash
 
-    def add_transaction(self, transaction: Transaction) -> bool:
+    def _merkle_builder(self) -> Optional[IncrementalMerkleBuilder]:
+        """
+        Get an incremental Merkle builder holding the current transactions.
+        The builder is kept between calls while transactions are only
+        appended through add_transaction.
+
+        Returns:
+            Builder or None if a transaction hash is malformed
+        """
+        cached = self.__dict__.get('_merkle_frontier')
+        if cached is not None and cached[0] == self._frontier_key():
+            return cached[1]
+
+        builder = IncrementalMerkleBuilder(self.merkle_scheme, self.hash_algorithm)
+        try:
+            for tx in self.transactions:
+                if tx.transaction_hash:
+                    builder.add(tx.transaction_hash)
+        except ValueError:
+            return None
+
+        self.__dict__['_merkle_frontier'] = (self._frontier_key(), builder)
+        return builder
+
+    def _frontier_key(self) -> tuple:
+        """Identify the transaction list state a Merkle builder was made for."""
+        return id(self.transactions), len(self.transactions), self.version
+
+    def add_transaction(self, transaction: Transaction, update_hash: bool = True) -> bool:
         """
         Add a transaction to the block.
+        The Merkle root is extended incrementally (O(log n) hashes).
 
         Args:
             transaction: Transaction to add
+            update_hash: Update the Merkle root and block hash now (False
+                defers them to finalize_hash, e.g. while building a block)
 
         Returns:
             True if added successfully
         """
-        # Verify transaction integrity
-        if not transaction.verify_integrity():
+        if '_sealed' in self.__dict__:
+            raise ImmutableError(f"Block {self.index} is sealed; cannot add transactions")
+
+        # Transactions must be hashed with the block's algorithm
+        if transaction.hash_algorithm != self.hash_algorithm:
             return False
 
+        # Verify transaction integrity (re-serialized, since the payload may
+        # have been changed in place since the hash was cached)
+        if not transaction.verify_integrity(deep=True):
+            return False
+
+        builder = self._merkle_builder()
         self.transactions.append(transaction)
-        self.recalculate_hash()
+        if builder is None:
+            self.recalculate_hash()
+            return True
+
+        builder.add(transaction.transaction_hash)
+        self.__dict__['_merkle_frontier'] = (self._frontier_key(), builder)
+        if update_hash:
+            self.finalize_hash()
         return True
 
-    def verify_integrity(self) -> bool:
+    def finalize_hash(self) -> str:
+        """
+        Set the Merkle root and block hash from the incremental builder.
+        Equivalent to recalculate_hash without rebuilding the Merkle tree.
+
+        Returns:
+            New block hash
+        """
+        builder = self._merkle_builder()
+        if builder is None:
+            return self.recalculate_hash()
+
+        self.merkle_root = builder.get_root_hash()
+        self.block_hash = self._calculate_hash()
+        return self.block_hash
+
+    def verify_integrity(self, deep: bool = False) -> bool:
         """
         Verify block integrity.
-        Checks hash validity and transaction integrity.
+        Checks hash validity and transaction integrity. The result for a
+        sealed block is memoized; a deep verification always recomputes it.
+
+        Args:
+            deep: Re-serialize every transaction instead of using cached hashes
 
         Returns:
             True if block is valid
         """
+        sealed = '_sealed' in self.__dict__
+        if sealed and not deep:
+            verified = self.__dict__.get('_integrity')
+            if verified is not None:
+                return verified
+
+        verified = self._check_integrity(deep)
+        if sealed:
+            self.__dict__['_integrity'] = verified
+        return verified
+
+    def _check_integrity(self, deep: bool) -> bool:
+        """Recompute the block hash, Merkle root and transaction hashes."""
         # Verify block hash
         expected_hash = self._calculate_hash()
         if self.block_hash != expected_hash:
@@ -131,11 +284,68 @@ class Block:
 
         # Verify all transactions
         for tx in self.transactions:
-            if not tx.verify_integrity():
+            if not tx.verify_integrity(deep=deep):
                 return False
 
         return True
 
+    def get_merkle_tree(self) -> Optional[MerkleTree]:
+        """
+        Get the Merkle tree of the block's transactions.
+        The tree is kept until the block's Merkle root changes.
+
+        Returns:
+            Merkle tree or None if the transactions have no valid tree
+        """
+        cached = self.__dict__.get('_merkle_tree')
+        if cached is not None and cached[0] == (self.merkle_root, self.version, len(self.transactions)):
+            return cached[1]
+
+        transaction_hashes = [tx.transaction_hash for tx in self.transactions if tx.transaction_hash]
+        if not transaction_hashes:
+            return None
+        try:
+            merkle_tree = MerkleTree(transaction_hashes, self.merkle_scheme, self.hash_algorithm)
+        except ValueError:
+            return None
+
+        self.__dict__['_merkle_tree'] = ((self.merkle_root, self.version, len(self.transactions)), merkle_tree)
+        return merkle_tree
+
+    def get_transaction_proofs(self, transaction_hashes: Optional[Iterable[str]] = None) -> Dict[str, List[tuple]]:
+        """
+        Get Merkle inclusion proofs for transactions in this block.
+
+        Args:
+            transaction_hashes: Hashes to prove (None = every transaction)
+
+        Returns:
+            Dictionary of transaction hash to proof path, for the
+            transactions found in the block
+        """
+        merkle_tree = self.get_merkle_tree()
+        if merkle_tree is None or merkle_tree.get_root_hash() != self.merkle_root:
+            return {}
+
+        proofs = merkle_tree.get_proofs(transaction_hashes)
+        return {tx_hash: proof for tx_hash, proof in proofs.items()
+                if merkle_tree.get_leaf_index(tx_hash) is not None}
+
+    def get_transaction_multiproof(self, transaction_hashes: Iterable[str]) -> Optional[MerkleMultiproof]:
+        """
+        Get a single Merkle proof covering several transactions in this block.
+
+        Args:
+            transaction_hashes: Hashes to prove
+
+        Returns:
+            Multiproof or None if a transaction is not in the block
+        """
+        merkle_tree = self.get_merkle_tree()
+        if merkle_tree is None or merkle_tree.get_root_hash() != self.merkle_root:
+            return None
+        return merkle_tree.get_multiproof(transaction_hashes)
+
     def verify_transaction_inclusion(self, transaction_hash: str) -> bool:
         """
         Verify that a transaction is included in this block.
@@ -146,14 +356,13 @@ class Block:
         Returns:
             True if transaction is in the block
         """
-        if not self.transactions:
+        merkle_tree = self.get_merkle_tree()
+        if merkle_tree is None or merkle_tree.get_leaf_index(transaction_hash) is None:
             return False
 
-        transaction_hashes = [tx.transaction_hash for tx in self.transactions if tx.transaction_hash]
-        merkle_tree = MerkleTree(transaction_hashes)
-
         proof = merkle_tree.get_proof(transaction_hash)
-        return MerkleTree.verify_proof(transaction_hash, proof, self.merkle_root)
+        return MerkleTree.verify_proof(transaction_hash, proof, self.merkle_root, self.merkle_scheme,
+                                       self.hash_algorithm)
 
     def get_transaction_count(self) -> int:
         """
@@ -193,13 +402,41 @@ class Block:
         Convert block to dictionary.
 
         Returns:
-            Dictionary representation
+            Dictionary representation (always mutable)
         """
-        data = asdict(self)
+        if '_sealed' in self.__dict__:
+            data = {f.name: None if f.name == 'transactions' else thaw(getattr(self, f.name))
+                    for f in fields(self)}
+        else:
+            data = asdict(self)
         # Convert transaction objects to dicts
         data['transactions'] = [tx.to_dict() for tx in self.transactions]
         return data
 
+    def to_bytes(self) -> bytes:
+        """
+        Encode block with the compact binary codec.
+
+        Returns:
+            Encoded block
+        """
+        from .codec import encode_block
+        return encode_block(self)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'Block':
+        """
+        Decode block from the compact binary codec.
+
+        Args:
+            payload: Encoded block
+
+        Returns:
+            Block instance
+        """
+        from .codec import decode_block
+        return decode_block(payload)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Block':
         """
@@ -217,6 +454,7 @@ class Block:
 
         block = cls(**data)
         block.transactions = transactions
+        block._assign_hash_algorithm()
         return block
 
     def __repr__(self) -> str:
@@ -250,14 +488,19 @@ class BlockBuilder:
         return self
 
     def add_transaction(self, transaction: Transaction) -> 'BlockBuilder':
-        """Add a transaction to the block."""
-        self._block.add_transaction(transaction)
+        """Add a transaction to the block (hashes are finalized in build)."""
+        self._block.add_transaction(transaction, update_hash=False)
         return self
 
     def add_transactions(self, transactions: List[Transaction]) -> 'BlockBuilder':
-        """Add multiple transactions to the block."""
+        """Add multiple transactions to the block (hashes are finalized in build)."""
         for tx in transactions:
-            self._block.add_transaction(tx)
+            self._block.add_transaction(tx, update_hash=False)
+        return self
+
+    def set_version(self, version: str) -> 'BlockBuilder':
+        """Set block version (selects the Merkle scheme and hash algorithm)."""
+        self._block.version = version
         return self
 
     def set_metadata(self, metadata: Dict[str, Any]) -> 'BlockBuilder':
@@ -272,5 +515,5 @@ class BlockBuilder:
         Returns:
             Constructed block
         """
-        self._block.recalculate_hash()
+        self._block.finalize_hash()
         return self._block
@@ -4,12 +4,24 @@ Manages the entire blockchain and provides validation.
 """
 
 import json
+import os
 import time
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterator, List, Optional, Dict, Any, Tuple
 from pathlib import Path
-from .block import Block, BlockBuilder
+from .block import Block, BlockBuilder, DEFAULT_BLOCK_VERSIONS
 from .transaction import Transaction
-from .hash_utils import HashUtils
+from .hash_utils import HashUtils, HASH_SHA256
+from ..storage.block_store import BlockStore, SegmentBlockStore
+from ..storage.sqlite_store import SQLiteBlockStore
+from ..storage.mapped_chain import MappedChain
+from ..storage.checkpoint import CheckpointManager, Checkpoint, EMPTY_STATE_DIGEST, advance_state_digest
+from ..storage.durability import FSYNC_INTERVAL
+from ..storage.write_behind import WriteBehindWriter
+from ..storage.parallel_loader import ParallelChainLoader, BlockHeader
+from ..storage.chain_export import ChainImportReader, ExportManifest, export_ndjson, import_ndjson, stage_export
+from ..storage.mmr import MerkleMountainRange, MMRProof
+from ..storage.scrubber import IntegrityScrubber
+from ..storage.tx_index import TransactionIndex, WalletIndex
 
 
 class Blockchain:
@@ -17,21 +29,114 @@ class Blockchain:
     Main blockchain class managing the entire chain.
     """
 
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(self, storage_path: Optional[str] = None, memory_mapped: bool = False,
+                 checkpoint_interval: int = 1000, full_verification: bool = False,
+                 fsync_policy: str = FSYNC_INTERVAL, fsync_interval_ms: float = 50.0,
+                 write_behind: bool = False, write_queue_size: int = 1024,
+                 storage_backend: str = "segment", store: Optional[BlockStore] = None,
+                 compression: Optional[str] = None, load_workers: int = 1,
+                 hash_algorithm: Optional[str] = None):
         """
         Initialize blockchain.
+        Loads any blocks already persisted at the storage path and creates
+        the genesis block for a new chain.
 
         Args:
             storage_path: Path to store blockchain data
+            memory_mapped: Serve blocks from the memory-mapped store instead
+                of keeping the whole chain in memory
+            checkpoint_interval: Number of blocks between verified checkpoints
+            full_verification: Verify every block on load instead of trusting
+                the latest checkpoint
+            fsync_policy: When stored blocks are fsynced ("always", "interval" or "os")
+            fsync_interval_ms: Maximum group commit delay for the "interval" policy
+            write_behind: Persist blocks from a background writer so add_block
+                returns once the block is linked in memory
+            write_queue_size: Maximum number of blocks waiting for the writer
+            storage_backend: Storage engine to use ("segment" or "sqlite")
+            store: Already opened block store (overrides storage_backend)
+            compression: Codec used to compress cold segments of the segment
+                backend ("zlib", "lzma" or None)
+            load_workers: Worker processes used to decode and verify blocks
+                on load and in verify_chain (1 = serial, 0 = one per CPU)
+            hash_algorithm: Hash algorithm of a new chain ("SHA-256" or
+                "BLAKE2b"); an existing chain keeps the algorithm of its
+                genesis block, and a conflicting value raises ValueError
         """
+        if hash_algorithm is not None:
+            HashUtils.get_hasher(hash_algorithm)
+
         self.chain: List[Block] = []
         self.pending_transactions: List[Transaction] = []
+        self.pending_index: Dict[str, Transaction] = {}
         self.storage_path = Path(storage_path) if storage_path else Path("blockchain_data")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        if store is None:
+            store = self._open_store(storage_backend, self.storage_path, fsync_policy,
+                                     fsync_interval_ms, compression)
+        self.store = store
+        self.memory_mapped = memory_mapped
+        self.writer: Optional[WriteBehindWriter] = None
+        self.scrubber: Optional[IntegrityScrubber] = None
+        self.checkpoints = CheckpointManager(str(self.storage_path), interval=checkpoint_interval)
+        self.mmr = MerkleMountainRange(str(self.storage_path / MerkleMountainRange.FILE_NAME))
+        self.tx_index = TransactionIndex(str(self.storage_path / TransactionIndex.FILE_NAME))
+        self.wallet_index = WalletIndex(str(self.storage_path / WalletIndex.FILE_NAME))
+        self.full_verification = full_verification
+        self.load_workers = load_workers if load_workers > 0 else (os.cpu_count() or 1)
+        self.last_load_stats: Dict[str, Any] = {}
+        self.last_validation_stats: Dict[str, Any] = {}
+
+        # Hash algorithm and version of new blocks, taken from genesis once loaded
+        self.hash_algorithm = hash_algorithm or HASH_SHA256
+        self.block_version = DEFAULT_BLOCK_VERSIONS[self.hash_algorithm]
+
+        # Height covered by the trusted checkpoint and digest of all block hashes
+        self.checkpoint_height = -1
+        self.state_digest = EMPTY_STATE_DIGEST
+
+        # Highest heights already verified by verify_chain and by BlockchainValidator.validate_chain
+        self.verified_height = -1
+        self.validated_height = -1
+
+        # Load persisted blocks, creating the genesis block if there are none
+        self.load_chain()
+        if self.chain:
+            genesis = self.chain[0]
+            if hash_algorithm is not None and genesis.hash_algorithm != hash_algorithm:
+                self.close()
+                raise ValueError(f"Chain at {self.storage_path} uses the "
+                                 f"{genesis.hash_algorithm} hash algorithm, not {hash_algorithm}")
+            self.hash_algorithm = genesis.hash_algorithm
+            self.block_version = genesis.version
+
+        # Start the background writer once the store holds the loaded chain
+        if write_behind:
+            self.writer = WriteBehindWriter(self.store, max_queue=write_queue_size)
+
+    @staticmethod
+    def _open_store(storage_backend: str, storage_path: Path, fsync_policy: str = FSYNC_INTERVAL,
+                    fsync_interval_ms: float = 50.0, compression: Optional[str] = None) -> BlockStore:
+        """
+        Open the block store for a storage backend.
 
-        # Create genesis block if chain is empty
-        if not self.chain:
-            self._create_genesis_block()
+        Args:
+            storage_backend: Storage engine ("segment" or "sqlite")
+            storage_path: Blockchain storage directory
+            fsync_policy: When stored blocks are fsynced
+            fsync_interval_ms: Maximum group commit delay for the "interval" policy
+            compression: Codec for cold segments of the segment backend
+
+        Returns:
+            Block store
+        """
+        if storage_backend == "segment":
+            return SegmentBlockStore(str(storage_path), fsync_policy=fsync_policy,
+                                     fsync_interval_ms=fsync_interval_ms, compression=compression)
+        if storage_backend == "sqlite":
+            return SQLiteBlockStore(str(storage_path / "ledger.db"), fsync_policy=fsync_policy)
+
+        raise ValueError(f"Unknown storage backend: {storage_backend}")
 
     def _create_genesis_block(self) -> Block:
         """
@@ -43,15 +148,19 @@ class Blockchain:
         genesis_block = BlockBuilder(index=0) \
             .set_previous_hash("0") \
             .set_created_by("SYSTEM") \
+            .set_version(self.block_version) \
             .set_metadata({
                 "description": "Genesis Block - Web3 Accounting & Audit System",
                 "created_at": time.time(),
-                "version": "1.0.0"
+                "version": "1.0.0",
+                "hash_algorithm": self.hash_algorithm
             }) \
             .build()
+        genesis_block.seal()
 
-        self.chain.append(genesis_block)
         self._save_block(genesis_block)
+        self.chain.append(genesis_block)
+        self.verified_height = 0
         return genesis_block
 
     def get_latest_block(self) -> Block:
@@ -66,6 +175,8 @@ class Blockchain:
     def add_transaction(self, transaction: Transaction) -> bool:
         """
         Add a transaction to the pending transactions pool.
+        Transactions hashed with another algorithm are rehashed with the
+        chain's.
 
         Args:
             transaction: Transaction to add
@@ -73,19 +184,41 @@ class Blockchain:
         Returns:
             True if added successfully
         """
-        # Verify transaction integrity
-        if not transaction.verify_integrity():
+        # Verify transaction integrity (re-serialized, since the payload may
+        # have been changed in place since the hash was cached)
+        if not transaction.verify_integrity(deep=True):
             return False
 
+        rehash = transaction.hash_algorithm != self.hash_algorithm
+        if rehash:
+            transaction.hash_algorithm = self.hash_algorithm
+
         # Link to previous transaction if exists
         if self.pending_transactions:
             last_tx = self.pending_transactions[-1]
             transaction.previous_transaction_hash = last_tx.transaction_hash
+            rehash = True
+
+        if rehash:
             transaction.recalculate_hash()
 
         self.pending_transactions.append(transaction)
+        self.pending_index.setdefault(transaction.transaction_hash, transaction)
+        transaction.set_rehash_callback(self._rekey_pending_transaction)
         return True
 
+    def _rekey_pending_transaction(self, transaction: Transaction, previous_hash: Optional[str]) -> None:
+        """
+        Move a pending transaction to its new hash in the pending index.
+
+        Args:
+            transaction: Rehashed pending transaction
+            previous_hash: Hash it was indexed under
+        """
+        if self.pending_index.get(previous_hash) is transaction:
+            del self.pending_index[previous_hash]
+        self.pending_index.setdefault(transaction.transaction_hash, transaction)
+
     def create_block(self, created_by: str, max_transactions: Optional[int] = None) -> Optional[Block]:
         """
         Create a new block from pending transactions.
@@ -117,15 +250,19 @@ class Blockchain:
         new_block = BlockBuilder(index=latest_block.index + 1) \
             .set_previous_hash(latest_block.block_hash) \
             .set_created_by(created_by) \
+            .set_version(self.block_version) \
             .add_transactions(valid_transactions) \
             .build()
 
         # Add block to chain
         if self.add_block(new_block):
             # Remove processed transactions from pending pool
+            processed = {id(tx) for tx in valid_transactions}
+            self.pending_transactions[:] = [tx for tx in self.pending_transactions if id(tx) not in processed]
             for tx in valid_transactions:
-                if tx in self.pending_transactions:
-                    self.pending_transactions.remove(tx)
+                tx.set_rehash_callback(None)
+                if self.pending_index.get(tx.transaction_hash) is tx:
+                    del self.pending_index[tx.transaction_hash]
             return new_block
 
         return None
@@ -140,8 +277,12 @@ class Blockchain:
         Returns:
             True if added successfully
         """
-        # Verify block integrity
-        if not block.verify_integrity():
+        # Blocks must use the chain's hash algorithm
+        if block.hash_algorithm != self.hash_algorithm:
+            return False
+
+        # Verify block integrity, re-serializing transactions before the block is sealed
+        if not block.verify_integrity(deep=True):
             return False
 
         # Verify previous hash matches
@@ -153,14 +294,39 @@ class Blockchain:
         if block.index != latest_block.index + 1:
             return False
 
-        # Add block to chain
-        self.chain.append(block)
+        # Seal the verified block, persist it, then add it to chain
+        block.seal(verified=True)
         self._save_block(block)
+        self.chain.append(block)
+        self._advance_verified_height(block.index)
         return True
 
-    def verify_chain(self) -> bool:
+    def _advance_verified_height(self, index: int) -> None:
+        """
+        Move the verified-height watermark past a block that was verified
+        and linked to its predecessor as it was appended.
+
+        Args:
+            index: Index of the appended block
+        """
+        if self.verified_height == index - 1:
+            self.verified_height = index
+
+    def verify_chain(self, full: bool = False, workers: Optional[int] = None) -> bool:
         """
-        Verify the entire blockchain integrity.
+        Verify the blockchain integrity.
+        Only blocks above the verified-height watermark (or the trusted
+        checkpoint, if higher) are checked, along with their linkage to the
+        block below them, so repeated calls cost as much as the blocks
+        appended since the last one. A full verification starts again from
+        genesis and also re-checks every checkpoint; if it fails, the
+        checkpoint is no longer trusted.
+        With more than one worker, stored blocks are integrity-checked in a
+        process pool and only the linkage check runs here.
+
+        Args:
+            full: Verify every block from genesis
+            workers: Worker processes to use (defaults to load_workers)
 
         Returns:
             True if chain is valid
@@ -173,21 +339,177 @@ class Blockchain:
         if genesis.index != 0 or genesis.previous_hash != "0":
             return False
 
-        # Verify each block
-        for i in range(len(self.chain)):
+        start = 0 if full else max(self.checkpoint_height, self.verified_height) + 1
+        if start >= len(self.chain):
+            return True
+        workers = self.load_workers if workers is None else workers
+
+        # Verify block integrity
+        if workers > 1:
+            headers = self._verify_blocks_parallel(start, workers)
+        else:
+            headers = self._verify_blocks(start, len(self.chain), deep=full)
+        # Verify chain linkage
+        valid = headers is not None and self._verify_linkage(start, headers, full)
+        if valid:
+            self.verified_height = len(self.chain) - 1
+        elif full:
+            self.checkpoint_height = -1
+            self.verified_height = -1
+        return valid
+
+    def reverify_chain(self, from_disk: bool = False, workers: Optional[int] = None) -> bool:
+        """
+        Run an explicit full re-verification of the chain.
+        Drops the verified-height watermark, re-checks every block and
+        checkpoint from genesis, and optionally re-reads every stored block.
+
+        Args:
+            from_disk: Also deep re-verify the blocks persisted in storage
+            workers: Worker processes to use (defaults to load_workers)
+
+        Returns:
+            True if the whole chain is valid
+        """
+        self.verified_height = -1
+        valid = self.verify_chain(full=True, workers=workers)
+        if from_disk:
+            valid = self.verify_from_disk() and valid
+        return valid
+
+    def verify_from_disk(self, start: int = 0, stop: Optional[int] = None) -> bool:
+        """
+        Deep re-verify persisted blocks by reading them back from storage.
+        Each stored block is decoded afresh, rehashed in full, linked to its
+        predecessor and compared with the block held in memory, whose
+        memoized verification result is replaced by the outcome.
+
+        Args:
+            start: First block index
+            stop: Block index to stop before (defaults to the stored tip)
+
+        Returns:
+            True if every stored block in the range is valid
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+        limit = min(len(self.store), len(self.chain))
+        stop = limit if stop is None else min(stop, limit)
+        previous_hash = self.chain[start - 1].block_hash if 0 < start < stop else None
+
+        valid = True
+        for stored_block in self.store.iter_blocks(start):
+            if stored_block.index >= stop:
+                break
+
+            block = self.chain[stored_block.index]
+            block_valid = stored_block.verify_integrity(deep=True) \
+                and stored_block.block_hash == block.block_hash \
+                and (previous_hash is None or stored_block.previous_hash == previous_hash)
+            if block.sealed:
+                block.seal(verified=block_valid)
+            if not block_valid:
+                # Make the next verify_chain and validate_chain calls reach this block
+                below = stored_block.index - 1
+                self.verified_height = min(self.verified_height, below)
+                self.validated_height = min(self.validated_height, below)
+                self.checkpoint_height = min(self.checkpoint_height, below)
+
+            valid = valid and block_valid
+            previous_hash = stored_block.block_hash
+
+        return valid
+
+    def _verify_blocks(self, start: int, stop: int, deep: bool = False) -> Optional[List[BlockHeader]]:
+        """
+        Integrity-check a range of chain blocks in this process.
+
+        Args:
+            start: First block index
+            stop: Block index to stop before
+            deep: Re-serialize transactions instead of using cached hashes
+
+        Returns:
+            Headers of the verified blocks, or None if one is invalid
+        """
+        headers = []
+        for i in range(start, stop):
             block = self.chain[i]
+            if not block.verify_integrity(deep=deep):
+                return None
+            headers.append((block.index, block.block_hash, block.previous_hash))
+        return headers
 
-            # Verify block integrity
-            if not block.verify_integrity():
-                return False
+    def _verify_blocks_parallel(self, start: int, workers: int) -> Optional[List[BlockHeader]]:
+        """
+        Integrity-check stored blocks in a process pool.
+        Blocks not persisted yet are checked in this process, and stored
+        hashes must match the chain held in memory.
+
+        Args:
+            start: First block index
+            workers: Number of worker processes
+
+        Returns:
+            Headers of the verified blocks, or None if one is invalid
+        """
+        stored = min(len(self.store), len(self.chain))
+        result = ParallelChainLoader(self.store, workers=workers).load(
+            start, stop=stored, verify_from=start, keep_blocks=False)
+        self.last_load_stats = result.get_stats()
+        if not result.valid or len(result.headers) != max(0, stored - start):
+            return None
+
+        if not self.memory_mapped:
+            for index, block_hash, _ in result.headers:
+                if self.chain[index].block_hash != block_hash:
+                    return None
+
+        tail = self._verify_blocks(max(start, stored), len(self.chain))
+        if tail is None:
+            return None
+        return result.headers + tail
+
+    def _verify_linkage(self, start: int, headers: List[BlockHeader], full: bool) -> bool:
+        """
+        Check index and previous-hash linkage of verified blocks, and with
+        full verification the checkpoints against the recomputed chain state.
+
+        Args:
+            start: Index of the first header
+            headers: Headers of consecutive blocks from ``start``
+            full: Whether headers start at genesis and checkpoints are checked
+
+        Returns:
+            True if the blocks link up
+        """
+        checkpoint_heights = set(self.checkpoints.list_heights()) if full else set()
+        state_digest = EMPTY_STATE_DIGEST
+
+        if start > 0:
+            previous_block = self.chain[start - 1]
+            previous = (previous_block.index, previous_block.block_hash)
+        else:
+            previous = None
+
+        for index, block_hash, previous_hash in headers:
+            # Verify checkpoints against the recomputed chain state
+            if full:
+                state_digest = advance_state_digest(state_digest, block_hash)
+                if index in checkpoint_heights:
+                    checkpoint = self.checkpoints.load(index)
+                    if checkpoint is None or checkpoint.tip_hash != block_hash \
+                            or checkpoint.state_digest != state_digest:
+                        return False
 
             # Verify chain linkage (skip genesis)
-            if i > 0:
-                previous_block = self.chain[i - 1]
-                if block.previous_hash != previous_block.block_hash:
+            if previous is not None:
+                if previous_hash != previous[1]:
                     return False
-                if block.index != previous_block.index + 1:
+                if index != previous[0] + 1:
                     return False
+            previous = (index, block_hash)
 
         return True
 
@@ -215,11 +537,223 @@ class Blockchain:
         Returns:
             Block or None if not found
         """
+        if isinstance(self.chain, MappedChain):
+            index = self.chain.index_of_hash(block_hash)
+            return self.chain[index] if index >= 0 else None
+
         for block in self.chain:
             if block.block_hash == block_hash:
                 return block
         return None
 
+    def get_blocks(self, offset: int = 0, limit: int = 10) -> List[Block]:
+        """
+        Get a page of blocks by index range.
+        Only the requested blocks are decoded for memory-mapped chains.
+
+        Args:
+            offset: Index of the first block
+            limit: Maximum number of blocks
+
+        Returns:
+            List of blocks
+        """
+        return list(self.chain[offset:offset + limit])
+
+    def get_inclusion_proofs(self, block_index: int,
+                             transaction_hashes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get Merkle inclusion proofs for transactions of one block.
+        The block's tree is built once and shared by every proof.
+
+        Args:
+            block_index: Index of the block
+            transaction_hashes: Hashes to prove (None = every transaction)
+
+        Returns:
+            Dictionary with the block's Merkle root, its hashing scheme, the
+            proofs by transaction hash and the requested hashes not in the
+            block, or None if the block does not exist
+        """
+        block = self.get_block_by_index(block_index)
+        if block is None:
+            return None
+
+        proofs = block.get_transaction_proofs(transaction_hashes)
+        missing = [tx_hash for tx_hash in (transaction_hashes or []) if tx_hash not in proofs]
+        return {
+            "block_index": block.index,
+            "block_hash": block.block_hash,
+            "merkle_root": block.merkle_root,
+            "merkle_scheme": block.merkle_scheme,
+            "hash_algorithm": block.hash_algorithm,
+            "proofs": proofs,
+            "missing": missing,
+        }
+
+    def get_inclusion_multiproof(self, block_index: int,
+                                 transaction_hashes: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get one Merkle proof covering a sample of a block's transactions.
+        Interior hashes shared by the sampled transactions are sent once.
+
+        Args:
+            block_index: Index of the block
+            transaction_hashes: Hashes to prove
+
+        Returns:
+            Dictionary with the block's Merkle root, the multiproof and the
+            proven hashes in the order the verifier expects, or None if the
+            block does not exist or a transaction is not in it
+        """
+        block = self.get_block_by_index(block_index)
+        if block is None or not transaction_hashes:
+            return None
+
+        proof = block.get_transaction_multiproof(transaction_hashes)
+        if proof is None:
+            return None
+
+        leaves = [tx.transaction_hash for tx in block.transactions if tx.transaction_hash]
+        return {
+            "block_index": block.index,
+            "block_hash": block.block_hash,
+            "merkle_root": block.merkle_root,
+            "transaction_hashes": [leaves[index] for index in proof.indices],
+            "multiproof": proof.to_dict(),
+        }
+
+    def get_block_proof(self, block_index: int, height: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Prove that a block is part of the chain at a height.
+        The proof has O(log n) hashes and is checked with
+        MerkleMountainRange.verify_proof against the returned root.
+
+        Args:
+            block_index: Index of the block to prove
+            height: Chain height the proof is for (defaults to the tip)
+
+        Returns:
+            Dictionary with the block hash, the accumulator root at the
+            height and the proof, or None if the block is above the height
+        """
+        if height is None:
+            height = len(self.mmr) - 1
+        proof = self.mmr.get_proof(block_index, height + 1)
+        if proof is None:
+            return None
+
+        return {
+            "block_index": block_index,
+            "block_hash": self.mmr.get_leaf(block_index),
+            "height": height,
+            "root": self.mmr.get_root(height + 1),
+            "proof": proof.to_dict(),
+        }
+
+    def _iter_blocks_from(self, start: int) -> Iterator[Block]:
+        """
+        Iterate blocks from an index onwards.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Blocks in index order
+        """
+        if start == 0:
+            yield from self.chain
+        else:
+            for index in range(start, len(self.chain)):
+                yield self.chain[index]
+
+    def _unindexed_start(self) -> int:
+        """
+        Get the first block index not covered by the store's transaction indexes.
+
+        Returns:
+            Block index to start scanning from
+        """
+        return len(self.store) if self.store.indexed else 0
+
+    def get_transaction_at(self, index: int, position: int) -> Optional[Transaction]:
+        """
+        Get a transaction by its location.
+
+        Args:
+            index: Index of the containing block
+            position: Position of the transaction within the block
+
+        Returns:
+            Transaction or None if not found
+        """
+        if self.memory_mapped and index < len(self.store):
+            transaction = self.store.read_transaction(index, position)
+            if transaction is not None:
+                transaction.hash_algorithm = self.hash_algorithm
+            return transaction
+
+        block = self.get_block_by_index(index)
+        if block is None or not 0 <= position < len(block.transactions):
+            return None
+        return block.transactions[position]
+
+    def locate_transaction(self, transaction_hash: str) -> Optional[Tuple[int, int]]:
+        """
+        Find where a transaction is stored in the chain.
+
+        Args:
+            transaction_hash: Transaction hash
+
+        Returns:
+            Tuple of (block_index, position) or None if not found
+        """
+        return self.tx_index.find(transaction_hash)
+
+    def locate_transaction_by_id(self, transaction_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Find where a transaction is stored in the chain by its ID.
+
+        Args:
+            transaction_id: Transaction ID
+
+        Returns:
+            Tuple of (block_index, position) or None if not found
+        """
+        return self.tx_index.find_id(transaction_id)
+
+    def get_pending_transaction(self, transaction_hash: str) -> Optional[Transaction]:
+        """
+        Find a transaction in the pending pool by its hash.
+
+        Args:
+            transaction_hash: Transaction hash
+
+        Returns:
+            Pending transaction or None if not found
+        """
+        # Pending transactions re-key themselves here when they are rehashed
+        return self.pending_index.get(transaction_hash)
+
+    def locate_transactions(self, field: str, value: str) -> List[Tuple[int, int]]:
+        """
+        Find where all transactions with a field value are stored in the chain.
+
+        Args:
+            field: Transaction field ("from_wallet", "module" or "transaction_type")
+            value: Field value to match
+
+        Returns:
+            List of (block_index, position) tuples in chain order
+        """
+        locations = self.store.find_transactions(field, value) if self.store.indexed else []
+
+        for block in self._iter_blocks_from(self._unindexed_start()):
+            for position, tx in enumerate(block.transactions):
+                if getattr(tx, field) == value:
+                    locations.append((block.index, position))
+        return locations
+
     def get_transaction_by_hash(self, transaction_hash: str) -> Optional[Transaction]:
         """
         Find transaction by its hash across all blocks.
@@ -230,28 +764,48 @@ class Blockchain:
         Returns:
             Transaction or None if not found
         """
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.transaction_hash == transaction_hash:
-                    return tx
-        return None
+        location = self.locate_transaction(transaction_hash)
+        return self.get_transaction_at(*location) if location else None
+
+    def _get_transactions_by_field(self, field: str, value: str) -> List[Transaction]:
+        """Get all transactions with a field value, in chain order."""
+        return [self.get_transaction_at(index, position)
+                for index, position in self.locate_transactions(field, value)]
 
     def get_transactions_by_wallet(self, wallet_address: str) -> List[Transaction]:
         """
         Get all transactions initiated by a wallet.
 
         Args:
-            wallet_address: Wallet address
+            wallet_address: Wallet address (any case)
 
         Returns:
-            List of transactions
+            List of transactions in chain order
         """
-        transactions = []
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.from_wallet == wallet_address:
-                    transactions.append(tx)
-        return transactions
+        return [self.get_transaction_at(index, position)
+                for _, index, position in self.wallet_index.iter_postings(wallet_address)]
+
+    def get_wallet_history(self, wallet_address: str, limit: int = 50,
+                           cursor: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Get a page of the transactions initiated by a wallet, newest first.
+
+        Args:
+            wallet_address: Wallet address (any case)
+            limit: Maximum transactions per page
+            cursor: Cursor returned with the previous page (None = newest)
+
+        Returns:
+            Tuple of (entries with "transaction", "block_index" and
+            "block_timestamp", next cursor or None after the oldest entry)
+        """
+        postings, next_cursor = self.wallet_index.page(wallet_address, limit, cursor)
+        entries = [{
+            "transaction": self.get_transaction_at(index, position),
+            "block_index": index,
+            "block_timestamp": timestamp
+        } for timestamp, index, position in postings]
+        return entries, next_cursor
 
     def get_transactions_by_module(self, module: str) -> List[Transaction]:
         """
@@ -263,10 +817,7 @@ class Blockchain:
         Returns:
             List of transactions
         """
-        transactions = []
-        for block in self.chain:
-            transactions.extend(block.get_transactions_by_module(module))
-        return transactions
+        return self._get_transactions_by_field("module", module)
 
     def get_transactions_by_type(self, transaction_type: str) -> List[Transaction]:
         """
@@ -278,10 +829,7 @@ class Blockchain:
         Returns:
             List of transactions
         """
-        transactions = []
-        for block in self.chain:
-            transactions.extend(block.get_transactions_by_type(transaction_type))
-        return transactions
+        return self._get_transactions_by_field("transaction_type", transaction_type)
 
     def get_chain_stats(self) -> Dict[str, Any]:
         """
@@ -290,66 +838,282 @@ class Blockchain:
         Returns:
             Statistics dictionary
         """
-        total_transactions = sum(block.get_transaction_count() for block in self.chain)
-
         return {
             "total_blocks": len(self.chain),
-            "total_transactions": total_transactions,
+            # The transaction index holds one record per chained transaction
+            "total_transactions": len(self.tx_index),
             "pending_transactions": len(self.pending_transactions),
             "latest_block_index": self.get_latest_block().index,
             "latest_block_hash": self.get_latest_block().block_hash,
             "chain_valid": self.verify_chain(),
+            "hash_algorithm": self.hash_algorithm,
+            "checkpoint_height": self.checkpoint_height,
+            "verified_height": self.verified_height,
+            "transaction_hash_cache": Transaction.get_hash_cache_stats(),
             "genesis_block_timestamp": self.chain[0].timestamp if self.chain else None
         }
 
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get block storage statistics.
+
+        Returns:
+            Statistics dictionary including commit latency numbers and,
+            with write-behind enabled, writer queue depth and lag
+        """
+        stats = self.store.get_stats()
+        if self.writer is not None:
+            stats["write_behind"] = self.writer.get_stats()
+        if self.scrubber is not None:
+            stats["scrubber"] = self.scrubber.get_stats()
+        return stats
+
+    def start_scrubber(self, io_bytes_per_second: Optional[float] = 4 * 1024 * 1024,
+                       cpu_fraction: float = 0.1, batch_size: int = 16, idle_seconds: float = 5.0,
+                       on_anomaly: Optional[Callable[[Dict[str, Any]], None]] = None) -> IntegrityScrubber:
+        """
+        Start re-verifying persisted blocks in the background.
+        Stored blocks are compared with the hashes recorded in the block
+        accumulator when they were appended; the position is kept in the
+        storage directory so a restart resumes the current pass.
+
+        Args:
+            io_bytes_per_second: Maximum stored bytes read per second (None = unlimited)
+            cpu_fraction: Maximum share of one core spent verifying
+            batch_size: Number of blocks verified between pauses
+            idle_seconds: Pause after each pass over the chain
+            on_anomaly: Called with each hash_chain_break anomaly found
+
+        Returns:
+            The running scrubber
+        """
+        if self.scrubber is None:
+            self.scrubber = IntegrityScrubber(self.store, self.mmr.get_leaf, str(self.storage_path),
+                                              io_bytes_per_second=io_bytes_per_second,
+                                              cpu_fraction=cpu_fraction, batch_size=batch_size,
+                                              idle_seconds=idle_seconds, on_anomaly=on_anomaly)
+        self.scrubber.start()
+        return self.scrubber
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every block added so far is written and fsynced.
+
+        Args:
+            timeout: Maximum seconds to wait for the write-behind writer
+
+        Returns:
+            True if all blocks are durable, False on timeout
+        """
+        self.mmr.sync()
+        self.tx_index.sync()
+        self.wallet_index.sync()
+        if self.writer is not None:
+            return self.writer.flush(timeout)
+        self.store.sync()
+        return True
+
+    def wait_durable(self, height: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every block up to a height is written and fsynced.
+
+        Args:
+            height: Block index that must be durable
+            timeout: Maximum seconds to wait for the write-behind writer
+
+        Returns:
+            True if the block is durable, False on timeout
+        """
+        if self.writer is not None:
+            return self.writer.wait_durable(height, timeout)
+        self.store.sync(height + 1)
+        return True
+
     def _save_block(self, block: Block) -> None:
         """
-        Save block to storage.
+        Save block to storage, or queue it for the write-behind writer.
 
         Args:
             block: Block to save
         """
-        block_file = self.storage_path / f"block_{block.index}.json"
-        with open(block_file, 'w', encoding='utf-8') as f:
-            json.dump(block.to_dict(), f, indent=2, ensure_ascii=False)
+        if self.writer is not None:
+            self.writer.submit(block)
+        else:
+            self.store.append_block(block)
+
+        # Extend the chain state digest, block accumulator and transaction indexes,
+        # and write a checkpoint when due
+        self.state_digest = advance_state_digest(self.state_digest, block.block_hash)
+        self.mmr.append(block.block_hash)
+        self.tx_index.add_block(block)
+        self.wallet_index.add_block(block)
+        if self.checkpoints.is_due(block.index):
+            self.checkpoints.write(block.index, block.block_hash, self.state_digest)
+
+    def _sync_mmr(self) -> None:
+        """
+        Bring the block accumulator in line with the stored chain.
+        Leaves past the stored tip are dropped, the range is rebuilt if its
+        tip no longer matches the stored block, and missing blocks are added.
+        """
+        stored = len(self.store)
+        self.mmr.truncate(stored)
+
+        tip = len(self.mmr) - 1
+        if tip >= 0 and self.mmr.get_leaf(tip) != self.store.read_block(tip).block_hash:
+            self.mmr.truncate(0)
+
+        if len(self.mmr) < stored:
+            for block in self.store.iter_blocks(len(self.mmr)):
+                self.mmr.append(block.block_hash)
+            self.mmr.sync()
+
+    def _sync_indexes(self) -> None:
+        """
+        Bring the transaction and wallet indexes in line with the stored chain.
+        Records of blocks past the stored tip are dropped, an index is
+        rebuilt if its last record no longer matches the stored block, and
+        blocks from the last indexed one (which a crash may have left
+        partly written) onwards are added again.
+        """
+        stored = len(self.store)
+        indexes = (self.tx_index, self.wallet_index)
+        for index in indexes:
+            index.truncate(stored)
+            height = index.indexed_height
+            if height >= 0:
+                index.truncate(height if index.tail_matches(self.store.read_block(height)) else 0)
+
+        start = min(index.indexed_height for index in indexes) + 1
+        if start < stored:
+            for block in self.store.iter_blocks(start):
+                for index in indexes:
+                    if block.index > index.indexed_height:
+                        index.add_block(block)
+            for index in indexes:
+                index.sync()
+
+    def _find_checkpoint(self) -> Optional[Checkpoint]:
+        """
+        Find the latest checkpoint matching the stored chain.
 
-    def load_chain(self) -> bool:
+        Returns:
+            Checkpoint or None if no checkpoint matches
+        """
+        checkpoint = self.checkpoints.latest(max_height=len(self.store) - 1)
+        while checkpoint is not None:
+            if self.store.read_block(checkpoint.height).block_hash == checkpoint.tip_hash:
+                return checkpoint
+            checkpoint = self.checkpoints.latest(max_height=checkpoint.height - 1)
+        return None
+
+    def load_chain(self, full_verification: Optional[bool] = None) -> bool:
         """
         Load blockchain from storage.
+        Legacy block_{index}.json files found in an empty store are
+        imported into the segmented log first. Only blocks appended after
+        the latest matching checkpoint are verified unless full
+        verification is requested.
+
+        Args:
+            full_verification: Verify every block (defaults to the chain setting)
 
         Returns:
             True if loaded successfully
         """
         try:
+            # Reload only what has actually been persisted
+            if self.writer is not None:
+                self.writer.flush()
+
             # Clear current chain
-            self.chain = []
+            self.chain = MappedChain(self.store) if self.memory_mapped else []
+            self.checkpoint_height = -1
+            self.state_digest = EMPTY_STATE_DIGEST
+            self.verified_height = -1
+            self.validated_height = -1
 
-            # Find all block files
-            block_files = sorted(self.storage_path.glob("block_*.json"),
-                                 key=lambda x: int(x.stem.split('_')[1]))
+            # Import blocks saved in the legacy one-file-per-block layout
+            if len(self.store) == 0:
+                self.store.import_json_directory(str(self.storage_path))
 
-            if not block_files:
+            self._sync_mmr()
+            self._sync_indexes()
+
+            if len(self.store) == 0:
                 # No blocks found, create genesis
                 self._create_genesis_block()
                 return True
 
-            # Load each block
-            for block_file in block_files:
-                with open(block_file, 'r', encoding='utf-8') as f:
-                    block_data = json.load(f)
-                    block = Block.from_dict(block_data)
-                    self.chain.append(block)
+            # Trust the latest matching checkpoint unless full verification is requested
+            if full_verification is None:
+                full_verification = self.full_verification
+            checkpoint = None if full_verification else self._find_checkpoint()
+            if checkpoint is not None:
+                self.checkpoint_height = checkpoint.height
+                self.state_digest = checkpoint.state_digest
+
+            # Decode and verify blocks in worker processes, then check linkage here
+            if not self.memory_mapped and self.load_workers > 1:
+                return self._load_parallel(full_verification)
+
+            # Load each block with a sequential scan
+            if not self.memory_mapped:
+                for block in self.store.iter_blocks():
+                    self.chain.append(block.seal())
+
+            for i in range(self.checkpoint_height + 1, len(self.chain)):
+                self.state_digest = advance_state_digest(self.state_digest, self.chain[i].block_hash)
 
             # Verify loaded chain
-            return self.verify_chain()
+            return self.verify_chain(full=full_verification)
 
         except Exception as e:
             print(f"Error loading blockchain: {e}")
             return False
 
+    def _load_parallel(self, full_verification: bool) -> bool:
+        """
+        Load the stored chain into memory using a process pool.
+        Workers decode every block and integrity-check those after the
+        trusted checkpoint; linkage is checked here from the block headers.
+
+        Args:
+            full_verification: Verify every block and checkpoint
+
+        Returns:
+            True if the loaded chain is valid
+        """
+        start = 0 if full_verification else self.checkpoint_height + 1
+        result = ParallelChainLoader(self.store, workers=self.load_workers).load(verify_from=start)
+        self.last_load_stats = result.get_stats()
+
+        if not result.valid:
+            # Keep the whole stored chain in memory, as a serial load would
+            self.chain = list(self.store.iter_blocks())
+            return False
+
+        self.chain = result.blocks
+        for block in self.chain:
+            block.seal(verified=True if block.index >= start else None)
+
+        genesis = self.chain[0]
+        if genesis.index != 0 or genesis.previous_hash != "0":
+            return False
+
+        for _, block_hash, _ in result.headers[self.checkpoint_height + 1:]:
+            self.state_digest = advance_state_digest(self.state_digest, block_hash)
+
+        if not self._verify_linkage(start, result.headers[start:], full_verification):
+            return False
+        self.verified_height = len(self.chain) - 1
+        return True
+
     def export_chain(self, output_file: str) -> bool:
         """
-        Export entire blockchain to a single file.
+        Export entire blockchain to a single JSON document.
+        Blocks are written one at a time instead of building the whole
+        document in memory.
 
         Args:
             output_file: Output file path
@@ -358,15 +1122,20 @@ class Blockchain:
             True if exported successfully
         """
         try:
-            chain_data = {
+            header = {
                 "version": "1.0.0",
                 "exported_at": time.time(),
                 "stats": self.get_chain_stats(),
-                "blocks": [block.to_dict() for block in self.chain]
             }
 
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(chain_data, f, indent=2, ensure_ascii=False)
+                # Reopen the header object to append the blocks array
+                f.write(json.dumps(header, indent=2, ensure_ascii=False)[:-2])
+                f.write(',\n  "blocks": [')
+                for i, block in enumerate(self.chain):
+                    block_json = json.dumps(block.to_dict(), indent=2, ensure_ascii=False)
+                    f.write((',' if i else '') + '\n    ' + block_json.replace('\n', '\n    '))
+                f.write('\n  ]\n}')
 
             return True
 
@@ -374,6 +1143,136 @@ class Blockchain:
             print(f"Error exporting blockchain: {e}")
             return False
 
+    def export_ndjson(self, output_file: str, start: int = 0) -> Optional[ExportManifest]:
+        """
+        Stream the chain to an NDJSON export with a trailing manifest.
+
+        Args:
+            output_file: Output file path
+            start: First block index to export (later exports can continue
+                an earlier one)
+
+        Returns:
+            Manifest of the export, or None on failure
+        """
+        try:
+            return export_ndjson(self._iter_blocks_from(start), output_file,
+                                 previous_state_digest=self._state_digest_before(start))
+
+        except Exception as e:
+            print(f"Error exporting blockchain: {e}")
+            return None
+
+    def _state_digest_before(self, start: int) -> str:
+        """
+        Get the chain state digest up to the block before an index.
+        Folding starts from the nearest checkpoint below it that matches
+        the chain, so only the blocks after that checkpoint are read.
+
+        Args:
+            start: Block index
+
+        Returns:
+            State digest of blocks 0..start-1
+        """
+        if start >= len(self.chain):
+            return self.state_digest
+
+        state_digest, height = EMPTY_STATE_DIGEST, -1
+        checkpoint = self.checkpoints.latest(max_height=start - 1) if start > 0 else None
+        while checkpoint is not None:
+            if self.chain[checkpoint.height].block_hash == checkpoint.tip_hash:
+                state_digest, height = checkpoint.state_digest, checkpoint.height
+                break
+            checkpoint = self.checkpoints.latest(max_height=checkpoint.height - 1)
+
+        for i in range(height + 1, start):
+            state_digest = advance_state_digest(state_digest, self.chain[i].block_hash)
+        return state_digest
+
+    def import_ndjson(self, input_file: str) -> bool:
+        """
+        Append the blocks of an NDJSON export that continues this chain.
+        The export is staged next to the chain and verified completely
+        (integrity, linkage, hash algorithm and manifest) before the first
+        block is appended, so a rejected export leaves the chain unchanged.
+
+        Args:
+            input_file: Export file path
+
+        Returns:
+            True if the whole export was verified and imported
+        """
+        staging_file = None
+        try:
+            previous_block = self.get_latest_block()
+            staging_file, _ = stage_export(input_file, previous_block, self.state_digest,
+                                           staging_dir=str(self.storage_path))
+            for block in ChainImportReader(staging_file, previous_block=previous_block,
+                                           previous_state_digest=self.state_digest):
+                block.seal(verified=True)
+                self._save_block(block)
+                self.chain.append(block)
+                self._advance_verified_height(block.index)
+            return True
+
+        except Exception as e:
+            print(f"Error importing blockchain: {e}")
+            return False
+
+        finally:
+            if staging_file is not None:
+                os.unlink(staging_file)
+
+    @classmethod
+    def from_ndjson(cls, input_file: str, storage_path: str, storage_backend: str = "segment",
+                    **kwargs) -> 'Blockchain':
+        """
+        Create a blockchain at an empty storage path from an NDJSON export.
+        The import is verified while streaming, so a checkpoint is written
+        at the imported tip and opening the chain does not verify it again.
+
+        Args:
+            input_file: Export file path (must start at genesis)
+            storage_path: Empty storage directory
+            storage_backend: Storage engine ("segment" or "sqlite")
+            **kwargs: Further Blockchain arguments
+
+        Returns:
+            Blockchain holding the imported chain
+        """
+        path = Path(storage_path)
+        path.mkdir(parents=True, exist_ok=True)
+        store = cls._open_store(storage_backend, path,
+                                fsync_policy=kwargs.pop("fsync_policy", FSYNC_INTERVAL),
+                                fsync_interval_ms=kwargs.pop("fsync_interval_ms", 50.0),
+                                compression=kwargs.pop("compression", None))
+        if len(store):
+            store.close()
+            raise ValueError(f"Storage path {storage_path} already holds a chain")
+
+        try:
+            manifest = import_ndjson(input_file, store, staging_dir=str(path))
+        except Exception:
+            store.close()
+            raise
+        if manifest.block_count:
+            CheckpointManager(str(path)).write(manifest.tip_index, manifest.tip_hash,
+                                               manifest.state_digest)
+
+        return cls(str(path), store=store, **kwargs)
+
+    def close(self) -> None:
+        """Make all stored blocks durable and release storage resources."""
+        if self.scrubber is not None:
+            self.scrubber.stop()
+        if self.writer is not None:
+            self.writer.close()
+        self.store.close()
+        self.mmr.close()
+        self.tx_index.close()
+        self.wallet_index.close()
+
     def __repr__(self) -> str:
         """String representation of blockchain."""
         return f"Blockchain(blocks={len(self.chain)}, pending_tx={len(self.pending_transactions)})"
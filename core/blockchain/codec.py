@@ -0,0 +1,467 @@
+"""
+Binary codec for blocks and transactions.
+A versioned, deterministic encoding used for replica transfer and, when
+opted in, for on-disk segments. Field names are replaced by small integer
+tags, integers are zigzag varints, floats are raw IEEE doubles, 64-character
+hex hashes are stored as 32 raw bytes and canonical UUIDs as 16 raw bytes,
+and strings repeated within a block are written once and referenced
+afterwards. Blocks are about a third of their JSON size, but decoding is
+slower than the C JSON parser, so JSON remains the default storage format.
+
+Decoding reproduces exactly the values of ``to_dict()``, so hashes and the
+JSON API are unaffected by the storage format.
+"""
+
+import re
+import struct
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .block import Block
+from .transaction import Transaction
+
+
+CODEC_VERSION = 1
+
+# Value tags
+TAG_NULL = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STRING = 5
+TAG_STRING_REF = 6
+TAG_HASH = 7
+TAG_UUID = 8
+TAG_LIST = 9
+TAG_DICT = 10
+
+# Field tags, in encoding order (tag 0 ends a record)
+END_OF_FIELDS = 0
+
+BLOCK_FIELDS = (
+    'index', 'timestamp', 'nonce', 'previous_hash', 'merkle_root', 'block_hash',
+    'created_by', 'version', 'metadata', 'transactions',
+)
+
+TRANSACTION_FIELDS = (
+    'transaction_id', 'timestamp', 'nonce', 'transaction_type', 'module', 'contract_name',
+    'data', 'from_wallet', 'signature', 'approvals', 'approval_required',
+    'approval_count_required', 'status', 'previous_transaction_hash', 'transaction_hash',
+    'metadata',
+)
+
+_BLOCK_TAGS = {name: tag for tag, name in enumerate(BLOCK_FIELDS, start=1)}
+_TRANSACTION_TAGS = {name: tag for tag, name in enumerate(TRANSACTION_FIELDS, start=1)}
+
+_DOUBLE = struct.Struct('>d')
+_unpack_double = _DOUBLE.unpack_from
+_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+_UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+class CodecError(Exception):
+    """Exception raised for malformed binary records."""
+    pass
+
+
+def _check_fields(data: Dict[str, Any], tags: Dict[str, int]) -> None:
+    """Reject fields that have no tag and would otherwise be dropped."""
+    unknown = [name for name in data if name not in tags]
+    if unknown:
+        raise CodecError(f"No field tag for: {', '.join(unknown)}")
+
+
+class _Encoder:
+    """Encodes values into a buffer, interning repeated strings."""
+
+    def __init__(self):
+        """Initialize encoder."""
+        self.buffer = bytearray()
+        self.strings: Dict[str, int] = {}
+
+    def varint(self, value: int) -> None:
+        """Write an unsigned LEB128 varint."""
+        while value > 0x7F:
+            self.buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buffer.append(value)
+
+    def string(self, value: str) -> None:
+        """Write a string, as a reference if it was written before."""
+        ref = self.strings.get(value)
+        if ref is not None:
+            self.buffer.append(TAG_STRING_REF)
+            self.varint(ref)
+            return
+
+        self.strings[value] = len(self.strings)
+        if len(value) == 64 and _HASH_PATTERN.fullmatch(value):
+            self.buffer.append(TAG_HASH)
+            self.buffer += bytes.fromhex(value)
+        elif len(value) == 36 and _UUID_PATTERN.fullmatch(value):
+            self.buffer.append(TAG_UUID)
+            self.buffer += uuid.UUID(value).bytes
+        else:
+            encoded = value.encode('utf-8')
+            self.buffer.append(TAG_STRING)
+            self.varint(len(encoded))
+            self.buffer += encoded
+
+    def value(self, value: Any) -> None:
+        """Write a tagged value."""
+        if value is None:
+            self.buffer.append(TAG_NULL)
+        elif value is True:
+            self.buffer.append(TAG_TRUE)
+        elif value is False:
+            self.buffer.append(TAG_FALSE)
+        elif isinstance(value, int):
+            self.buffer.append(TAG_INT)
+            self.varint(value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif isinstance(value, float):
+            self.buffer.append(TAG_FLOAT)
+            self.buffer += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            self.string(value)
+        elif isinstance(value, (list, tuple)):
+            self.buffer.append(TAG_LIST)
+            self.varint(len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict):
+            self.buffer.append(TAG_DICT)
+            self.varint(len(value))
+            for key, item in value.items():
+                self.value(key)
+                self.value(item)
+        else:
+            raise CodecError(f"Cannot encode value of type {type(value).__name__}")
+
+    def record(self, data: Dict[str, Any], tags: Dict[str, int]) -> None:
+        """Write the fields of a record followed by the end tag."""
+        _check_fields(data, tags)
+        for name, tag in tags.items():
+            if name in data:
+                self.varint(tag)
+                self.value(data[name])
+        self.varint(END_OF_FIELDS)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """
+    Read an unsigned LEB128 varint.
+
+    Returns:
+        Tuple of (value, position after the varint)
+    """
+    result = 0
+    shift = 0
+    try:
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, position
+            shift += 7
+    except IndexError:
+        raise CodecError("Unexpected end of record") from None
+
+
+def _read_value(data: bytes, position: int, strings: List[str]) -> Tuple[Any, int]:
+    """
+    Read a tagged value. Single-byte varints (tags, lengths and string
+    references are almost always below 128) are decoded inline.
+
+    Args:
+        data: Encoded record
+        position: Offset of the value tag
+        strings: Strings read so far, for resolving references
+
+    Returns:
+        Tuple of (value, position after the value)
+    """
+    try:
+        tag = data[position]
+        length = data[position + 1]
+    except IndexError:
+        if position >= len(data):
+            raise CodecError("Unexpected end of record") from None
+        length = 0
+    position += 1
+
+    # Most frequent tags first
+    if tag == TAG_STRING_REF:
+        if length < 0x80:
+            position += 1
+        else:
+            length, position = _read_varint(data, position)
+        try:
+            return strings[length], position
+        except IndexError:
+            raise CodecError(f"Invalid string reference {length}") from None
+
+    if tag == TAG_STRING:
+        if length < 0x80:
+            position += 1
+        else:
+            length, position = _read_varint(data, position)
+        end = position + length
+        if end > len(data):
+            raise CodecError("Unexpected end of record")
+        value = data[position:end].decode('utf-8')
+        strings.append(value)
+        return value, end
+
+    if tag == TAG_HASH:
+        end = position + 32
+        if end > len(data):
+            raise CodecError("Unexpected end of record")
+        value = data[position:end].hex()
+        strings.append(value)
+        return value, end
+
+    if tag == TAG_INT:
+        if length < 0x80:
+            zigzag = length
+            position += 1
+        else:
+            zigzag, position = _read_varint(data, position)
+        return (zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)), position
+
+    if tag == TAG_FLOAT:
+        if position + 8 > len(data):
+            raise CodecError("Unexpected end of record")
+        return _unpack_double(data, position)[0], position + 8
+
+    if tag == TAG_UUID:
+        end = position + 16
+        if end > len(data):
+            raise CodecError("Unexpected end of record")
+        digits = data[position:end].hex()
+        value = f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+        strings.append(value)
+        return value, end
+
+    if tag == TAG_DICT:
+        count, position = _read_varint(data, position)
+        result = {}
+        for _ in range(count):
+            key, position = _read_value(data, position, strings)
+            result[key], position = _read_value(data, position, strings)
+        return result, position
+
+    if tag == TAG_LIST:
+        count, position = _read_varint(data, position)
+        result = []
+        for _ in range(count):
+            item, position = _read_value(data, position, strings)
+            result.append(item)
+        return result, position
+
+    if tag == TAG_NULL:
+        return None, position
+    if tag == TAG_TRUE:
+        return True, position
+    if tag == TAG_FALSE:
+        return False, position
+
+    raise CodecError(f"Unknown value tag {tag}")
+
+
+def _read_record(data: bytes, position: int, strings: List[str],
+                 fields: Tuple[str, ...]) -> Tuple[Dict[str, Any], int]:
+    """
+    Read the fields of a record up to the end tag.
+
+    Returns:
+        Tuple of (record dictionary, position after the end tag)
+    """
+    record = {}
+    field_count = len(fields)
+    size = len(data)
+    while True:
+        # Field tags are single bytes unless a record has over 127 fields
+        if position < size and data[position] < 0x80:
+            tag = data[position]
+            position += 1
+        else:
+            tag, position = _read_varint(data, position)
+        if tag == END_OF_FIELDS:
+            return record, position
+        if tag > field_count:
+            raise CodecError(f"Unknown field tag {tag}")
+        record[fields[tag - 1]], position = _read_value(data, position, strings)
+
+
+def _encode_block_dict(encoder: _Encoder, data: Dict[str, Any]) -> None:
+    """Write a block dictionary, with its transactions as nested records."""
+    _check_fields(data, _BLOCK_TAGS)
+    transactions = data.get('transactions', [])
+    header = {name: value for name, value in data.items() if name != 'transactions'}
+    for name, tag in _BLOCK_TAGS.items():
+        if name == 'transactions':
+            encoder.varint(tag)
+            encoder.varint(len(transactions))
+            for transaction in transactions:
+                encoder.record(transaction, _TRANSACTION_TAGS)
+        elif name in header:
+            encoder.varint(tag)
+            encoder.value(header[name])
+    encoder.varint(END_OF_FIELDS)
+
+
+def encode_block_dict(data: Dict[str, Any]) -> bytes:
+    """
+    Encode a block dictionary (as returned by ``Block.to_dict``).
+
+    Args:
+        data: Block dictionary
+
+    Returns:
+        Encoded block
+    """
+    encoder = _Encoder()
+    encoder.buffer.append(CODEC_VERSION)
+    _encode_block_dict(encoder, data)
+    return bytes(encoder.buffer)
+
+
+def decode_block_dict(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode a block into the dictionary ``Block.to_dict`` would return.
+
+    Args:
+        payload: Encoded block
+
+    Returns:
+        Block dictionary
+    """
+    payload = bytes(payload)
+    if not payload or payload[0] != CODEC_VERSION:
+        raise CodecError(f"Unsupported codec version: {payload[0] if payload else None}")
+
+    strings: List[str] = []
+    position = 1
+    data = {}
+    transactions = []
+    while True:
+        tag, position = _read_varint(payload, position)
+        if tag == END_OF_FIELDS:
+            break
+        if tag > len(BLOCK_FIELDS):
+            raise CodecError(f"Unknown field tag {tag}")
+        name = BLOCK_FIELDS[tag - 1]
+        if name == 'transactions':
+            count, position = _read_varint(payload, position)
+            for _ in range(count):
+                transaction, position = _read_record(payload, position, strings, TRANSACTION_FIELDS)
+                transactions.append(transaction)
+        else:
+            data[name], position = _read_value(payload, position, strings)
+
+    if position != len(payload):
+        raise CodecError("Trailing bytes after block record")
+
+    data['transactions'] = transactions
+    return data
+
+
+def encode_block(block: Block) -> bytes:
+    """
+    Encode a block.
+
+    Args:
+        block: Block to encode
+
+    Returns:
+        Encoded block
+    """
+    return encode_block_dict(block.to_dict())
+
+
+def decode_block(payload: bytes) -> Block:
+    """
+    Decode a block.
+
+    Args:
+        payload: Encoded block
+
+    Returns:
+        Block instance
+    """
+    return Block.from_dict(decode_block_dict(payload))
+
+
+def encode_transaction(transaction: Transaction) -> bytes:
+    """
+    Encode a single transaction.
+
+    Args:
+        transaction: Transaction to encode
+
+    Returns:
+        Encoded transaction
+    """
+    encoder = _Encoder()
+    encoder.buffer.append(CODEC_VERSION)
+    encoder.record(transaction.to_dict(), _TRANSACTION_TAGS)
+    return bytes(encoder.buffer)
+
+
+def decode_transaction(payload: bytes) -> Transaction:
+    """
+    Decode a single transaction.
+
+    Args:
+        payload: Encoded transaction
+
+    Returns:
+        Transaction instance
+    """
+    if not payload or payload[0] != CODEC_VERSION:
+        raise CodecError(f"Unsupported codec version: {payload[0] if payload else None}")
+
+    payload = bytes(payload)
+    data, position = _read_record(payload, 1, [], TRANSACTION_FIELDS)
+    if position != len(payload):
+        raise CodecError("Trailing bytes after transaction record")
+    return Transaction.from_dict(data)
+
+
+def write_block_stream(blocks: Iterable[Block]) -> Iterator[bytes]:
+    """
+    Frame encoded blocks for transfer: each block is a varint length
+    followed by its encoding.
+
+    Args:
+        blocks: Blocks to send
+
+    Yields:
+        Framed block chunks
+    """
+    for block in blocks:
+        payload = encode_block(block)
+        frame = _Encoder()
+        frame.varint(len(payload))
+        yield bytes(frame.buffer) + payload
+
+
+def read_block_stream(data: bytes) -> Iterator[Block]:
+    """
+    Decode blocks framed by ``write_block_stream``.
+
+    Args:
+        data: Concatenated frames
+
+    Yields:
+        Decoded blocks
+    """
+    position = 0
+    while position < len(data):
+        length, position = _read_varint(data, position)
+        if position + length > len(data):
+            raise CodecError("Truncated block stream")
+        yield decode_block(data[position:position + length])
+        position += length
@@ -4,8 +4,9 @@ Genesis block creation and initialization.
 
 import time
 from typing import Dict, Any
-from .block import Block, BlockBuilder
+from .block import Block, BlockBuilder, DEFAULT_BLOCK_VERSIONS
 from .transaction import Transaction, TransactionBuilder
+from .hash_utils import HashUtils, HASH_SHA256
 
 
 class GenesisBlockCreator:
@@ -14,24 +15,29 @@ class GenesisBlockCreator:
     """
 
     @staticmethod
-    def create_genesis_block(system_metadata: Dict[str, Any] = None) -> Block:
+    def create_genesis_block(system_metadata: Dict[str, Any] = None,
+                             hash_algorithm: str = HASH_SHA256) -> Block:
         """
         Create the genesis (first) block of the blockchain.
+        The genesis block's version fixes the chain's hash algorithm.
 
         Args:
             system_metadata: Optional metadata for the genesis block
+            hash_algorithm: Hash algorithm of the chain
 
         Returns:
             Genesis block
         """
         if system_metadata is None:
             system_metadata = {}
+        HashUtils.get_hasher(hash_algorithm)
 
         # Default genesis metadata
         default_metadata = {
             "system_name": "Web3 Accounting & Audit System",
             "version": "1.0.0",
             "created_at": time.time(),
+            "hash_algorithm": hash_algorithm,
             "description": "Genesis Block - Immutable Accounting System on Blockchain",
             "features": [
                 "Decentralized Authentication",
@@ -64,12 +70,14 @@ class GenesisBlockCreator:
             }) \
             .set_wallet("0x0000000000000000000000000000000000000000") \
             .set_signature("GENESIS_SIGNATURE") \
+            .set_hash_algorithm(hash_algorithm) \
             .build()
 
         # Create genesis block
         genesis_block = BlockBuilder(index=0) \
             .set_previous_hash("0") \
             .set_created_by("SYSTEM") \
+            .set_version(DEFAULT_BLOCK_VERSIONS[hash_algorithm]) \
             .add_transaction(init_transaction) \
             .set_metadata(metadata) \
             .build()
@@ -77,12 +85,14 @@ class GenesisBlockCreator:
         return genesis_block
 
     @staticmethod
-    def create_system_configuration_transaction(config: Dict[str, Any]) -> Transaction:
+    def create_system_configuration_transaction(config: Dict[str, Any],
+                                                hash_algorithm: str = HASH_SHA256) -> Transaction:
         """
         Create a system configuration transaction for genesis block.
 
         Args:
             config: System configuration
+            hash_algorithm: Hash algorithm of the chain
 
         Returns:
             Configuration transaction
@@ -94,13 +104,17 @@ class GenesisBlockCreator:
             .set_data(config) \
             .set_wallet("0x0000000000000000000000000000000000000000") \
             .set_signature("SYSTEM_CONFIG_SIGNATURE") \
+            .set_hash_algorithm(hash_algorithm) \
             .build()
 
     @staticmethod
-    def create_initial_roles_transaction() -> Transaction:
+    def create_initial_roles_transaction(hash_algorithm: str = HASH_SHA256) -> Transaction:
         """
         Create initial roles configuration transaction.
 
+        Args:
+            hash_algorithm: Hash algorithm of the chain
+
         Returns:
             Roles transaction
         """
@@ -158,13 +172,17 @@ class GenesisBlockCreator:
             .set_data(roles_config) \
             .set_wallet("0x0000000000000000000000000000000000000000") \
             .set_signature("ROLES_INIT_SIGNATURE") \
+            .set_hash_algorithm(hash_algorithm) \
             .build()
 
     @staticmethod
-    def create_enriched_genesis_block() -> Block:
+    def create_enriched_genesis_block(hash_algorithm: str = HASH_SHA256) -> Block:
         """
         Create an enriched genesis block with system configuration.
 
+        Args:
+            hash_algorithm: Hash algorithm of the chain
+
         Returns:
             Enriched genesis block
         """
@@ -173,23 +191,23 @@ class GenesisBlockCreator:
             "initialized_at": time.time(),
             "blockchain_type": "private_permissioned",
             "consensus": "multi_signature",
-            "encryption": "SHA-256"
+            "encryption": hash_algorithm
         }
 
         # Create genesis block
-        genesis = GenesisBlockCreator.create_genesis_block(metadata)
+        genesis = GenesisBlockCreator.create_genesis_block(metadata, hash_algorithm)
 
         # Add system configuration
         config_tx = GenesisBlockCreator.create_system_configuration_transaction({
             "max_block_size": 1000,
             "approval_timeout_hours": 24,
             "signature_algorithm": "ECDSA",
-            "hash_algorithm": "SHA-256"
-        })
+            "hash_algorithm": hash_algorithm
+        }, hash_algorithm)
         genesis.add_transaction(config_tx)
 
         # Add roles configuration
-        roles_tx = GenesisBlockCreator.create_initial_roles_transaction()
+        roles_tx = GenesisBlockCreator.create_initial_roles_transaction(hash_algorithm)
         genesis.add_transaction(roles_tx)
 
         # Recalculate hashes
@@ -1,11 +1,31 @@
 """
 Cryptographic hashing utilities for the blockchain.
-Uses SHA-256 for all hashing operations.
+Uses SHA-256 by default; chains can select BLAKE2b (32-byte digests) for
+block, transaction and Merkle hashing.
 """
 
 import hashlib
 import json
-from typing import Any, Dict
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Hash algorithms, named as in the genesis configuration
+HASH_SHA256 = "SHA-256"
+HASH_BLAKE2B = "BLAKE2b"
+
+HASH_ALGORITHMS = (HASH_SHA256, HASH_BLAKE2B)
+
+
+def _blake2b_256(data: bytes = b"") -> Any:
+    """Create a BLAKE2b hash object with 32-byte digests."""
+    return hashlib.blake2b(data, digest_size=32)
+
+
+_HASHERS = {
+    HASH_SHA256: hashlib.sha256,
+    HASH_BLAKE2B: _blake2b_256,
+}
 
 
 class HashUtils:
@@ -25,20 +45,86 @@ class HashUtils:
         return hashlib.sha256(data.encode('utf-8')).hexdigest()
 
     @staticmethod
-    def hash_dict(data: Dict[str, Any]) -> str:
+    def get_hasher(algorithm: str = HASH_SHA256) -> Callable[..., Any]:
         """
-        Generate SHA-256 hash of a dictionary.
+        Get the hashlib constructor for a hash algorithm.
+
+        Args:
+            algorithm: Hash algorithm ("SHA-256" or "BLAKE2b")
+
+        Returns:
+            Callable returning a hash object with 32-byte digests
+        """
+        try:
+            return _HASHERS[algorithm]
+        except KeyError:
+            raise ValueError(f"Invalid hash algorithm. Must be one of: {', '.join(HASH_ALGORITHMS)}") from None
+
+    @staticmethod
+    def hash_dict(data: Dict[str, Any], algorithm: str = HASH_SHA256) -> str:
+        """
+        Generate hash of a dictionary.
         Ensures deterministic ordering for consistent hashing.
 
         Args:
             data: Dictionary to hash
+            algorithm: Hash algorithm
 
         Returns:
             Hexadecimal hash string
         """
+        return HashUtils.hash_bytes(HashUtils.canonical_bytes(data), algorithm)
+
+    @staticmethod
+    def canonical_bytes(data: Dict[str, Any]) -> bytes:
+        """
+        Get the canonical encoding of a dictionary that hash_dict hashes.
+
+        Args:
+            data: Dictionary to encode
+
+        Returns:
+            UTF-8 JSON with sorted keys
+        """
         # Sort keys for deterministic hashing
-        json_string = json.dumps(data, sort_keys=True, ensure_ascii=False)
-        return HashUtils.hash_sha256(json_string)
+        return json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def canonical_parts(data: Dict[str, Any], key: str, token: Optional[str] = None) -> Tuple[bytes, bytes]:
+        """
+        Split the canonical encoding of a dictionary around one value.
+        ``prefix + json.dumps(value) + suffix`` is the canonical encoding for
+        any value of the key, so it can change without re-serializing the rest.
+
+        Args:
+            data: Dictionary to encode
+            key: Key whose value is left out
+            token: Random placeholder string that does not occur in the data
+                (a fresh one is generated if None)
+
+        Returns:
+            Tuple of (prefix, suffix) bytes
+        """
+        token = token or uuid.uuid4().hex
+        encoded = json.dumps({**data, key: token}, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        prefix, suffix = encoded.split(b'"' + token.encode('ascii') + b'"')
+        return prefix, suffix
+
+    @staticmethod
+    def hash_bytes(data: bytes, algorithm: str = HASH_SHA256) -> str:
+        """
+        Generate hash of raw bytes.
+
+        Args:
+            data: Bytes to hash
+            algorithm: Hash algorithm
+
+        Returns:
+            Hexadecimal hash string
+        """
+        if algorithm == HASH_SHA256:
+            return hashlib.sha256(data).hexdigest()
+        return HashUtils.get_hasher(algorithm)(data).hexdigest()
 
     @staticmethod
     def hash_list(data_list: list) -> str:
@@ -0,0 +1,81 @@
+"""
+Read-only containers for sealed blocks and transactions.
+Sealing replaces the dictionaries and lists of a block's payload with
+subclasses that refuse mutation, so they still encode, hash and compare
+exactly like the originals while a sealed block can be shared between
+threads without copying.
+"""
+
+from typing import Any
+
+
+class ImmutableError(TypeError):
+    """Raised when a sealed block or transaction is modified."""
+    pass
+
+
+def _refuse(self, *args, **kwargs):
+    """Reject a mutating call on a read-only container."""
+    raise ImmutableError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict):
+    """Dictionary that cannot be modified after construction."""
+
+    __setitem__ = __delitem__ = __ior__ = _refuse
+    clear = pop = popitem = setdefault = update = _refuse
+
+    def __reduce__(self):
+        """Pickle as a plain dictionary (unpickling would otherwise set items)."""
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """List that cannot be modified after construction."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+    append = extend = insert = pop = remove = clear = sort = reverse = _refuse
+
+    def __reduce__(self):
+        """Pickle as a plain list (unpickling would otherwise extend it)."""
+        return FrozenList, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Make a read-only copy of a JSON-like value.
+
+    Args:
+        value: Value to freeze
+
+    Returns:
+        Value with every dictionary and list replaced by a read-only one
+    """
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList([freeze(item) for item in value])
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Make a mutable deep copy of a (possibly frozen) JSON-like value.
+
+    Args:
+        value: Value to thaw
+
+    Returns:
+        Value built from plain dictionaries and lists
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    return value
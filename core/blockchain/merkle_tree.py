@@ -1,9 +1,30 @@
 """
 Merkle Tree implementation for efficient transaction verification.
+
+Each tree level is kept as one contiguous bytes buffer of 32-byte digests,
+and only the root is converted to hex. Two hashing schemes are supported:
+
+- ``hex``: parents hash the concatenated hex strings of their children, which
+  reproduces the roots of existing (version 1.0.0) blocks
+- ``binary``: parents hash the concatenated raw digests of their children
+
+Nodes are hashed with the chain's hash algorithm (SHA-256 by default).
 """
 
-from typing import List, Optional
-from .hash_utils import HashUtils
+import hashlib
+from binascii import hexlify
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .hash_utils import HashUtils, HASH_SHA256
+
+DIGEST_SIZE = 32
+
+# Merkle hashing schemes
+MERKLE_SCHEME_HEX = "hex"
+MERKLE_SCHEME_BINARY = "binary"
+
+MERKLE_SCHEMES = (MERKLE_SCHEME_HEX, MERKLE_SCHEME_BINARY)
 
 
 class MerkleNode:
@@ -24,62 +45,220 @@ class MerkleNode:
         self.right = right
 
 
-class MerkleTree:
+def _leaf_level(hashes: List[str]) -> bytes:
     """
-    Merkle Tree for efficient verification of transaction integrity.
+    Pack hex leaf hashes into a buffer of raw digests.
+
+    Args:
+        hashes: List of 64-character hex digests
+
+    Returns:
+        Concatenated 32-byte digests
     """
+    joined = ''.join(hashes)
+    try:
+        level = bytes.fromhex(joined)
+    except ValueError:
+        level = b""
+    if len(level) != DIGEST_SIZE * len(hashes) or hexlify(level) != joined.encode('ascii', 'replace'):
+        raise ValueError("Merkle leaves must be lowercase hex 32-byte digests")
+    return level
+
+
+def _parent_level(level: bytes, scheme: str, algorithm: str = HASH_SHA256) -> bytes:
+    """
+    Hash a level into the level above it.
+    An odd last node is paired with itself.
+
+    Args:
+        level: Concatenated digests of the level
+        scheme: Merkle hashing scheme
+        algorithm: Hash algorithm
 
-    def __init__(self, transactions: List[str]):
+    Returns:
+        Concatenated digests of the parent level
+    """
+    if (len(level) // DIGEST_SIZE) % 2:
+        level += level[-DIGEST_SIZE:]
+
+    hasher = HashUtils.get_hasher(algorithm)
+    if scheme == MERKLE_SCHEME_HEX:
+        data = memoryview(hexlify(level))
+        pair = 4 * DIGEST_SIZE
+    else:
+        data = memoryview(level)
+        pair = 2 * DIGEST_SIZE
+    return b"".join([hasher(data[i:i + pair]).digest() for i in range(0, len(data), pair)])
+
+
+def combine_digests(left: bytes, right: bytes, scheme: str = MERKLE_SCHEME_HEX,
+                    algorithm: str = HASH_SHA256) -> bytes:
+    """
+    Hash two child digests into their parent digest.
+
+    Args:
+        left: Left child digest
+        right: Right child digest
+        scheme: Merkle hashing scheme
+        algorithm: Hash algorithm
+
+    Returns:
+        Parent digest
+    """
+    hasher = hashlib.sha256 if algorithm == HASH_SHA256 else HashUtils.get_hasher(algorithm)
+    if scheme == MERKLE_SCHEME_HEX:
+        return hasher(hexlify(left) + hexlify(right)).digest()
+    return hasher(left + right).digest()
+
+
+class IncrementalMerkleBuilder:
+    """
+    Builds a Merkle root one leaf at a time.
+    Only the frontier is kept: the root of each complete subtree still
+    waiting for a right sibling, at most one per height. Adding a leaf
+    merges equal-height subtrees like a binary counter (O(log n) hashes),
+    and the root, with the odd-node duplication of MerkleTree, is derived
+    from the frontier when requested.
+    """
+
+    def __init__(self, scheme: str = MERKLE_SCHEME_HEX, algorithm: str = HASH_SHA256):
         """
-        Build a Merkle tree from a list of transactions.
+        Initialize an empty builder.
 
         Args:
-            transactions: List of transaction hashes
+            scheme: Merkle hashing scheme
+            algorithm: Hash algorithm
         """
-        self.transactions = transactions
-        self.root = self._build_tree(transactions)
+        if scheme not in MERKLE_SCHEMES:
+            raise ValueError(f"Invalid Merkle scheme. Must be one of: {', '.join(MERKLE_SCHEMES)}")
+        HashUtils.get_hasher(algorithm)
 
-    def _build_tree(self, hashes: List[str]) -> Optional[MerkleNode]:
+        self.scheme = scheme
+        self.algorithm = algorithm
+        self.leaf_count = 0
+        self._frontier: List[Optional[bytes]] = []
+
+    def add(self, transaction_hash: str) -> None:
         """
-        Recursively build the Merkle tree.
+        Add the next leaf.
 
         Args:
-            hashes: List of hashes to build tree from
+            transaction_hash: Hex transaction hash
+        """
+        node = _leaf_level([transaction_hash])
+        height = 0
+        while height < len(self._frontier) and self._frontier[height] is not None:
+            node = combine_digests(self._frontier[height], node, self.scheme, self.algorithm)
+            self._frontier[height] = None
+            height += 1
+
+        if height == len(self._frontier):
+            self._frontier.append(node)
+        else:
+            self._frontier[height] = node
+        self.leaf_count += 1
+
+    def get_root_hash(self) -> Optional[str]:
+        """
+        Get the root of the leaves added so far.
 
         Returns:
-            Root node of the tree
+            Root hash (as MerkleTree would compute it) or None if empty
         """
-        if not hashes:
+        if not self.leaf_count:
             return None
 
-        if len(hashes) == 1:
-            return MerkleNode(hashes[0])
+        top = self.leaf_count.bit_length() - 1
+        carry = None
+        for height, node in enumerate(self._frontier):
+            if height == top and carry is None:
+                return node.hex()
+            if node is not None and carry is not None:
+                carry = combine_digests(node, carry, self.scheme, self.algorithm)
+            elif node is not None or carry is not None:
+                # The last node of an odd level is paired with itself
+                carry = node if carry is None else carry
+                carry = combine_digests(carry, carry, self.scheme, self.algorithm)
+        return carry.hex()
+
+
+@dataclass
+class MerkleMultiproof:
+    """
+    Proof that a set of leaves belongs to a Merkle root.
+    Holds only the sibling hashes that cannot be computed from the proven
+    leaves themselves, in the order the verifier consumes them (level by
+    level from the leaves up, left to right within a level).
+    """
 
-        # Create leaf nodes
-        nodes = [MerkleNode(h) for h in hashes]
+    leaf_count: int
+    indices: List[int]
+    hashes: List[str] = field(default_factory=list)
+    scheme: str = MERKLE_SCHEME_HEX
+    algorithm: str = HASH_SHA256
 
-        # Build tree bottom-up
-        while len(nodes) > 1:
-            next_level = []
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert multiproof to dictionary."""
+        return asdict(self)
 
-            # Process pairs of nodes
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MerkleMultiproof':
+        """Create multiproof from dictionary."""
+        return cls(**data)
 
-                # Handle odd number of nodes - duplicate last node
-                if i + 1 < len(nodes):
-                    right = nodes[i + 1]
-                else:
-                    right = nodes[i]
 
-                # Combine hashes
-                combined_hash = HashUtils.combine_hashes(left.hash, right.hash)
-                parent = MerkleNode(combined_hash, left, right)
-                next_level.append(parent)
+class MerkleTree:
+    """
+    Merkle Tree for efficient verification of transaction integrity.
+    Every level is retained, so a proof is a walk of one sibling per level.
+    The leaf index map and hex copies of the levels are built on the first
+    proof request and shared by every later one.
+    """
+
+    def __init__(self, transactions: List[str], scheme: str = MERKLE_SCHEME_HEX,
+                 algorithm: str = HASH_SHA256):
+        """
+        Build a Merkle tree from a list of transactions.
+
+        Args:
+            transactions: List of transaction hashes
+            scheme: Merkle hashing scheme ("hex" for version 1.0.0 roots)
+            algorithm: Hash algorithm of the chain
+        """
+        if scheme not in MERKLE_SCHEMES:
+            raise ValueError(f"Invalid Merkle scheme. Must be one of: {', '.join(MERKLE_SCHEMES)}")
+        HashUtils.get_hasher(algorithm)
+
+        self.transactions = transactions
+        self.scheme = scheme
+        self.algorithm = algorithm
+        self.levels = self._build_levels(transactions)
+        self._leaf_index: Optional[Dict[str, int]] = None
+        self._hex_levels: Optional[List[str]] = None
 
-            nodes = next_level
+    def _build_levels(self, hashes: List[str]) -> List[bytes]:
+        """
+        Build every level of the tree, leaves first.
 
-        return nodes[0] if nodes else None
+        Args:
+            hashes: List of hashes to build tree from
+
+        Returns:
+            List of level buffers ending with the root level
+        """
+        if not hashes:
+            return []
+
+        levels = [_leaf_level(hashes)]
+        while len(levels[-1]) > DIGEST_SIZE:
+            levels.append(_parent_level(levels[-1], self.scheme, self.algorithm))
+        return levels
+
+    @property
+    def root(self) -> Optional[MerkleNode]:
+        """Root node of the tree (None if the tree is empty)."""
+        root_hash = self.get_root_hash()
+        return MerkleNode(root_hash) if root_hash else None
 
     def get_root_hash(self) -> Optional[str]:
         """
@@ -88,7 +267,24 @@ class MerkleTree:
         Returns:
             Root hash or None if tree is empty
         """
-        return self.root.hash if self.root else None
+        return self.levels[-1].hex() if self.levels else None
+
+    def get_leaf_index(self, transaction_hash: str) -> Optional[int]:
+        """
+        Get the position of a transaction among the leaves.
+
+        Args:
+            transaction_hash: Hash of the transaction
+
+        Returns:
+            Index of the first matching leaf or None if not in the tree
+        """
+        if self._leaf_index is None:
+            leaf_index: Dict[str, int] = {}
+            for index, leaf in enumerate(self.transactions):
+                leaf_index.setdefault(leaf, index)
+            self._leaf_index = leaf_index
+        return self._leaf_index.get(transaction_hash)
 
     def get_proof(self, transaction_hash: str) -> List[tuple]:
         """
@@ -101,44 +297,166 @@ class MerkleTree:
             List of (hash, side) tuples forming the proof path
             side is 'left' or 'right' indicating position
         """
-        try:
-            index = self.transactions.index(transaction_hash)
-        except ValueError:
+        index = self.get_leaf_index(transaction_hash)
+        if index is None:
             return []
+        return self.get_proof_at(index)
 
-        proof = []
-        hashes = self.transactions.copy()
+    def get_proof_at(self, index: int) -> List[tuple]:
+        """
+        Generate Merkle proof for the leaf at a position.
+
+        Args:
+            index: Leaf index
+
+        Returns:
+            List of (hash, side) tuples forming the proof path
+        """
+        if not 0 <= index < len(self.transactions):
+            raise IndexError(f"Leaf index {index} out of range")
+        return self._walk(index)
 
-        while len(hashes) > 1:
-            next_level = []
-            level_proof = []
+    def get_proofs(self, transaction_hashes: Optional[Iterable[str]] = None) -> Dict[str, List[tuple]]:
+        """
+        Generate Merkle proofs for many transactions in one pass.
 
-            for i in range(0, len(hashes), 2):
-                left = hashes[i]
-                right = hashes[i + 1] if i + 1 < len(hashes) else hashes[i]
+        Args:
+            transaction_hashes: Hashes to prove (None = every leaf)
 
-                if i == index or i + 1 == index:
-                    # This pair contains our transaction
-                    if i == index:
-                        level_proof.append((right, 'right'))
-                        next_index = i // 2
-                    else:
-                        level_proof.append((left, 'left'))
-                        next_index = i // 2
+        Returns:
+            Dictionary of transaction hash to proof path
+            (an empty path for hashes not in the tree)
+        """
+        if transaction_hashes is None:
+            transaction_hashes = self.transactions
+
+        proofs = {}
+        for transaction_hash in transaction_hashes:
+            if transaction_hash in proofs:
+                continue
+            index = self.get_leaf_index(transaction_hash)
+            proofs[transaction_hash] = [] if index is None else self._walk(index)
+        return proofs
+
+    def _walk(self, index: int) -> List[tuple]:
+        """Collect one sibling per level from a leaf up to the root."""
+        if self._hex_levels is None:
+            self._hex_levels = [level.hex() for level in self.levels[:-1]]
+
+        width = 2 * DIGEST_SIZE
+        proof = []
+        for level in self._hex_levels:
+            sibling = index ^ 1
+            if sibling * width >= len(level):
+                # Odd last node is paired with itself
+                sibling = index
+            proof.append((level[sibling * width:(sibling + 1) * width], 'left' if index % 2 else 'right'))
+            index //= 2
+        return proof
 
-                combined = HashUtils.combine_hashes(left, right)
-                next_level.append(combined)
+    def get_multiproof(self, transaction_hashes: Iterable[str]) -> Optional[MerkleMultiproof]:
+        """
+        Generate one proof for a set of transactions.
 
-            if level_proof:
-                proof.extend(level_proof)
-                index = next_index
+        Args:
+            transaction_hashes: Hashes to prove
+
+        Returns:
+            Multiproof (its indices give the leaf order the verifier expects)
+            or None if a hash is not in the tree
+        """
+        indices = []
+        for transaction_hash in transaction_hashes:
+            index = self.get_leaf_index(transaction_hash)
+            if index is None:
+                return None
+            indices.append(index)
+        return self.get_multiproof_at(indices)
+
+    def get_multiproof_at(self, indices: Iterable[int]) -> MerkleMultiproof:
+        """
+        Generate one proof for the leaves at a set of positions.
 
-            hashes = next_level
+        Args:
+            indices: Leaf indices
 
+        Returns:
+            Multiproof with the minimal set of sibling hashes
+        """
+        known = sorted(set(indices))
+        if not known:
+            raise ValueError("Multiproof needs at least one leaf")
+        if known[0] < 0 or known[-1] >= len(self.transactions):
+            raise IndexError("Leaf index out of range")
+
+        proof = MerkleMultiproof(leaf_count=len(self.transactions), indices=known, scheme=self.scheme,
+                                 algorithm=self.algorithm)
+        for level in self.levels[:-1]:
+            count = len(level) // DIGEST_SIZE
+            known_set = set(known)
+            for index in known:
+                sibling = index ^ 1
+                if sibling < count and sibling not in known_set:
+                    proof.hashes.append(level[sibling * DIGEST_SIZE:(sibling + 1) * DIGEST_SIZE].hex())
+            known = sorted({index // 2 for index in known})
         return proof
 
     @staticmethod
-    def verify_proof(transaction_hash: str, proof: List[tuple], root_hash: str) -> bool:
+    def verify_multiproof(transaction_hashes: List[str], proof: MerkleMultiproof, root_hash: str) -> bool:
+        """
+        Verify a multiproof.
+
+        Args:
+            transaction_hashes: Hashes of the proven transactions, in the
+                order of proof.indices
+            proof: Multiproof
+            root_hash: Expected root hash
+
+        Returns:
+            True if every transaction is under the root, False otherwise
+        """
+        if proof.scheme not in MERKLE_SCHEMES or not proof.indices or \
+                len(transaction_hashes) != len(proof.indices) or \
+                proof.indices != sorted(set(proof.indices)) or \
+                proof.indices[0] < 0 or proof.indices[-1] >= proof.leaf_count:
+            return False
+
+        try:
+            nodes = {index: bytes.fromhex(tx_hash) for index, tx_hash in zip(proof.indices, transaction_hashes)}
+            siblings = iter([bytes.fromhex(proof_hash) for proof_hash in proof.hashes])
+            count = proof.leaf_count
+            while count > 1:
+                parents = {}
+                for index in sorted(nodes):
+                    if index % 2 and index - 1 in nodes:
+                        continue
+                    sibling = index ^ 1
+                    if sibling >= count:
+                        # Odd last node is paired with itself
+                        other = nodes[index]
+                    elif sibling in nodes:
+                        other = nodes[sibling]
+                    else:
+                        other = next(siblings)
+                    if index % 2:
+                        parents[index // 2] = combine_digests(other, nodes[index], proof.scheme,
+                                                              proof.algorithm)
+                    else:
+                        parents[index // 2] = combine_digests(nodes[index], other, proof.scheme,
+                                                              proof.algorithm)
+                nodes = parents
+                count = (count + 1) // 2
+        except (StopIteration, TypeError, ValueError):
+            return False
+
+        # Every supplied hash must have been used
+        if next(siblings, None) is not None:
+            return False
+        return nodes[0].hex() == root_hash
+
+    @staticmethod
+    def verify_proof(transaction_hash: str, proof: List[tuple], root_hash: str,
+                     scheme: str = MERKLE_SCHEME_HEX, algorithm: str = HASH_SHA256) -> bool:
         """
         Verify a Merkle proof.
 
@@ -146,19 +464,24 @@ class MerkleTree:
             transaction_hash: Hash of the transaction
             proof: Merkle proof path
             root_hash: Expected root hash
+            scheme: Merkle hashing scheme the root was built with
+            algorithm: Hash algorithm the root was built with
 
         Returns:
             True if proof is valid, False otherwise
         """
-        current_hash = transaction_hash
-
-        for proof_hash, side in proof:
-            if side == 'left':
-                current_hash = HashUtils.combine_hashes(proof_hash, current_hash)
-            else:
-                current_hash = HashUtils.combine_hashes(current_hash, proof_hash)
+        try:
+            current = bytes.fromhex(transaction_hash)
+            for proof_hash, side in proof:
+                sibling = bytes.fromhex(proof_hash)
+                if side == 'left':
+                    current = combine_digests(sibling, current, scheme, algorithm)
+                else:
+                    current = combine_digests(current, sibling, scheme, algorithm)
+        except (TypeError, ValueError):
+            return False
 
-        return current_hash == root_hash
+        return current.hex() == root_hash
 
     def __repr__(self) -> str:
         """String representation of the Merkle tree."""
@@ -3,11 +3,21 @@ Transaction structure for the blockchain.
 Every accounting operation is represented as a transaction.
 """
 
+import json
 import time
 import uuid
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field, asdict
-from .hash_utils import HashUtils
+from typing import Callable, Dict, Any, Optional
+from dataclasses import dataclass, field, fields, asdict
+from .hash_utils import HashUtils, HASH_SHA256
+from .immutable import ImmutableError, freeze, thaw
+
+
+# Fields covered by the transaction hash; assigning one invalidates the cached encoding
+HASHED_FIELDS = frozenset({
+    'transaction_id', 'timestamp', 'nonce', 'transaction_type', 'module', 'contract_name',
+    'data', 'from_wallet', 'approvals', 'approval_required', 'approval_count_required',
+    'previous_transaction_hash',
+})
 
 
 @dataclass
@@ -15,8 +25,28 @@ class Transaction:
     """
     Represents a single transaction in the blockchain.
     All transactions are immutable once created.
+
+    The canonical encoding and hash are cached until a hashed field is
+    assigned, so repeated integrity checks of a sealed transaction only
+    compare hashes. Code that mutates ``data`` or ``approvals`` in place
+    must call ``invalidate_hash_cache``. Transactions hashed in a batch also
+    keep their encoding split around ``previous_transaction_hash``, so
+    linking them into the pending pool costs one hashing pass.
+
+    The hash algorithm is not part of the transaction record: it is the
+    chain's, and blocks assign it to the transactions they hold.
+
+    Transactions of a block appended to the chain are sealed: their fields
+    can no longer be assigned and their payloads become read-only.
     """
 
+    # Hash cache counters shared by all transactions
+    hash_cache_hits = 0
+    hash_cache_misses = 0
+
+    # Hash algorithm (set per instance by the chain; not a dataclass field)
+    hash_algorithm = HASH_SHA256
+
     # Transaction identification
     transaction_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     timestamp: float = field(default_factory=time.time)
@@ -54,15 +84,140 @@ class Transaction:
         if not self.transaction_hash:
             self.transaction_hash = self._calculate_hash()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, dropping the cached encoding if it is hashed."""
+        state = self.__dict__
+        if '_sealed' in state:
+            raise ImmutableError(f"Transaction is sealed; cannot set {name}")
+        if name in HASHED_FIELDS and ('_hash_cache' in state or '_canonical_parts' in state):
+            state.pop('_hash_cache', None)
+            if name != 'previous_transaction_hash':
+                state.pop('_canonical_parts', None)
+        elif name == 'hash_algorithm':
+            # The encoding is unchanged, only its digest differs
+            state.pop('_hash_cache', None)
+        elif name == 'transaction_hash' and '_rehash_callback' in state:
+            previous_hash = state.get('transaction_hash')
+            object.__setattr__(self, name, value)
+            if value != previous_hash:
+                state['_rehash_callback'](self, previous_hash)
+            return
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the pickled state (the rehash callback stays behind)."""
+        state = dict(self.__dict__)
+        state.pop('_rehash_callback', None)
+        return state
+
+    def set_rehash_callback(self, callback: Optional[Callable[['Transaction', Optional[str]], None]]) -> None:
+        """
+        Register a function called with the transaction and its previous hash
+        whenever its hash changes (e.g. when an approval is added), so an
+        index keyed by hash can re-key it.
+
+        Args:
+            callback: Function to call, or None to remove the callback
+        """
+        if callback is None:
+            self.__dict__.pop('_rehash_callback', None)
+        else:
+            self.__dict__['_rehash_callback'] = callback
+
+    @property
+    def sealed(self) -> bool:
+        """Whether the transaction has been sealed."""
+        return '_sealed' in self.__dict__
+
+    def seal(self) -> 'Transaction':
+        """
+        Make the transaction immutable.
+        Payload dictionaries and lists are replaced by read-only copies,
+        which encode and hash exactly like the originals.
+
+        Returns:
+            The transaction
+        """
+        if '_sealed' not in self.__dict__:
+            for name in ('data', 'approvals', 'metadata'):
+                object.__setattr__(self, name, freeze(getattr(self, name)))
+            self.__dict__['_sealed'] = True
+        return self
+
+    def invalidate_hash_cache(self) -> None:
+        """Drop the cached canonical encoding after an in-place mutation."""
+        self.__dict__.pop('_hash_cache', None)
+        self.__dict__.pop('_canonical_parts', None)
+
+    def canonical_bytes(self) -> bytes:
+        """
+        Get the canonical encoding the transaction hash is computed from.
+
+        Returns:
+            Canonical bytes
+        """
+        self._cached_hash()
+        return self.__dict__['_hash_cache'][0]
+
+    def _cached_hash(self) -> str:
+        """
+        Get the hash of the current contents, reusing the cached encoding.
+
+        Returns:
+            Transaction hash
+        """
+        cache = self.__dict__.get('_hash_cache')
+        if cache is None:
+            Transaction.hash_cache_misses += 1
+            self._calculate_hash()
+            cache = self.__dict__['_hash_cache']
+        else:
+            Transaction.hash_cache_hits += 1
+        return cache[1]
+
+    @classmethod
+    def get_hash_cache_stats(cls) -> Dict[str, Any]:
+        """
+        Get hash cache statistics for all transactions.
+
+        Returns:
+            Dictionary with hits, misses and hit rate
+        """
+        lookups = cls.hash_cache_hits + cls.hash_cache_misses
+        return {
+            "hits": cls.hash_cache_hits,
+            "misses": cls.hash_cache_misses,
+            "hit_rate": cls.hash_cache_hits / lookups if lookups else 0.0,
+        }
+
+    @classmethod
+    def reset_hash_cache_stats(cls) -> None:
+        """Reset the hash cache counters."""
+        cls.hash_cache_hits = 0
+        cls.hash_cache_misses = 0
+
     def _calculate_hash(self) -> str:
         """
-        Calculate SHA-256 hash of the transaction.
+        Calculate hash of the transaction with its hash algorithm.
+        Always re-serializes the transaction, and refreshes the cache.
 
         Returns:
             Transaction hash
         """
+        canonical = HashUtils.canonical_bytes(self._hash_data())
+        transaction_hash = HashUtils.hash_bytes(canonical, self.hash_algorithm)
+        self.__dict__['_hash_cache'] = (canonical, transaction_hash)
+        return transaction_hash
+
+    def _hash_data(self) -> Dict[str, Any]:
+        """
+        Get the fields covered by the transaction hash.
+
+        Returns:
+            Dictionary of hashed fields
+        """
         # Create deterministic hash from transaction data
-        hash_data = {
+        return {
             'transaction_id': self.transaction_id,
             'timestamp': self.timestamp,
             'nonce': self.nonce,
@@ -77,7 +232,19 @@ class Transaction:
             'previous_transaction_hash': self.previous_transaction_hash,
         }
 
-        return HashUtils.hash_dict(hash_data)
+    def _install_hash(self, prefix: bytes, suffix: bytes, transaction_hash: str) -> None:
+        """
+        Adopt a hash computed elsewhere (e.g. by a batch hashing worker).
+
+        Args:
+            prefix: Canonical encoding before the previous transaction hash
+            suffix: Canonical encoding after the previous transaction hash
+            transaction_hash: Hash of the full canonical encoding
+        """
+        previous = json.dumps(self.previous_transaction_hash, ensure_ascii=False).encode('utf-8')
+        self.__dict__['_canonical_parts'] = (prefix, suffix)
+        self.__dict__['_hash_cache'] = (prefix + previous + suffix, transaction_hash)
+        self.transaction_hash = transaction_hash
 
     def recalculate_hash(self) -> str:
         """
@@ -87,7 +254,16 @@ class Transaction:
         Returns:
             New transaction hash
         """
-        self.transaction_hash = self._calculate_hash()
+        parts = self.__dict__.get('_canonical_parts')
+        if parts is None:
+            self.transaction_hash = self._calculate_hash()
+            return self.transaction_hash
+
+        # Only the previous transaction hash changed: splice it in
+        previous = json.dumps(self.previous_transaction_hash, ensure_ascii=False).encode('utf-8')
+        canonical = parts[0] + previous + parts[1]
+        self.transaction_hash = HashUtils.hash_bytes(canonical, self.hash_algorithm)
+        self.__dict__['_hash_cache'] = (canonical, self.transaction_hash)
         return self.transaction_hash
 
     def add_approval(self, wallet_address: str, signature: str, role: str) -> bool:
@@ -110,6 +286,7 @@ class Transaction:
         }
 
         self.approvals.append(approval)
+        self.invalidate_hash_cache()
         self.recalculate_hash()
 
         # Update status if all approvals collected
@@ -130,14 +307,23 @@ class Transaction:
 
         return len(self.approvals) >= self.approval_count_required
 
-    def verify_integrity(self) -> bool:
+    def verify_integrity(self, deep: bool = False) -> bool:
         """
         Verify transaction hash integrity.
+        The cached encoding is only trusted once the transaction is sealed;
+        an unsealed transaction is always re-serialized, since ``data`` and
+        ``approvals`` can be mutated in place without invalidating the cache.
+
+        Args:
+            deep: Re-serialize the transaction even if it is sealed
 
         Returns:
             True if hash is valid
         """
-        expected_hash = self._calculate_hash()
+        if deep or '_sealed' not in self.__dict__:
+            expected_hash = self._calculate_hash()
+        else:
+            expected_hash = self._cached_hash()
         return self.transaction_hash == expected_hash
 
     def to_dict(self) -> Dict[str, Any]:
@@ -145,10 +331,36 @@ class Transaction:
         Convert transaction to dictionary.
 
         Returns:
-            Dictionary representation
+            Dictionary representation (always mutable)
         """
+        if '_sealed' in self.__dict__:
+            return {f.name: thaw(getattr(self, f.name)) for f in fields(self)}
         return asdict(self)
 
+    def to_bytes(self) -> bytes:
+        """
+        Encode transaction with the compact binary codec.
+
+        Returns:
+            Encoded transaction
+        """
+        from .codec import encode_transaction
+        return encode_transaction(self)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'Transaction':
+        """
+        Decode transaction from the compact binary codec.
+
+        Args:
+            payload: Encoded transaction
+
+        Returns:
+            Transaction instance
+        """
+        from .codec import decode_transaction
+        return decode_transaction(payload)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
         """
@@ -224,6 +436,12 @@ class TransactionBuilder:
         self._transaction.metadata = metadata
         return self
 
+    def set_hash_algorithm(self, algorithm: str) -> 'TransactionBuilder':
+        """Set hash algorithm (must match the chain the transaction is for)."""
+        HashUtils.get_hasher(algorithm)
+        self._transaction.hash_algorithm = algorithm
+        return self
+
     def build(self) -> Transaction:
         """
         Build and return the transaction.
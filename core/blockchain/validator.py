@@ -3,10 +3,65 @@ Validation engine for blockchain operations.
 Ensures integrity and prevents tampering.
 """
 
-from typing import List, Optional, Dict, Any
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from .block import Block
 from .transaction import Transaction
 from .chain import Blockchain
+from ..storage.block_store import decode_block
+from ..storage.checkpoint import EMPTY_STATE_DIGEST, advance_state_digest
+
+
+# Header of a validated block for the shard boundary checks:
+# (index, block_hash, previous_hash, hash_algorithm); an undecodable block
+# has only its index, and None for the rest
+ValidatedHeader = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+def _validated_header(block: Block) -> ValidatedHeader:
+    """Get the header of a block for the shard boundary checks."""
+    return block.index, block.block_hash, block.previous_hash, block.hash_algorithm
+
+
+def validate_block_chunk(records: List[Tuple[int, int, bytes]]
+                         ) -> Tuple[List[ValidatedHeader], List[Tuple[int, str]], int]:
+    """
+    Decode and validate a range of stored blocks.
+    Runs inside pool workers, so it only touches its arguments. The first
+    block, and any block after an undecodable one, is not linked to its
+    predecessor here; that is left to the in-order pass over the headers.
+
+    Args:
+        records: Tuples of (block_index, record_format, payload)
+
+    Returns:
+        Tuple of (headers, errors as (block_index, error), transaction_count)
+    """
+    headers = []
+    errors = []
+    transaction_count = 0
+    now = time.time()
+    previous_block = None
+    for index, record_format, payload in records:
+        try:
+            block = decode_block(record_format, payload)
+        except Exception:
+            errors.append((index, "Stored block cannot be decoded"))
+            headers.append((index, None, None, None))
+            previous_block = None
+            continue
+
+        is_valid, error = BlockchainValidator.validate_block(block, previous_block, now)
+        if not is_valid:
+            errors.append((index, error))
+        headers.append(_validated_header(block))
+        transaction_count += len(block.transactions)
+        previous_block = block
+
+    return headers, errors, transaction_count
 
 
 class ValidationError(Exception):
@@ -20,12 +75,14 @@ class BlockchainValidator:
     """
 
     @staticmethod
-    def validate_transaction(transaction: Transaction) -> tuple[bool, Optional[str]]:
+    def validate_transaction(transaction: Transaction,
+                             now: Optional[float] = None) -> tuple[bool, Optional[str]]:
         """
         Validate a transaction before adding to pending pool.
 
         Args:
             transaction: Transaction to validate
+            now: Current time (read once per block when validating blocks)
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -51,8 +108,9 @@ class BlockchainValidator:
             return False, "Transaction hash integrity check failed"
 
         # Check timestamp validity (prevent future timestamps)
-        import time
-        if transaction.timestamp > time.time() + 60:  # Allow 60s clock skew
+        if now is None:
+            now = time.time()
+        if transaction.timestamp > now + 60:  # Allow 60s clock skew
             return False, "Transaction timestamp is in the future"
 
         # Validate approval requirements
@@ -66,13 +124,15 @@ class BlockchainValidator:
         return True, None
 
     @staticmethod
-    def validate_block(block: Block, previous_block: Optional[Block] = None) -> tuple[bool, Optional[str]]:
+    def validate_block(block: Block, previous_block: Optional[Block] = None,
+                       now: Optional[float] = None) -> tuple[bool, Optional[str]]:
         """
         Validate a block before adding to chain.
 
         Args:
             block: Block to validate
             previous_block: Previous block in chain
+            now: Current time for the transaction timestamp checks
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -89,14 +149,20 @@ class BlockchainValidator:
             if block.index != previous_block.index + 1:
                 return False, "Block index mismatch"
 
+            # A chain keeps the hash algorithm of its genesis block
+            if block.hash_algorithm != previous_block.hash_algorithm:
+                return False, "Hash algorithm mismatch"
+
         # Genesis block special validation
         if block.index == 0:
             if block.previous_hash != "0":
                 return False, "Invalid genesis block previous hash"
 
         # Validate all transactions in block
+        if now is None:
+            now = time.time()
         for tx in block.transactions:
-            is_valid, error = BlockchainValidator.validate_transaction(tx)
+            is_valid, error = BlockchainValidator.validate_transaction(tx, now)
             if not is_valid:
                 return False, f"Invalid transaction in block: {error}"
 
@@ -107,12 +173,25 @@ class BlockchainValidator:
         return True, None
 
     @staticmethod
-    def validate_chain(blockchain: Blockchain) -> tuple[bool, List[str]]:
+    def validate_chain(blockchain: Blockchain, full: bool = False, workers: int = 1,
+                       chunk_size: int = 256) -> tuple[bool, List[str]]:
         """
-        Validate entire blockchain.
+        Validate the blockchain.
+        Only blocks above the chain's validated-height watermark are
+        validated (including their link to the block below), and the
+        watermark is moved up to the last valid block.
+
+        With more than one worker, the persisted blocks are validated
+        from storage in a process pool: each worker decodes and validates
+        a range of blocks, range boundaries and stored hashes are checked
+        against the chain here, and errors are reported in chain order.
+        Throughput is recorded in blockchain.last_validation_stats.
 
         Args:
             blockchain: Blockchain to validate
+            full: Validate every block from genesis
+            workers: Worker processes (1 = serial, 0 = one per CPU)
+            chunk_size: Number of blocks handed to a worker at a time
 
         Returns:
             Tuple of (is_valid, list_of_errors)
@@ -123,25 +202,134 @@ class BlockchainValidator:
             errors.append("Empty blockchain")
             return False, errors
 
-        # Validate genesis block
-        genesis = blockchain.chain[0]
-        if genesis.index != 0:
-            errors.append("Genesis block index is not 0")
-
-        if genesis.previous_hash != "0":
-            errors.append("Genesis block previous hash is not '0'")
+        started = time.perf_counter()
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        start = 0 if full else blockchain.validated_height + 1
+        first_invalid = None
 
-        # Validate each block
-        for i in range(len(blockchain.chain)):
+        # Validate genesis block
+        if start == 0:
+            genesis = blockchain.chain[0]
+            if genesis.index != 0:
+                errors.append("Genesis block index is not 0")
+
+            if genesis.previous_hash != "0":
+                errors.append("Genesis block previous hash is not '0'")
+
+            if errors:
+                first_invalid = 0
+
+        # Validate stored blocks in the pool, then the rest here
+        serial_start = start
+        transaction_count = 0
+        if workers > 1:
+            stored = min(len(blockchain.store), len(blockchain.chain))
+            if stored - start > chunk_size:
+                block_errors, transaction_count = BlockchainValidator._validate_stored_blocks(
+                    blockchain, start, stored, workers, chunk_size)
+                for index, error in block_errors:
+                    errors.append(f"Block {index}: {error}")
+                    if first_invalid is None:
+                        first_invalid = index
+                serial_start = stored
+
+        now = time.time()
+        for i in range(serial_start, len(blockchain.chain)):
             block = blockchain.chain[i]
             previous_block = blockchain.chain[i - 1] if i > 0 else None
 
-            is_valid, error = BlockchainValidator.validate_block(block, previous_block)
+            is_valid, error = BlockchainValidator.validate_block(block, previous_block, now)
+            transaction_count += len(block.transactions)
             if not is_valid:
                 errors.append(f"Block {i}: {error}")
-
+                if first_invalid is None:
+                    first_invalid = i
+
+        blockchain.validated_height = len(blockchain.chain) - 1 if first_invalid is None else first_invalid - 1
+
+        seconds = time.perf_counter() - started
+        block_count = max(0, len(blockchain.chain) - start)
+        blockchain.last_validation_stats = {
+            "blocks": block_count,
+            "transactions": transaction_count,
+            "workers": workers,
+            "elapsed_ms": seconds * 1000.0,
+            "blocks_per_second": block_count / seconds if seconds > 0 else 0.0,
+            "transactions_per_second": transaction_count / seconds if seconds > 0 else 0.0,
+            "valid": not errors,
+        }
         return len(errors) == 0, errors
 
+    @staticmethod
+    def _validate_stored_blocks(blockchain: Blockchain, start: int, stop: int, workers: int,
+                                chunk_size: int) -> Tuple[List[Tuple[int, str]], int]:
+        """
+        Validate a range of persisted blocks in a process pool.
+
+        Args:
+            blockchain: Blockchain whose store is read
+            start: First block index
+            stop: Block index to stop before
+            workers: Number of worker processes
+            chunk_size: Number of blocks per worker task
+
+        Returns:
+            Tuple of (errors as (block_index, error) in chain order, transaction_count)
+        """
+        def chunks() -> Iterator[List[Tuple[int, int, bytes]]]:
+            chunk = []
+            for record in blockchain.store.iter_block_payloads(start):
+                if record[0] >= stop:
+                    break
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def results() -> Iterator[Tuple[List[ValidatedHeader], List[Tuple[int, str]], int]]:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for chunk in chunks():
+                    pending.append(executor.submit(validate_block_chunk, chunk))
+                    if len(pending) >= workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+        errors = []
+        transaction_count = 0
+        previous = _validated_header(blockchain.chain[start - 1]) if start > 0 else None
+
+        for headers, chunk_errors, chunk_transactions in results():
+            transaction_count += chunk_transactions
+            failed = dict(chunk_errors)
+            for position, header in enumerate(headers):
+                index, block_hash, previous_hash, hash_algorithm = header
+                if block_hash is None:
+                    # Undecodable (already reported): link the next block to
+                    # the block the chain in memory holds at this index
+                    previous = _validated_header(blockchain.chain[index])
+                    continue
+                if index not in failed:
+                    # The first block of a range, and a block after an
+                    # undecodable one, are linked to their predecessor here
+                    unlinked = position == 0 or headers[position - 1][1] is None
+                    if unlinked and previous is not None:
+                        if previous_hash != previous[1]:
+                            failed[index] = "Previous hash mismatch"
+                        elif index != previous[0] + 1:
+                            failed[index] = "Block index mismatch"
+                        elif hash_algorithm != previous[3]:
+                            failed[index] = "Hash algorithm mismatch"
+                    if index not in failed and blockchain.chain[index].block_hash != block_hash:
+                        failed[index] = "Stored block differs from the chain in memory"
+                previous = header
+            errors.extend(sorted(failed.items()))
+
+        return errors, transaction_count
+
     @staticmethod
     def validate_approval_chain(transaction: Transaction) -> tuple[bool, Optional[str]]:
         """
@@ -237,6 +425,169 @@ class BlockchainValidator:
 
         return results
 
+    @staticmethod
+    def scan_tampering(blockchain: Blockchain, deep: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Localise tampering, yielding findings as soon as they are found.
+
+        The scan runs in three passes of increasing cost:
+        1. Block headers: block hash, index and previous-hash linkage.
+        2. Checkpoints: the running digest of block hashes is compared
+           with the stored checkpoints by bisection, since a damaged block
+           changes the digest of every later checkpoint. The scan then
+           re-anchors on the checkpoint it found and bisects again, so each
+           damaged range between two checkpoints is reported.
+        3. Suspect blocks only (failed headers, damaged checkpoint ranges
+           and blocks above the last checkpoint that were not verified on
+           load): Merkle root and a full re-serialization of every
+           transaction.
+
+        Transaction payloads of blocks whose headers match a checkpoint
+        are trusted unless ``deep`` is set.
+
+        Args:
+            blockchain: Blockchain to scan
+            deep: Rehash the transactions of every block
+
+        Yields:
+            Finding dictionaries, ending with a "scan_summary" entry
+        """
+        length = len(blockchain.chain)
+        suspects = set()
+        tampered = False
+
+        # Pass 1: block headers
+        block_hashes = []
+        previous_block = None
+        for i, block in enumerate(blockchain.chain):
+            block_hashes.append(block.block_hash)
+
+            expected_hash = block._calculate_hash()
+            if block.block_hash != expected_hash:
+                tampered = True
+                suspects.add(i)
+                yield {
+                    "type": "block_hash_mismatch",
+                    "block_index": i,
+                    "expected": expected_hash,
+                    "actual": block.block_hash
+                }
+
+            if block.index != i:
+                tampered = True
+                suspects.add(i)
+                yield {
+                    "type": "block_index_mismatch",
+                    "block_index": i,
+                    "actual_index": block.index
+                }
+
+            expected_previous = previous_block.block_hash if previous_block is not None else "0"
+            if block.previous_hash != expected_previous:
+                tampered = True
+                suspects.add(i)
+                yield {
+                    "type": "chain_break",
+                    "block_index": i,
+                    "expected_previous": expected_previous,
+                    "actual_previous": block.previous_hash
+                }
+            previous_block = block
+
+        # Pass 2: bisect over checkpoint digests
+        heights = [height for height in blockchain.checkpoints.list_heights() if height < length]
+        checkpoints = {}
+
+        def load_checkpoint(height: int):
+            if height not in checkpoints:
+                checkpoints[height] = blockchain.checkpoints.load(height)
+            return checkpoints[height]
+
+        anchor = 0
+        anchor_height = -1
+        anchor_digest = EMPTY_STATE_DIGEST
+        while anchor < len(heights):
+            # Digests at the remaining checkpoints, folded from the anchor
+            digests = {}
+            wanted = set(heights[anchor:])
+            state_digest = anchor_digest
+            for height in range(anchor_height + 1, heights[-1] + 1):
+                state_digest = advance_state_digest(state_digest, block_hashes[height])
+                if height in wanted:
+                    digests[height] = state_digest
+
+            low, high = anchor, len(heights)
+            while low < high:
+                middle = (low + high) // 2
+                checkpoint = load_checkpoint(heights[middle])
+                if checkpoint is not None and checkpoint.state_digest == digests[heights[middle]] \
+                        and checkpoint.tip_hash == block_hashes[heights[middle]]:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low == len(heights):
+                break
+
+            damaged_height = heights[low]
+            range_start = heights[low - 1] + 1 if low > anchor else anchor_height + 1
+            tampered = True
+            suspects.update(range(range_start, damaged_height + 1))
+            yield {
+                "type": "checkpoint_mismatch",
+                "checkpoint_height": damaged_height,
+                "range_start": range_start,
+                "range_end": damaged_height
+            }
+
+            checkpoint = load_checkpoint(damaged_height)
+            anchor = low + 1
+            anchor_height = damaged_height
+            anchor_digest = checkpoint.state_digest if checkpoint is not None else digests[damaged_height]
+
+        # Blocks above the last checkpoint are only covered if verified on load
+        covered = max(heights[-1] if heights else -1, blockchain.verified_height)
+        suspects.update(range(covered + 1, length))
+        if deep:
+            suspects.update(range(length))
+
+        # Pass 3: Merkle roots and transaction hashes of suspect blocks
+        checked_transactions = 0
+        for i in sorted(suspects):
+            block = blockchain.chain[i]
+
+            expected_merkle = block._calculate_merkle_root()
+            if block.merkle_root != expected_merkle:
+                tampered = True
+                yield {
+                    "type": "merkle_root_mismatch",
+                    "block_index": i,
+                    "expected": expected_merkle,
+                    "actual": block.merkle_root
+                }
+
+            for tx in block.transactions:
+                checked_transactions += 1
+
+                expected_tx_hash = tx._calculate_hash()
+                if tx.transaction_hash != expected_tx_hash:
+                    tampered = True
+                    yield {
+                        "type": "transaction_hash_mismatch",
+                        "block_index": i,
+                        "transaction_id": tx.transaction_id,
+                        "expected": expected_tx_hash,
+                        "actual": tx.transaction_hash
+                    }
+
+        yield {
+            "type": "scan_summary",
+            "tampered": tampered,
+            "checked_blocks": length,
+            "checkpoints": len(heights),
+            "deep_hashed_blocks": len(suspects),
+            "checked_transactions": checked_transactions
+        }
+
     @staticmethod
     def validate_transaction_replay(transaction: Transaction, blockchain: Blockchain) -> tuple[bool, Optional[str]]:
         """
@@ -255,10 +606,8 @@ class BlockchainValidator:
             return False, "Transaction already exists (possible replay attack)"
 
         # Check if transaction ID already exists
-        for block in blockchain.chain:
-            for tx in block.transactions:
-                if tx.transaction_id == transaction.transaction_id:
-                    return False, "Transaction ID already used (possible replay attack)"
+        if blockchain.locate_transaction_by_id(transaction.transaction_id) is not None:
+            return False, "Transaction ID already used (possible replay attack)"
 
         return True, None
 
@@ -325,7 +674,6 @@ class SecurityValidator:
         Returns:
             True if timestamp is valid
         """
-        import time
         current_time = time.time()
 
         # Check if timestamp is too far in the past
@@ -3,6 +3,8 @@ Main application entry point.
 Initializes the Web3 Accounting & Audit System.
 """
 
+from typing import Optional
+
 from .blockchain import Blockchain, GenesisBlockCreator
 from .contracts import register_all_contracts, get_global_registry
 from .wallet import get_role_manager, get_wallet_authenticator
@@ -13,18 +15,43 @@ class Web3AccountingSystem:
     Main system class that initializes and manages all components.
     """
 
-    def __init__(self, storage_path: str = "blockchain_data"):
+    def __init__(self, storage_path: str = "blockchain_data", memory_mapped: bool = False,
+                 full_verification: bool = False, write_behind: bool = False,
+                 storage_backend: str = "segment", compression: Optional[str] = None,
+                 load_workers: int = 1, hash_algorithm: Optional[str] = None,
+                 scrub: bool = False, scrub_io_bytes_per_second: Optional[float] = 4 * 1024 * 1024):
         """
         Initialize the Web3 Accounting System.
 
         Args:
             storage_path: Path for blockchain storage
+            memory_mapped: Serve blocks from the memory-mapped store instead
+                of loading the whole chain into memory
+            full_verification: Verify every block on startup instead of
+                trusting the latest checkpoint
+            write_behind: Persist new blocks from a background writer
+            storage_backend: Storage engine ("segment" or "sqlite")
+            compression: Codec for cold block segments ("zlib", "lzma" or None)
+            load_workers: Processes used to decode and verify blocks (0 = one per CPU)
+            hash_algorithm: Hash algorithm of a new chain ("SHA-256" or "BLAKE2b")
+            scrub: Re-verify stored blocks from a background scrubber
+            scrub_io_bytes_per_second: Maximum bytes per second the scrubber reads
         """
         print("🚀 Initializing Web3 Accounting & Audit System...")
 
         # Initialize blockchain
         print("📦 Creating blockchain...")
-        self.blockchain = Blockchain(storage_path)
+        self.blockchain = Blockchain(storage_path, memory_mapped=memory_mapped,
+                                     full_verification=full_verification,
+                                     write_behind=write_behind,
+                                     storage_backend=storage_backend,
+                                     compression=compression,
+                                     load_workers=load_workers,
+                                     hash_algorithm=hash_algorithm)
+
+        if scrub:
+            print("🧽 Starting integrity scrubber...")
+            self.blockchain.start_scrubber(io_bytes_per_second=scrub_io_bytes_per_second)
 
         # Register all smart contracts
         print("📜 Registering smart contracts...")
@@ -0,0 +1,77 @@
+"""
+Storage module for Web3 Accounting & Audit System.
+
+This module provides block persistence including:
+- Append-only segmented record log with checksummed records
+- Fixed-width offset index for direct record access
+- Memory-mapped chain view that decodes blocks on demand
+- Block store with import of legacy per-block JSON directories
+- Verified checkpoints for fast startup
+- Group-commit durability with torn-record recovery
+- Write-behind persistence from a background thread
+- Pluggable block store interface with a SQLite backend
+- Compressed cold segments with an optional trained zlib dictionary
+- Parallel block decoding and verification across worker processes
+- Streaming NDJSON chain export and verified import
+- Merkle Mountain Range accumulator for block inclusion proofs
+- Rate-limited background scrubbing of persisted blocks
+- Transaction location index by hash and ID, and per-wallet posting lists
+"""
+
+from .segment_log import SegmentedLog, StorageError, CorruptRecordError
+from .block_store import BlockStore, SegmentBlockStore
+from .sqlite_store import SQLiteBlockStore
+from .compression import RecordCompressor, train_dictionary, CODEC_ZLIB, CODEC_LZMA
+from .mapped_chain import MappedChain
+from .checkpoint import Checkpoint, CheckpointManager
+from .durability import GroupCommitter, CommitStats, FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS
+from .write_behind import WriteBehindWriter
+from .parallel_loader import ParallelChainLoader, LoadResult
+from .chain_export import (
+    ChainImportReader,
+    ChainImportError,
+    ExportManifest,
+    export_ndjson,
+    import_ndjson,
+    stage_export
+)
+from .mmr import MerkleMountainRange, MMRProof
+from .scrubber import IntegrityScrubber
+from .tx_index import TransactionIndex, WalletIndex
+
+__all__ = [
+    'SegmentedLog',
+    'StorageError',
+    'CorruptRecordError',
+    'BlockStore',
+    'SegmentBlockStore',
+    'SQLiteBlockStore',
+    'RecordCompressor',
+    'train_dictionary',
+    'CODEC_ZLIB',
+    'CODEC_LZMA',
+    'MappedChain',
+    'Checkpoint',
+    'CheckpointManager',
+    'GroupCommitter',
+    'CommitStats',
+    'FSYNC_ALWAYS',
+    'FSYNC_INTERVAL',
+    'FSYNC_OS',
+    'WriteBehindWriter',
+    'ParallelChainLoader',
+    'LoadResult',
+    'ChainImportReader',
+    'ChainImportError',
+    'ExportManifest',
+    'export_ndjson',
+    'import_ndjson',
+    'stage_export',
+    'MerkleMountainRange',
+    'MMRProof',
+    'IntegrityScrubber',
+    'TransactionIndex',
+    'WalletIndex',
+]
+
+__version__ = '1.0.0'
@@ -0,0 +1,394 @@
+"""
+Block storage engines.
+Defines the storage interface used by Blockchain and the default engine
+built on the segmented record log.
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..blockchain import codec
+from ..blockchain.block import Block
+from ..blockchain.transaction import Transaction
+from .segment_log import SegmentedLog, StorageError, DEFAULT_MAX_SEGMENT_BYTES
+from .durability import FSYNC_INTERVAL
+
+
+# Record format bytes
+FORMAT_JSON = 1
+FORMAT_BINARY = 2
+
+RECORD_FORMATS = (FORMAT_JSON, FORMAT_BINARY)
+
+
+def hash_key(block_hash: str) -> bytes:
+    """
+    Convert a hex block hash into the 32-byte key used by the offset index.
+    Hashes that are not 64-character hex strings are digested instead.
+
+    Args:
+        block_hash: Block hash
+
+    Returns:
+        32-byte index key
+    """
+    if len(block_hash) == 64:
+        try:
+            return bytes.fromhex(block_hash)
+        except ValueError:
+            pass
+    return hashlib.sha256(block_hash.encode('utf-8')).digest()
+
+
+def encode_block(block: Block, record_format: int = FORMAT_JSON) -> bytes:
+    """
+    Serialize a block into a record payload.
+
+    Args:
+        block: Block to encode
+        record_format: FORMAT_JSON or FORMAT_BINARY (compact codec)
+
+    Returns:
+        Encoded payload
+    """
+    if record_format == FORMAT_BINARY:
+        return codec.encode_block(block)
+    if record_format == FORMAT_JSON:
+        return json.dumps(block.to_dict(), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    raise StorageError(f"Unsupported block record format: {record_format}")
+
+
+def decode_block(record_format: int, payload: bytes) -> Block:
+    """
+    Deserialize a block from a record payload.
+
+    Args:
+        record_format: Record format byte
+        payload: Encoded payload
+
+    Returns:
+        Block instance
+    """
+    if record_format == FORMAT_BINARY:
+        return codec.decode_block(payload)
+    if record_format == FORMAT_JSON:
+        return Block.from_dict(json.loads(payload))
+    raise StorageError(f"Unsupported block record format: {record_format}")
+
+
+class _BlockLog(SegmentedLog):
+    """Segmented log that knows how to derive block index keys."""
+
+    def key_from_payload(self, record_format: int, payload: bytes) -> bytes:
+        """Derive the index key from the stored block hash."""
+        return hash_key(decode_block(record_format, payload).block_hash or "")
+
+
+class BlockStore(ABC):
+    """
+    Abstract base class for block storage engines.
+    Block ``n`` of the chain is always stored at position ``n``.
+
+    Engines with ``indexed = True`` answer transaction field lookups from
+    their own indexes; for the others Blockchain falls back to scanning
+    blocks. Hash and ID lookups go through the chain's transaction index.
+    """
+
+    indexed = False
+
+    # Transaction fields that indexed engines can search by
+    TRANSACTION_INDEX_FIELDS = ("from_wallet", "module", "transaction_type")
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored blocks."""
+        pass
+
+    @abstractmethod
+    def append_block(self, block: Block) -> None:
+        """
+        Append a block to the store.
+
+        Args:
+            block: Block to append (must be the next index)
+        """
+        pass
+
+    @abstractmethod
+    def read_block(self, index: int) -> Optional[Block]:
+        """
+        Read a single block by index.
+
+        Args:
+            index: Block index
+
+        Returns:
+            Block or None if not stored
+        """
+        pass
+
+    @abstractmethod
+    def iter_blocks(self, start: int = 0) -> Iterator[Block]:
+        """
+        Iterate stored blocks in order.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Blocks in index order
+        """
+        pass
+
+    def iter_block_payloads(self, start: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Iterate stored blocks as encoded payloads without decoding them,
+        for handing to other processes.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Tuples of (block_index, record_format, payload) for decode_block
+        """
+        for block in self.iter_blocks(start):
+            yield block.index, FORMAT_JSON, encode_block(block)
+
+    @abstractmethod
+    def find_block(self, block_hash: str) -> Optional[int]:
+        """
+        Find the index of a block by its hash.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Block index or None if not found
+        """
+        pass
+
+    @abstractmethod
+    def sync(self, count: Optional[int] = None) -> None:
+        """
+        Make appended blocks durable now.
+
+        Args:
+            count: Number of blocks that must be durable (None = all)
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Make appended blocks durable and release resources."""
+        pass
+
+    def read_transaction(self, index: int, position: int) -> Optional[Transaction]:
+        """
+        Read a single transaction by its location.
+
+        Args:
+            index: Index of the containing block
+            position: Position of the transaction within the block
+
+        Returns:
+            Transaction or None if not stored
+        """
+        block = self.read_block(index)
+        if block is None or not 0 <= position < len(block.transactions):
+            return None
+        return block.transactions[position]
+
+    def find_transactions(self, field: str, value: str) -> List[Tuple[int, int]]:
+        """
+        Find the locations of transactions by an indexed field.
+
+        Args:
+            field: One of TRANSACTION_INDEX_FIELDS
+            value: Field value to match
+
+        Returns:
+            List of (block_index, position) tuples in chain order (always
+            empty for engines that are not ``indexed``)
+        """
+        return []
+
+    def import_json_directory(self, directory: str) -> int:
+        """
+        Import a legacy one-JSON-file-per-block directory into the store.
+
+        Args:
+            directory: Directory containing block_{index}.json files
+
+        Returns:
+            Number of blocks imported
+        """
+        block_files = sorted(Path(directory).glob("block_*.json"),
+                             key=lambda x: int(x.stem.split('_')[1]))
+
+        imported = 0
+        for block_file in block_files:
+            with open(block_file, 'r', encoding='utf-8') as f:
+                block = Block.from_dict(json.load(f))
+
+            if block.index < len(self):
+                continue
+
+            self.append_block(block)
+            imported += 1
+
+        return imported
+
+
+class SegmentBlockStore(BlockStore):
+    """
+    Stores blocks as records in a segmented append-only log.
+    Record number ``n`` always holds the block with index ``n``.
+    """
+
+    def __init__(self, storage_path: str, max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+                 fsync_policy: str = FSYNC_INTERVAL, fsync_interval_ms: float = 50.0,
+                 compression: Optional[str] = None, hot_segments: int = 2,
+                 record_format: int = FORMAT_JSON):
+        """
+        Open (or create) a block store.
+
+        Args:
+            storage_path: Directory holding the block log
+            max_segment_bytes: Size at which segments are rolled over
+            fsync_policy: When appends are fsynced ("always", "interval" or "os")
+            fsync_interval_ms: Maximum commit delay for the "interval" policy
+            compression: Codec for cold segments ("zlib", "lzma" or None)
+            hot_segments: Number of newest segments kept uncompressed
+            record_format: Encoding of new records. FORMAT_JSON decodes
+                fastest; FORMAT_BINARY is opt-in and stores blocks in about
+                a third of the space but decodes slower. Records of either
+                format can always be read
+        """
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(f"Unsupported block record format: {record_format}")
+
+        self.storage_path = Path(storage_path)
+        self.record_format = record_format
+        self.log = _BlockLog(str(self.storage_path), max_segment_bytes=max_segment_bytes,
+                             fsync_policy=fsync_policy, fsync_interval_ms=fsync_interval_ms,
+                             compression=compression, hot_segments=hot_segments)
+
+    def __len__(self) -> int:
+        """Number of stored blocks."""
+        return len(self.log)
+
+    def append_block(self, block: Block) -> None:
+        """
+        Append a block to the store.
+
+        Args:
+            block: Block to append (must be the next index)
+        """
+        if block.index != len(self.log):
+            raise StorageError(f"Expected block index {len(self.log)}, got {block.index}")
+
+        self.log.append(encode_block(block, self.record_format), hash_key(block.block_hash or ""),
+                        self.record_format)
+
+    def read_block(self, index: int) -> Optional[Block]:
+        """
+        Read a single block by index.
+
+        Args:
+            index: Block index
+
+        Returns:
+            Block or None if not stored
+        """
+        if not 0 <= index < len(self.log):
+            return None
+        return decode_block(*self.log.read(index))
+
+    def find_block(self, block_hash: str) -> Optional[int]:
+        """
+        Find the index of a block by its hash using the offset index.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Block index or None if not found
+        """
+        return self.log.find_key(hash_key(block_hash))
+
+    def iter_blocks(self, start: int = 0) -> Iterator[Block]:
+        """
+        Iterate stored blocks in order using a sequential segment scan.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Blocks in index order
+        """
+        for _, record_format, payload in self.log.scan(start):
+            yield decode_block(record_format, payload)
+
+    def iter_block_payloads(self, start: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Iterate stored block records without decoding them.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Tuples of (block_index, record_format, payload)
+        """
+        yield from self.log.scan(start)
+
+    def sync(self, count: Optional[int] = None) -> None:
+        """
+        Make appended blocks durable now.
+
+        Args:
+            count: Number of blocks that must be durable (None = all)
+        """
+        self.log.sync(count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Statistics dictionary including commit latency numbers
+        """
+        stats = self.log.get_commit_stats()
+        stats.update(self.log.get_compression_stats())
+        stats["backend"] = "segment"
+        stats["stored_blocks"] = len(self.log)
+        return stats
+
+    def compact(self) -> int:
+        """
+        Compress sealed segments outside the hot tail now.
+
+        Returns:
+            Number of segments compressed
+        """
+        return self.log.compact()
+
+    def close(self) -> None:
+        """Commit outstanding blocks and close the underlying log."""
+        self.log.close()
+
+    def __repr__(self) -> str:
+        """String representation of the store."""
+        return f"SegmentBlockStore(path={self.storage_path}, blocks={len(self.log)})"
@@ -0,0 +1,325 @@
+"""
+Streaming chain export and import.
+Chains are exported as newline-delimited JSON: a header line, one line per
+block, and a trailing manifest with counts, the tip hash, the chain state
+digest and a checksum of everything before it. Export and import handle a
+single block at a time, so memory use does not grow with the chain.
+Imports are staged: the export is copied aside and verified completely,
+manifest included, before any block is appended.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..blockchain.block import Block
+from .block_store import BlockStore
+from .checkpoint import EMPTY_STATE_DIGEST, advance_state_digest
+from .segment_log import StorageError
+
+
+EXPORT_FORMAT = "web3-accounting-ndjson"
+EXPORT_VERSION = "1.0.0"
+
+
+class ChainImportError(StorageError):
+    """Exception raised when an exported chain fails verification."""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        """
+        Initialize chain import error.
+
+        Args:
+            message: Error message
+            line: Line number of the offending record
+        """
+        super().__init__(f"line {line}: {message}" if line is not None else message)
+        self.line = line
+
+
+@dataclass
+class ExportManifest:
+    """
+    Trailing summary of an exported chain.
+    """
+
+    first_index: int
+    block_count: int
+    transaction_count: int
+    tip_index: int
+    tip_hash: Optional[str]
+    state_digest: str
+    content_sha256: str
+    completed_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert manifest to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExportManifest':
+        """Create manifest from dictionary."""
+        return cls(**data)
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    """Encode one NDJSON line."""
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b"\n"
+
+
+def export_ndjson(blocks: Iterable[Block], output_file: str,
+                  previous_state_digest: str = EMPTY_STATE_DIGEST) -> ExportManifest:
+    """
+    Stream blocks to an NDJSON export file.
+
+    Args:
+        blocks: Consecutive blocks to export, in chain order
+        output_file: Output file path
+        previous_state_digest: Chain state digest before the first exported
+            block (the empty digest when exporting from genesis)
+
+    Returns:
+        Manifest written at the end of the file
+    """
+    content = hashlib.sha256()
+    first_index = -1
+    tip_index = -1
+    tip_hash = None
+    block_count = 0
+    transaction_count = 0
+    state_digest = previous_state_digest
+
+    with open(output_file, 'wb') as f:
+        header = _line({
+            "record": "header",
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "exported_at": time.time(),
+            "previous_state_digest": previous_state_digest,
+        })
+        f.write(header)
+        content.update(header)
+
+        for block in blocks:
+            line = _line({"record": "block", "block": block.to_dict()})
+            f.write(line)
+            content.update(line)
+
+            if block_count == 0:
+                first_index = block.index
+            block_count += 1
+            transaction_count += len(block.transactions)
+            tip_index = block.index
+            tip_hash = block.block_hash
+            state_digest = advance_state_digest(state_digest, block.block_hash)
+
+        manifest = ExportManifest(first_index=first_index, block_count=block_count,
+                                  transaction_count=transaction_count, tip_index=tip_index,
+                                  tip_hash=tip_hash, state_digest=state_digest,
+                                  content_sha256=content.hexdigest(), completed_at=time.time())
+        f.write(_line({"record": "manifest", **manifest.to_dict()}))
+
+    return manifest
+
+
+class ChainImportReader:
+    """
+    Reads an NDJSON export, verifying every block as it is streamed.
+
+    Each block must pass its integrity check and link to the block before
+    it. The manifest is checked once the last block has been read, so a
+    truncated or altered export is rejected; callers writing blocks as they
+    arrive must treat anything written as unverified until iteration ends.
+    """
+
+    def __init__(self, input_file: str, previous_block: Optional[Block] = None,
+                 previous_state_digest: Optional[str] = None):
+        """
+        Initialize import reader.
+
+        Args:
+            input_file: Export file path
+            previous_block: Block the export continues from (None = the
+                export must start at genesis)
+            previous_state_digest: Known chain state digest up to the
+                previous block, checked against the export header
+        """
+        self.input_file = input_file
+        self.previous_block = previous_block
+        self.previous_state_digest = previous_state_digest
+        self.manifest: Optional[ExportManifest] = None
+        self.state_digest = EMPTY_STATE_DIGEST
+
+    def __iter__(self) -> Iterator[Block]:
+        """
+        Stream verified blocks.
+
+        Yields:
+            Blocks in chain order
+        """
+        content = hashlib.sha256()
+        previous = self.previous_block
+        block_count = 0
+        transaction_count = 0
+        first_index = -1
+
+        with open(self.input_file, 'rb') as f:
+            line_number = 0
+            header = None
+            for line in f:
+                line_number += 1
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ChainImportError(f"Invalid JSON: {e}", line_number) from e
+
+                kind = record.get("record") if isinstance(record, dict) else None
+
+                if header is None:
+                    if kind != "header" or record.get("format") != EXPORT_FORMAT:
+                        raise ChainImportError("Missing export header", line_number)
+                    header = record
+                    self.state_digest = header.get("previous_state_digest", EMPTY_STATE_DIGEST)
+                    if self.previous_state_digest is not None and \
+                            self.state_digest != self.previous_state_digest:
+                        raise ChainImportError("Export does not continue this chain's state",
+                                               line_number)
+                    content.update(line)
+                    continue
+
+                if self.manifest is not None:
+                    raise ChainImportError("Data after the manifest", line_number)
+
+                if kind == "manifest":
+                    record.pop("record")
+                    try:
+                        self.manifest = ExportManifest.from_dict(record)
+                    except TypeError as e:
+                        raise ChainImportError(f"Invalid manifest: {e}", line_number) from e
+                    self._check_manifest(content.hexdigest(), block_count, transaction_count,
+                                         first_index, previous, line_number)
+                    continue
+
+                if kind != "block":
+                    raise ChainImportError(f"Unexpected record type: {kind}", line_number)
+                content.update(line)
+
+                try:
+                    block = Block.from_dict(record["block"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ChainImportError(f"Invalid block: {e}", line_number) from e
+
+                self._check_block(block, previous, line_number)
+                if block_count == 0:
+                    first_index = block.index
+                block_count += 1
+                transaction_count += len(block.transactions)
+                self.state_digest = advance_state_digest(self.state_digest, block.block_hash)
+                previous = block
+
+                yield block
+
+        if self.manifest is None:
+            raise ChainImportError("Export is truncated: manifest missing")
+
+    def _check_block(self, block: Block, previous: Optional[Block], line_number: int) -> None:
+        """Check a block's integrity and its linkage to the previous block."""
+        if not block.verify_integrity():
+            raise ChainImportError(f"Block {block.index} failed integrity check", line_number)
+
+        if previous is None:
+            if block.index != 0 or block.previous_hash != "0":
+                raise ChainImportError("Export does not start at the genesis block", line_number)
+        elif block.index != previous.index + 1 or block.previous_hash != previous.block_hash:
+            raise ChainImportError(f"Block {block.index} does not link to block {previous.index}",
+                                   line_number)
+        elif block.hash_algorithm != previous.hash_algorithm:
+            raise ChainImportError(f"Block {block.index} uses {block.hash_algorithm}, but the chain "
+                                   f"uses {previous.hash_algorithm}", line_number)
+
+    def _check_manifest(self, content_sha256: str, block_count: int, transaction_count: int,
+                        first_index: int, tip: Optional[Block], line_number: int) -> None:
+        """Check the manifest against what was actually read."""
+        manifest = self.manifest
+        expected = {
+            "content_sha256": content_sha256,
+            "block_count": block_count,
+            "transaction_count": transaction_count,
+            "first_index": first_index,
+            "tip_index": tip.index if block_count else -1,
+            "tip_hash": tip.block_hash if block_count else None,
+            "state_digest": self.state_digest,
+        }
+        for name, value in expected.items():
+            if getattr(manifest, name) != value:
+                raise ChainImportError(f"Manifest {name} does not match the exported blocks",
+                                       line_number)
+
+
+def stage_export(input_file: str, previous_block: Optional[Block] = None,
+                 previous_state_digest: Optional[str] = None,
+                 staging_dir: Optional[str] = None) -> Tuple[str, ExportManifest]:
+    """
+    Copy an export to a staging file and verify the copy completely,
+    manifest included. Importing from the verified copy means nothing is
+    appended unless the whole export is valid, even if the original file
+    changes meanwhile.
+
+    Args:
+        input_file: Export file path
+        previous_block: Block the export continues from (None = genesis)
+        previous_state_digest: Known chain state digest up to the previous block
+        staging_dir: Directory for the staging file (system default if None)
+
+    Returns:
+        Tuple of (staging file path, verified manifest); the caller removes
+        the staging file
+    """
+    fd, staging_file = tempfile.mkstemp(prefix="import_", suffix=".ndjson", dir=staging_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(input_file, staging_file)
+        reader = ChainImportReader(staging_file, previous_block=previous_block,
+                                   previous_state_digest=previous_state_digest)
+        for _ in reader:
+            pass
+    except BaseException:
+        os.unlink(staging_file)
+        raise
+    return staging_file, reader.manifest
+
+
+def import_ndjson(input_file: str, store: BlockStore, staging_dir: Optional[str] = None) -> ExportManifest:
+    """
+    Import a verified NDJSON export into a block store.
+    The export must continue the stored chain (or start at genesis for an
+    empty store). It is staged and verified before any block is appended.
+
+    Args:
+        input_file: Export file path
+        store: Block store to append to
+        staging_dir: Directory for the staging copy (system default if None)
+
+    Returns:
+        Verified manifest of the export
+    """
+    previous = store.read_block(len(store) - 1) if len(store) else None
+    previous_state_digest = None if previous else EMPTY_STATE_DIGEST
+    staging_file, manifest = stage_export(input_file, previous, previous_state_digest, staging_dir)
+    try:
+        for block in ChainImportReader(staging_file, previous_block=previous,
+                                       previous_state_digest=previous_state_digest):
+            if block.index != len(store):
+                raise ChainImportError(f"Export block {block.index} does not continue the store "
+                                       f"at index {len(store)}")
+            store.append_block(block)
+    finally:
+        os.unlink(staging_file)
+
+    store.sync()
+    return manifest
@@ -0,0 +1,200 @@
+"""
+Verified chain checkpoints.
+A checkpoint records the height, tip hash and a running digest of every
+block hash up to that height, so a restart only has to verify blocks
+appended after the latest checkpoint.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..blockchain.hash_utils import HashUtils
+
+
+# Digest of the empty chain, extended with each block hash in order
+EMPTY_STATE_DIGEST = ""
+
+
+def advance_state_digest(state_digest: str, block_hash: str) -> str:
+    """
+    Extend a chain state digest with the next block hash.
+
+    Args:
+        state_digest: Digest of all previous blocks
+        block_hash: Hash of the next block
+
+    Returns:
+        Digest including the new block
+    """
+    return HashUtils.combine_hashes(state_digest, block_hash)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Snapshot of verified chain state at a given height.
+    """
+
+    height: int
+    tip_hash: str
+    state_digest: str
+    created_at: float = 0.0
+    checkpoint_hash: Optional[str] = None
+
+    def __post_init__(self):
+        """Calculate checkpoint hash after initialization."""
+        if not self.checkpoint_hash:
+            self.checkpoint_hash = self._calculate_hash()
+
+    def _calculate_hash(self) -> str:
+        """
+        Calculate hash of the checkpoint contents.
+
+        Returns:
+            Checkpoint hash
+        """
+        return HashUtils.hash_dict({
+            'height': self.height,
+            'tip_hash': self.tip_hash,
+            'state_digest': self.state_digest,
+            'created_at': self.created_at,
+        })
+
+    def verify_integrity(self) -> bool:
+        """
+        Verify the checkpoint has not been altered.
+
+        Returns:
+            True if checkpoint hash is valid
+        """
+        return self.checkpoint_hash == self._calculate_hash()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert checkpoint to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Checkpoint':
+        """Create checkpoint from dictionary."""
+        return cls(**data)
+
+
+class CheckpointManager:
+    """
+    Writes and reads checkpoint files for a block store.
+    """
+
+    DIRECTORY = "checkpoints"
+
+    def __init__(self, storage_path: str, interval: int = 1000):
+        """
+        Initialize checkpoint manager.
+
+        Args:
+            storage_path: Blockchain storage directory
+            interval: Number of blocks between checkpoints (0 disables writing)
+        """
+        self.directory = Path(storage_path) / self.DIRECTORY
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval
+
+    def is_due(self, height: int) -> bool:
+        """
+        Check whether a checkpoint should be written at a height.
+
+        Args:
+            height: Index of the block just appended
+
+        Returns:
+            True if a checkpoint is due
+        """
+        return self.interval > 0 and height > 0 and height % self.interval == 0
+
+    def _path(self, height: int) -> Path:
+        """Get the file path of the checkpoint at a height."""
+        return self.directory / f"checkpoint_{height:012d}.json"
+
+    def write(self, height: int, tip_hash: str, state_digest: str) -> Checkpoint:
+        """
+        Atomically write a checkpoint.
+
+        Args:
+            height: Height of the tip block
+            tip_hash: Hash of the tip block
+            state_digest: Digest of all block hashes up to the tip
+
+        Returns:
+            Written checkpoint
+        """
+        checkpoint = Checkpoint(height=height, tip_hash=tip_hash,
+                                state_digest=state_digest, created_at=time.time())
+
+        path = self._path(height)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint.to_dict(), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+        return checkpoint
+
+    def list_heights(self) -> List[int]:
+        """
+        List heights that have checkpoint files, in ascending order.
+
+        Returns:
+            Checkpoint heights
+        """
+        heights = []
+        for path in self.directory.glob("checkpoint_*.json"):
+            number = path.stem.split('_')[1]
+            if number.isdigit():
+                heights.append(int(number))
+        return sorted(heights)
+
+    def load(self, height: int) -> Optional[Checkpoint]:
+        """
+        Load and integrity-check the checkpoint at a height.
+
+        Args:
+            height: Checkpoint height
+
+        Returns:
+            Checkpoint or None if missing or invalid
+        """
+        try:
+            with open(self._path(height), 'r', encoding='utf-8') as f:
+                checkpoint = Checkpoint.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if checkpoint.height != height or not checkpoint.verify_integrity():
+            return None
+        return checkpoint
+
+    def latest(self, max_height: Optional[int] = None) -> Optional[Checkpoint]:
+        """
+        Get the newest valid checkpoint at or below a height.
+
+        Args:
+            max_height: Highest acceptable checkpoint height
+
+        Returns:
+            Checkpoint or None if there is none
+        """
+        for height in reversed(self.list_heights()):
+            if max_height is not None and height > max_height:
+                continue
+            checkpoint = self.load(height)
+            if checkpoint is not None:
+                return checkpoint
+        return None
+
+    def __repr__(self) -> str:
+        """String representation of checkpoint manager."""
+        return f"CheckpointManager(directory={self.directory}, interval={self.interval})"
@@ -0,0 +1,134 @@
+"""
+Record compression for cold segments.
+Compresses individual record payloads with zlib or lzma from the standard
+library. zlib can use a shared dictionary trained on sample records, which
+recovers most of the ratio lost by compressing small records one by one.
+"""
+
+import lzma
+import re
+import zlib
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+
+
+# Compression codecs
+CODEC_ZLIB = "zlib"
+CODEC_LZMA = "lzma"
+
+CODECS = (CODEC_ZLIB, CODEC_LZMA)
+
+# Compression flags stored in the high bits of a record format byte
+COMPRESSION_MASK = 0xF0
+FLAG_ZLIB = 0x10
+FLAG_ZLIB_DICT = 0x20
+FLAG_LZMA = 0x30
+
+# zlib only looks back 32 KiB, so a larger dictionary is never used
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# JSON keys (with their colon) and string values
+_TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"\s*:?')
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """
+    Build a zlib dictionary from sample record payloads.
+    Keeps the JSON tokens that repeat across samples, ranked by the bytes
+    they would save, with the most valuable tokens last where zlib finds
+    them with the shortest distances. Samples without repeated JSON tokens
+    (binary records) use their most recent bytes as the dictionary.
+
+    Args:
+        samples: Sample payloads
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes (empty if the samples share nothing)
+    """
+    samples = list(samples)
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update(set(_TOKEN_PATTERN.findall(sample)))
+
+    ranked = sorted((token for token, count in counts.items() if count > 1),
+                    key=lambda token: counts[token] * len(token), reverse=True)
+
+    chosen = []
+    total = 0
+    for token in ranked:
+        if total + len(token) > min(size, MAX_DICTIONARY_BYTES):
+            continue
+        chosen.append(token)
+        total += len(token)
+
+    if not chosen:
+        limit = min(size, MAX_DICTIONARY_BYTES)
+        return b"".join(samples)[-limit:]
+    return b"".join(reversed(chosen))
+
+
+class RecordCompressor:
+    """
+    Compresses and decompresses record payloads.
+    """
+
+    def __init__(self, codec: str = CODEC_ZLIB, level: Optional[int] = None,
+                 dictionary: Optional[bytes] = None):
+        """
+        Initialize record compressor.
+
+        Args:
+            codec: Compression codec ("zlib" or "lzma")
+            level: Compression level (codec default if None)
+            dictionary: Shared zlib dictionary used for compression and
+                needed to decompress dictionary-compressed records
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Invalid compression codec. Must be one of: {', '.join(CODECS)}")
+
+        self.codec = codec
+        self.level = level
+        self.dictionary = dictionary or None
+
+    def compress(self, payload: bytes) -> Tuple[int, bytes]:
+        """
+        Compress a payload.
+
+        Args:
+            payload: Uncompressed payload
+
+        Returns:
+            Tuple of (compression_flag, compressed_payload)
+        """
+        if self.codec == CODEC_LZMA:
+            preset = self.level if self.level is not None else 6
+            return FLAG_LZMA, lzma.compress(payload, format=lzma.FORMAT_XZ, preset=preset)
+
+        level = self.level if self.level is not None else 9
+        if self.dictionary:
+            compressor = zlib.compressobj(level, zdict=self.dictionary)
+            return FLAG_ZLIB_DICT, compressor.compress(payload) + compressor.flush()
+        return FLAG_ZLIB, zlib.compress(payload, level)
+
+    def decompress(self, flag: int, payload: bytes) -> bytes:
+        """
+        Decompress a payload.
+
+        Args:
+            flag: Compression flag of the record
+            payload: Compressed payload
+
+        Returns:
+            Uncompressed payload
+        """
+        if flag == FLAG_ZLIB:
+            return zlib.decompress(payload)
+        if flag == FLAG_ZLIB_DICT:
+            if not self.dictionary:
+                raise ValueError("Record needs the compression dictionary, which is missing")
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+            return decompressor.decompress(payload) + decompressor.flush()
+        if flag == FLAG_LZMA:
+            return lzma.decompress(payload)
+        raise ValueError(f"Unknown compression flag: {flag:#x}")
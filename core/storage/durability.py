@@ -0,0 +1,225 @@
+"""
+Durability layer for the block log.
+Batches fsync calls into group commits according to a configurable
+policy and records commit latency so the policy can be tuned.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+# Fsync policies
+FSYNC_ALWAYS = "always"      # fsync before every append returns
+FSYNC_INTERVAL = "interval"  # fsync at most every fsync_interval_ms
+FSYNC_OS = "os"              # leave write-back to the operating system
+
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS)
+
+
+class CommitStats:
+    """
+    Rolling statistics about group commits.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Initialize commit statistics.
+
+        Args:
+            window: Number of recent commits kept for percentiles
+        """
+        self.commits = 0
+        self.records = 0
+        self.max_latency_ms = 0.0
+        self._latencies = deque(maxlen=window)
+        self._fsync_times = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+
+    def record(self, latency_ms: float, fsync_ms: float, batch_size: int) -> None:
+        """
+        Record a completed commit.
+
+        Args:
+            latency_ms: Time from the oldest write in the batch to durability
+            fsync_ms: Time spent in fsync
+            batch_size: Number of records made durable
+        """
+        self.commits += 1
+        self.records += batch_size
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self._latencies.append(latency_ms)
+        self._fsync_times.append(fsync_ms)
+        self._batch_sizes.append(batch_size)
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        """Get a percentile of a sample (0.0 for an empty sample)."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert statistics to dictionary.
+
+        Returns:
+            Statistics dictionary
+        """
+        recent = len(self._batch_sizes)
+        return {
+            "commits": self.commits,
+            "records_committed": self.records,
+            "avg_batch_size": sum(self._batch_sizes) / recent if recent else 0.0,
+            "latency_ms_p50": self._percentile(self._latencies, 0.50),
+            "latency_ms_p99": self._percentile(self._latencies, 0.99),
+            "latency_ms_max": self.max_latency_ms,
+            "fsync_ms_p50": self._percentile(self._fsync_times, 0.50),
+            "fsync_ms_p99": self._percentile(self._fsync_times, 0.99),
+        }
+
+
+class GroupCommitter:
+    """
+    Makes appended records durable in batches.
+
+    Writers report each appended record with ``record_write``. Depending on
+    the policy, the committer fsyncs immediately (concurrent writers waiting
+    on the same commit share one fsync), from a background flusher at most
+    once per interval, or never and leaves write-back to the OS.
+    """
+
+    def __init__(self, sync: Callable[[], None], policy: str = FSYNC_INTERVAL,
+                 interval_ms: float = 50.0, durable_count: int = 0):
+        """
+        Initialize group committer.
+
+        Args:
+            sync: Callable that flushes and fsyncs all written data
+            policy: One of FSYNC_ALWAYS, FSYNC_INTERVAL or FSYNC_OS
+            interval_ms: Maximum delay before an interval commit
+            durable_count: Number of records already durable on disk
+        """
+        if policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy. Must be one of: {', '.join(FSYNC_POLICIES)}")
+
+        self._sync = sync
+        self.policy = policy
+        self.interval_ms = interval_ms
+        self.stats = CommitStats()
+
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._written = durable_count
+        self._durable = durable_count
+        self._oldest_pending: Optional[float] = None
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+    @property
+    def durable_count(self) -> int:
+        """Number of records known to be durable."""
+        return self._durable
+
+    def record_write(self, count: int) -> None:
+        """
+        Report that records up to ``count`` have been written.
+
+        Args:
+            count: Total number of records written so far
+        """
+        with self._lock:
+            self._written = max(self._written, count)
+            if self._oldest_pending is None:
+                self._oldest_pending = time.perf_counter()
+
+            if self.policy == FSYNC_INTERVAL:
+                self._start_flusher()
+                self._wakeup.notify()
+
+        if self.policy == FSYNC_ALWAYS:
+            self.commit(count)
+
+    def commit(self, count: Optional[int] = None) -> None:
+        """
+        Make records durable.
+        Callers whose records were covered by a commit that finished while
+        they waited return without another fsync.
+
+        Args:
+            count: Number of records that must be durable (None = all written)
+        """
+        with self._commit_lock:
+            with self._lock:
+                target = self._written
+                if count is not None and self._durable >= count:
+                    return
+                if self._durable >= target:
+                    return
+                started = self._oldest_pending
+                batch_size = target - self._durable
+                self._oldest_pending = None
+
+            sync_started = time.perf_counter()
+            self._sync()
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._durable = max(self._durable, target)
+                if self._written > self._durable and self._oldest_pending is None:
+                    self._oldest_pending = finished
+                self.stats.record((finished - (started or sync_started)) * 1000.0,
+                                  (finished - sync_started) * 1000.0, batch_size)
+
+    def _start_flusher(self) -> None:
+        """Start the background flusher for the interval policy (lock held)."""
+        if self._flusher is None and not self._closed:
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             name="block-log-flusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Commit pending records at most once per interval."""
+        while True:
+            with self._lock:
+                while not self._closed and self._written <= self._durable:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                due = self._oldest_pending + self.interval_ms / 1000.0 if self._oldest_pending else 0.0
+
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.commit()
+
+    def close(self) -> None:
+        """Commit outstanding records and stop the background flusher."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        if self.policy != FSYNC_OS:
+            self.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get commit statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        with self._lock:
+            stats = self.stats.to_dict()
+            stats.update({
+                "fsync_policy": self.policy,
+                "fsync_interval_ms": self.interval_ms,
+                "records_written": self._written,
+                "records_durable": self._durable,
+            })
+        return stats
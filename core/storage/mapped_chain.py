@@ -0,0 +1,130 @@
+"""
+Lazy, memory-mapped view of a stored chain.
+Behaves like the in-memory list of blocks but decodes blocks on demand.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Union
+
+from ..blockchain.block import Block
+from .block_store import BlockStore
+
+
+class MappedChain(Sequence):
+    """
+    Read-through sequence of blocks backed by a block store.
+    Only recently accessed blocks are kept decoded in memory, plus any
+    appended blocks a write-behind writer has not persisted yet.
+    """
+
+    def __init__(self, store: BlockStore, cache_size: int = 256):
+        """
+        Initialize mapped chain.
+
+        Args:
+            store: Block store holding the chain
+            cache_size: Maximum number of decoded blocks kept in memory
+        """
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Block]" = OrderedDict()
+        self._unpersisted: Dict[int, Block] = {}
+        self._length = len(store)
+
+    def __len__(self) -> int:
+        """Number of blocks in the chain."""
+        return max(len(self.store), self._length)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Block, List[Block]]:
+        """
+        Get a block (or list of blocks for a slice), decoding only what is requested.
+
+        Args:
+            index: Block index or slice
+
+        Returns:
+            Block or list of blocks
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Block index out of range")
+
+        block = self._unpersisted.get(index)
+        if block is not None:
+            self._prune_unpersisted()
+            return block
+
+        block = self._cache.get(index)
+        if block is not None:
+            self._cache.move_to_end(index)
+            return block
+
+        block = self.store.read_block(index).seal()
+        self._remember(index, block)
+        return block
+
+    def __iter__(self) -> Iterator[Block]:
+        """Iterate blocks with a sequential scan, bypassing the cache."""
+        stored = len(self.store)
+        for block in self.store.iter_blocks():
+            if block.index >= stored:
+                break
+            yield block
+        for index in range(stored, len(self)):
+            yield self[index]
+
+    def append(self, block: Block) -> None:
+        """
+        Record a block that has been persisted or queued for persistence.
+
+        Args:
+            block: Next block of the chain
+        """
+        if block.index > self._length:
+            raise ValueError(f"Expected block index {self._length}, got {block.index}")
+
+        if block.index >= len(self.store):
+            self._unpersisted[block.index] = block
+        self._length = max(self._length, block.index + 1)
+        self._remember(block.index, block)
+        self._prune_unpersisted()
+
+    def index_of_hash(self, block_hash: str) -> int:
+        """
+        Get the index of a block by hash.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Block index or -1 if not found
+        """
+        for index, block in self._unpersisted.items():
+            if block.block_hash == block_hash:
+                return index
+
+        index = self.store.find_block(block_hash)
+        return -1 if index is None else index
+
+    def _prune_unpersisted(self) -> None:
+        """Forget pending blocks the store now holds."""
+        stored = len(self.store)
+        for index in [i for i in self._unpersisted if i < stored]:
+            del self._unpersisted[index]
+
+    def _remember(self, index: int, block: Block) -> None:
+        """Add a decoded block to the LRU cache."""
+        self._cache[index] = block
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __repr__(self) -> str:
+        """String representation of mapped chain."""
+        return f"MappedChain(blocks={len(self)}, cached={len(self._cache)})"
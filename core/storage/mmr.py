@@ -0,0 +1,344 @@
+"""
+Merkle Mountain Range accumulator over block hashes.
+An append-only forest of perfect Merkle trees whose leaves are the block
+hashes in chain order. Appending a block adds one leaf and merges equal
+height peaks, and any earlier chain height is a prefix of the node list,
+so an O(log n) proof shows that block i is part of the chain at height h.
+Nodes are kept as contiguous 32-byte digests and appended to a file next
+to the block store.
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DIGEST_SIZE = 32
+
+
+def mmr_size(leaf_count: int) -> int:
+    """
+    Get the number of nodes in a range with a given number of leaves.
+
+    Args:
+        leaf_count: Number of leaves
+
+    Returns:
+        Number of nodes
+    """
+    return 2 * leaf_count - bin(leaf_count).count('1')
+
+
+def _peaks(leaf_count: int) -> List[Tuple[int, int, int]]:
+    """
+    Lay out the peaks of a range, left to right.
+
+    Args:
+        leaf_count: Number of leaves
+
+    Returns:
+        List of (height, first_node_position, first_leaf_index) tuples
+    """
+    peaks = []
+    position = 0
+    leaf = 0
+    for height in range(leaf_count.bit_length() - 1, -1, -1):
+        if leaf_count & (1 << height):
+            peaks.append((height, position, leaf))
+            position += (1 << (height + 1)) - 1
+            leaf += 1 << height
+    return peaks
+
+
+def _parent(left: bytes, right: bytes) -> bytes:
+    """Hash two child nodes into their parent."""
+    return hashlib.sha256(left + right).digest()
+
+
+def _bag(leaf_count: int, peaks: List[bytes]) -> str:
+    """
+    Combine the peaks of a range into its root.
+    The root commits to the leaf count, so a proof cannot be replayed
+    against a range of a different size.
+
+    Args:
+        leaf_count: Number of leaves
+        peaks: Peak digests, left to right
+
+    Returns:
+        Root hash
+    """
+    bagged = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        bagged = _parent(peak, bagged)
+    return hashlib.sha256(leaf_count.to_bytes(8, 'big') + bagged).hexdigest()
+
+
+@dataclass
+class MMRProof:
+    """
+    Proof that a block hash is the leaf at an index of a range.
+    """
+
+    leaf_index: int
+    leaf_count: int
+    path: List[str] = field(default_factory=list)
+    peaks: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert proof to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MMRProof':
+        """Create proof from dictionary."""
+        return cls(**data)
+
+
+class MerkleMountainRange:
+    """
+    Append-only accumulator over block hashes, optionally file-backed.
+    """
+
+    FILE_NAME = "mmr.dat"
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the range, loading the nodes already stored at a path.
+        A partially written tail (after a crash) is dropped.
+
+        Args:
+            path: Node file path (None keeps the range in memory only)
+        """
+        self.path = Path(path) if path else None
+        self._nodes = bytearray()
+        self._leaf_count = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self._nodes = bytearray(self.path.read_bytes())
+            self._leaf_count = self._complete_leaf_count(len(self._nodes) // DIGEST_SIZE)
+            if len(self._nodes) != mmr_size(self._leaf_count) * DIGEST_SIZE:
+                self._truncate_nodes(self._leaf_count)
+            self._file = open(self.path, 'ab')
+
+    @staticmethod
+    def _complete_leaf_count(node_count: int) -> int:
+        """Get the largest leaf count whose range fits in a number of nodes."""
+        low, high = 0, node_count
+        while low < high:
+            middle = (low + high + 1) // 2
+            if mmr_size(middle) <= node_count:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def __len__(self) -> int:
+        """Number of leaves."""
+        return self._leaf_count
+
+    @property
+    def size(self) -> int:
+        """Number of nodes."""
+        return len(self._nodes) // DIGEST_SIZE
+
+    def _node(self, position: int) -> bytes:
+        """Get the digest of a node by position."""
+        return bytes(self._nodes[position * DIGEST_SIZE:(position + 1) * DIGEST_SIZE])
+
+    def get_leaf(self, leaf_index: int) -> Optional[str]:
+        """
+        Get a stored block hash.
+
+        Args:
+            leaf_index: Block index
+
+        Returns:
+            Block hash or None if out of range
+        """
+        if not 0 <= leaf_index < self._leaf_count:
+            return None
+        return self._node(mmr_size(leaf_index)).hex()
+
+    def append(self, block_hash: str) -> int:
+        """
+        Append the next block hash.
+
+        Args:
+            block_hash: Hex block hash
+
+        Returns:
+            Leaf index of the block
+        """
+        node = bytes.fromhex(block_hash)
+        if len(node) != DIGEST_SIZE:
+            raise ValueError("Block hash must be a 32-byte hex digest")
+
+        with self._lock:
+            start = len(self._nodes)
+            leaf_index = self._leaf_count
+            self._nodes += node
+
+            # Merge with the peaks to the left while they have equal height
+            height = 0
+            while (leaf_index >> height) & 1:
+                position = self.size - 1
+                left = self._node(position - (1 << (height + 1)) + 1)
+                node = _parent(left, node)
+                self._nodes += node
+                height += 1
+
+            self._leaf_count += 1
+            if self._file is not None:
+                self._file.write(self._nodes[start:])
+        return leaf_index
+
+    def truncate(self, leaf_count: int) -> None:
+        """
+        Drop every leaf at or after an index.
+
+        Args:
+            leaf_count: Number of leaves to keep
+        """
+        with self._lock:
+            if leaf_count < self._leaf_count:
+                self._truncate_nodes(leaf_count)
+
+    def _truncate_nodes(self, leaf_count: int) -> None:
+        """Cut the node list (and file) down to a leaf count."""
+        del self._nodes[mmr_size(leaf_count) * DIGEST_SIZE:]
+        self._leaf_count = leaf_count
+        if self.path is not None:
+            if self._file is not None:
+                self._file.flush()
+            with open(self.path, 'ab') as f:
+                f.truncate(len(self._nodes))
+
+    def get_root(self, leaf_count: Optional[int] = None) -> Optional[str]:
+        """
+        Get the root of the range at a size.
+
+        Args:
+            leaf_count: Number of leaves (defaults to all of them)
+
+        Returns:
+            Root hash or None if the range is empty or too short
+        """
+        if leaf_count is None:
+            leaf_count = self._leaf_count
+        if not 0 < leaf_count <= self._leaf_count:
+            return None
+        peaks = [self._node(start + (1 << (height + 1)) - 2) for height, start, _ in _peaks(leaf_count)]
+        return _bag(leaf_count, peaks)
+
+    def get_proof(self, leaf_index: int, leaf_count: Optional[int] = None) -> Optional[MMRProof]:
+        """
+        Prove that a leaf is part of the range at a size.
+
+        Args:
+            leaf_index: Block index to prove
+            leaf_count: Number of leaves of the range (chain height + 1,
+                defaults to all of them)
+
+        Returns:
+            Proof or None if the leaf is outside the range
+        """
+        if leaf_count is None:
+            leaf_count = self._leaf_count
+        if not 0 <= leaf_index < leaf_count <= self._leaf_count:
+            return None
+
+        proof = MMRProof(leaf_index=leaf_index, leaf_count=leaf_count)
+        for height, start, first_leaf in _peaks(leaf_count):
+            root = start + (1 << (height + 1)) - 2
+            if not first_leaf <= leaf_index < first_leaf + (1 << height):
+                proof.peaks.append(self._node(root).hex())
+                continue
+
+            # Walk down the peak's subtree (post-order positions) to the leaf
+            offset = leaf_index - first_leaf
+            siblings = []
+            while height > 0:
+                left_root = start + (1 << height) - 2
+                right_root = root - 1
+                if offset >> (height - 1) & 1:
+                    siblings.append(self._node(left_root).hex())
+                    start = left_root + 1
+                    root = right_root
+                else:
+                    siblings.append(self._node(right_root).hex())
+                    root = left_root
+                height -= 1
+                offset &= (1 << height) - 1
+            proof.path = siblings[::-1]
+        return proof
+
+    @staticmethod
+    def verify_proof(block_hash: str, proof: MMRProof, root: str) -> bool:
+        """
+        Verify that a block hash is the proven leaf of a range.
+
+        Args:
+            block_hash: Hex block hash
+            proof: MMR proof
+            root: Expected root of the range
+
+        Returns:
+            True if the proof is valid, False otherwise
+        """
+        if not 0 <= proof.leaf_index < proof.leaf_count:
+            return False
+
+        try:
+            node = bytes.fromhex(block_hash)
+            path = [bytes.fromhex(sibling) for sibling in proof.path]
+            other_peaks = [bytes.fromhex(peak) for peak in proof.peaks]
+        except (TypeError, ValueError):
+            return False
+
+        layout = _peaks(proof.leaf_count)
+        if len(other_peaks) != len(layout) - 1:
+            return False
+
+        peaks = []
+        for height, _, first_leaf in layout:
+            if not first_leaf <= proof.leaf_index < first_leaf + (1 << height):
+                peaks.append(other_peaks.pop(0))
+                continue
+
+            if len(path) != height:
+                return False
+            offset = proof.leaf_index - first_leaf
+            for level, sibling in enumerate(path):
+                if offset >> level & 1:
+                    node = _parent(sibling, node)
+                else:
+                    node = _parent(node, sibling)
+            peaks.append(node)
+
+        return _bag(proof.leaf_count, peaks) == root
+
+    def sync(self) -> None:
+        """Flush appended nodes to the node file and fsync it."""
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the node file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __repr__(self) -> str:
+        """String representation of the range."""
+        return f"MerkleMountainRange(leaves={self._leaf_count}, root={self.get_root()})"
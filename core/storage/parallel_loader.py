@@ -0,0 +1,194 @@
+"""
+Parallel chain loading and verification.
+Decoding a block and checking its hash, Merkle root and transaction hashes
+does not depend on any other block, so stored block ranges are handed to a
+process pool. Only the cheap index and previous-hash linkage check has to
+run in order, in the calling process.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..blockchain.block import Block
+from .block_store import BlockStore, decode_block
+
+
+# Header of a stored block used for the linkage check: (index, block_hash, previous_hash)
+BlockHeader = Tuple[int, str, str]
+
+
+@dataclass
+class ChunkResult:
+    """
+    Outcome of decoding and verifying one range of blocks.
+    """
+
+    headers: List[BlockHeader]
+    blocks: Optional[List[Block]] = None
+    invalid_index: Optional[int] = None
+
+
+@dataclass
+class LoadResult:
+    """
+    Outcome of loading or verifying a range of stored blocks.
+    """
+
+    headers: List[BlockHeader] = field(default_factory=list)
+    blocks: List[Block] = field(default_factory=list)
+    invalid_index: Optional[int] = None
+    workers: int = 1
+    elapsed_ms: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        """True if every verified block passed its integrity check."""
+        return self.invalid_index is None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get load statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        seconds = self.elapsed_ms / 1000.0
+        return {
+            "blocks": len(self.headers),
+            "workers": self.workers,
+            "elapsed_ms": self.elapsed_ms,
+            "blocks_per_second": len(self.headers) / seconds if seconds > 0 else 0.0,
+            "valid": self.valid,
+        }
+
+
+def verify_chunk(records: List[Tuple[int, int, bytes]], verify_from: int,
+                 keep_blocks: bool) -> ChunkResult:
+    """
+    Decode and integrity-check a range of stored blocks.
+    Runs inside pool workers, so it only touches its arguments.
+
+    Args:
+        records: Tuples of (block_index, record_format, payload)
+        verify_from: Blocks below this index are decoded but not verified
+        keep_blocks: Return the decoded blocks as well as their headers
+
+    Returns:
+        Chunk result (stops at the first invalid block)
+    """
+    result = ChunkResult(headers=[], blocks=[] if keep_blocks else None)
+    for index, record_format, payload in records:
+        try:
+            block = decode_block(record_format, payload)
+        except Exception:
+            result.invalid_index = index
+            return result
+
+        if block.index != index or (index >= verify_from and not block.verify_integrity()):
+            result.invalid_index = index
+            return result
+
+        result.headers.append((block.index, block.block_hash, block.previous_hash))
+        if keep_blocks:
+            result.blocks.append(block)
+
+    return result
+
+
+class ParallelChainLoader:
+    """
+    Decodes and verifies stored blocks across a pool of worker processes.
+    Chunks are submitted in order with a bounded number in flight, so the
+    raw payloads of a large chain are never all held in memory at once.
+    """
+
+    def __init__(self, store: BlockStore, workers: Optional[int] = None, chunk_size: int = 256):
+        """
+        Initialize parallel loader.
+
+        Args:
+            store: Block store to read from
+            workers: Number of worker processes (defaults to the CPU count;
+                1 verifies in the calling process)
+            chunk_size: Number of blocks handed to a worker at a time
+        """
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def _chunks(self, start: int, stop: Optional[int]) -> Iterator[List[Tuple[int, int, bytes]]]:
+        """Group raw stored blocks into chunks."""
+        chunk = []
+        for record in self.store.iter_block_payloads(start):
+            if stop is not None and record[0] >= stop:
+                break
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _results(self, start: int, stop: Optional[int], verify_from: int,
+                 keep_blocks: bool) -> Iterator[ChunkResult]:
+        """Process chunks in the pool and yield their results in chain order."""
+        if self.workers <= 1:
+            for chunk in self._chunks(start, stop):
+                yield verify_chunk(chunk, verify_from, keep_blocks)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            try:
+                for chunk in self._chunks(start, stop):
+                    pending.append(executor.submit(verify_chunk, chunk, verify_from, keep_blocks))
+                    if len(pending) >= self.workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Stop early (invalid block found): drop chunks not started yet
+                for future in pending:
+                    future.cancel()
+
+    def load(self, start: int = 0, stop: Optional[int] = None, verify_from: int = 0,
+             keep_blocks: bool = True) -> LoadResult:
+        """
+        Decode and verify stored blocks.
+        Integrity is checked in the workers; linkage between blocks is left
+        to the caller, which gets the headers of every decoded block.
+
+        Args:
+            start: First block index
+            stop: Block index to stop before (None = end of the store)
+            verify_from: Blocks below this index are decoded but not verified
+            keep_blocks: Return decoded blocks (False returns headers only)
+
+        Returns:
+            Load result (stops at the first invalid block)
+        """
+        started = time.perf_counter()
+        result = LoadResult(workers=self.workers)
+
+        results = self._results(start, stop, verify_from, keep_blocks)
+        try:
+            for chunk in results:
+                result.headers.extend(chunk.headers)
+                if keep_blocks:
+                    result.blocks.extend(chunk.blocks)
+                if chunk.invalid_index is not None:
+                    result.invalid_index = chunk.invalid_index
+                    break
+        finally:
+            results.close()
+
+        result.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        return result
+
+    def __repr__(self) -> str:
+        """String representation of parallel loader."""
+        return f"ParallelChainLoader(workers={self.workers}, chunk_size={self.chunk_size})"
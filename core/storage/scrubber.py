@@ -0,0 +1,317 @@
+"""
+Background integrity scrubbing of persisted blocks.
+A low-priority thread keeps re-reading stored blocks from disk, decodes
+them afresh and re-verifies their hashes, Merkle roots and linkage, within
+an I/O and CPU budget. Each block is also matched against the hash recorded
+when it was appended (the block accumulator leaves), so silent corruption
+of either copy is caught early instead of on the next full verification.
+Findings are reported as ``hash_chain_break`` anomalies in the shape
+accepted by the anomaly detection contract.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..blockchain.block import Block
+from .block_store import BlockStore, decode_block
+from .segment_log import StorageError
+
+
+# Severity of each finding, as accepted by the anomaly detection contract
+FINDING_SEVERITIES = {
+    "corrupt_record": "critical",
+    "undecodable_block": "critical",
+    "block_index_mismatch": "critical",
+    "block_hash_mismatch": "critical",
+    "recorded_hash_mismatch": "critical",
+    "chain_break": "critical",
+    "merkle_root_mismatch": "high",
+    "transaction_hash_mismatch": "high",
+}
+
+
+class IntegrityScrubber:
+    """
+    Re-verifies persisted blocks from a background thread at a bounded rate.
+
+    The scrubber walks the store from genesis to the tip in small batches,
+    then starts a new pass. Its position is saved to a state file so a
+    restart resumes where it stopped.
+    """
+
+    STATE_FILE = "scrubber.json"
+
+    def __init__(self, store: BlockStore, recorded_hash: Callable[[int], Optional[str]],
+                 state_path: Optional[str] = None, io_bytes_per_second: Optional[float] = 4 * 1024 * 1024,
+                 cpu_fraction: float = 0.1, batch_size: int = 16, idle_seconds: float = 5.0,
+                 max_findings: int = 1000,
+                 on_anomaly: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize scrubber (call start to run it in the background).
+
+        Args:
+            store: Block store to re-read
+            recorded_hash: Returns the hash recorded for a block index when it
+                was appended (None if unknown)
+            state_path: Directory of the state file (None keeps no state)
+            io_bytes_per_second: Maximum stored bytes read per second (None = unlimited)
+            cpu_fraction: Maximum share of one core spent verifying (0 < f <= 1)
+            batch_size: Number of blocks verified between pauses
+            idle_seconds: Pause after each pass over the chain
+            max_findings: Number of recent anomalies kept in memory
+            on_anomaly: Called with each anomaly (e.g. to submit it to the
+                anomaly detection contract)
+        """
+        if not 0 < cpu_fraction <= 1:
+            raise ValueError("cpu_fraction must be greater than 0 and at most 1")
+
+        self.store = store
+        self.recorded_hash = recorded_hash
+        self.state_path = Path(state_path) / self.STATE_FILE if state_path else None
+        self.io_bytes_per_second = io_bytes_per_second
+        self.cpu_fraction = cpu_fraction
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self.on_anomaly = on_anomaly
+
+        self.findings: Deque[Dict[str, Any]] = deque(maxlen=max_findings)
+        self.next_height = 0
+        self.last_scrubbed_height = -1
+        self.completed_passes = 0
+        self.blocks_scrubbed = 0
+        self.bytes_scrubbed = 0
+        self.anomaly_count = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._load_state()
+
+    def _load_state(self) -> None:
+        """Resume from the saved position, if any."""
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.next_height = int(state.get("next_height", 0))
+            self.last_scrubbed_height = int(state.get("last_scrubbed_height", -1))
+            self.completed_passes = int(state.get("completed_passes", 0))
+        except (OSError, ValueError, TypeError):
+            # A damaged state file only costs a fresh pass
+            self.next_height = 0
+
+    def _save_state(self) -> None:
+        """Atomically save the current position."""
+        if self.state_path is None:
+            return
+        temp_path = self.state_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "next_height": self.next_height,
+                "last_scrubbed_height": self.last_scrubbed_height,
+                "completed_passes": self.completed_passes,
+                "updated_at": time.time(),
+            }, f)
+        os.replace(temp_path, self.state_path)
+
+    def _anomaly(self, finding: str, index: int, reference: Optional[str], description: str,
+                 affected_wallet: str = "", **details: Any) -> Dict[str, Any]:
+        """Build an anomaly in the anomaly detection contract's shape."""
+        return {
+            "anomaly_type": "hash_chain_break",
+            "severity": FINDING_SEVERITIES[finding],
+            "transaction_reference": reference or f"block:{index}",
+            "description": description,
+            "detected_by": "integrity_scrubber",
+            "affected_wallet": affected_wallet,
+            "recommended_action": "restore_from_replica",
+            "auto_blocked": False,
+            "metadata": {"finding": finding, "block_index": index, "detected_at": time.time(), **details},
+        }
+
+    def verify_record(self, index: int, record_format: int, payload: bytes) -> List[Dict[str, Any]]:
+        """
+        Re-verify one stored block record.
+
+        Args:
+            index: Block index of the record
+            record_format: Record format byte
+            payload: Stored payload
+
+        Returns:
+            Anomalies found in the block (empty if it is intact)
+        """
+        try:
+            block: Block = decode_block(record_format, payload)
+        except Exception as e:
+            return [self._anomaly("undecodable_block", index, None,
+                                  f"Stored block {index} cannot be decoded: {e}")]
+
+        anomalies = []
+        if block.index != index:
+            anomalies.append(self._anomaly("block_index_mismatch", index, block.block_hash,
+                                           f"Stored block {index} claims index {block.index}",
+                                           block.created_by))
+
+        expected_hash = block._calculate_hash()
+        if block.block_hash != expected_hash:
+            anomalies.append(self._anomaly("block_hash_mismatch", index, block.block_hash,
+                                           f"Stored block {index} does not match its hash",
+                                           block.created_by, expected=expected_hash))
+
+        recorded = self.recorded_hash(index)
+        if recorded is not None and block.block_hash != recorded:
+            anomalies.append(self._anomaly("recorded_hash_mismatch", index, block.block_hash,
+                                           f"Stored block {index} differs from the hash recorded on append",
+                                           block.created_by, expected=recorded))
+
+        if index > 0:
+            previous = self.recorded_hash(index - 1)
+            if previous is not None and block.previous_hash != previous:
+                anomalies.append(self._anomaly("chain_break", index, block.block_hash,
+                                               f"Stored block {index} does not link to block {index - 1}",
+                                               block.created_by, expected_previous=previous))
+
+        expected_merkle = block._calculate_merkle_root()
+        if block.merkle_root != expected_merkle:
+            anomalies.append(self._anomaly("merkle_root_mismatch", index, block.block_hash,
+                                           f"Merkle root of stored block {index} does not match its transactions",
+                                           block.created_by, expected=expected_merkle))
+
+        for position, tx in enumerate(block.transactions):
+            if not tx.verify_integrity():
+                anomalies.append(self._anomaly("transaction_hash_mismatch", index, tx.transaction_hash,
+                                               f"Transaction {position} of stored block {index} was modified",
+                                               tx.from_wallet, position=position,
+                                               transaction_id=tx.transaction_id))
+
+        return anomalies
+
+    def _report(self, anomalies: List[Dict[str, Any]]) -> None:
+        """Record anomalies and pass them to the callback."""
+        for anomaly in anomalies:
+            self.findings.append(anomaly)
+            self.anomaly_count += 1
+            if self.on_anomaly is not None:
+                self.on_anomaly(anomaly)
+
+    def run_once(self, max_blocks: Optional[int] = None) -> int:
+        """
+        Verify the next batch of stored blocks (without pausing).
+
+        Args:
+            max_blocks: Number of blocks to verify (defaults to batch_size)
+
+        Returns:
+            Number of stored bytes read
+        """
+        limit = max_blocks or self.batch_size
+        read_bytes = 0
+        with self._lock:
+            stored = len(self.store)
+            if self.next_height >= stored:
+                if stored:
+                    self.next_height = 0
+                    self.completed_passes += 1
+                    self._save_state()
+                return 0
+
+            count = 0
+            records = self.store.iter_block_payloads(self.next_height)
+            try:
+                for index, record_format, payload in records:
+                    self._report(self.verify_record(index, record_format, payload))
+                    read_bytes += len(payload)
+                    self.last_scrubbed_height = index
+                    self.next_height = index + 1
+                    count += 1
+                    if count >= limit or self.next_height >= stored:
+                        break
+            except StorageError as e:
+                # Checksum or framing failure: report the record and skip past it
+                self._report([self._anomaly("corrupt_record", self.next_height, None,
+                                            f"Stored block {self.next_height} is corrupt: {e}")])
+                self.last_scrubbed_height = self.next_height
+                self.next_height += 1
+                count += 1
+            finally:
+                records.close()
+
+            self.blocks_scrubbed += count
+            self.bytes_scrubbed += read_bytes
+            self._save_state()
+        return read_bytes
+
+    def _run(self) -> None:
+        """Scrub batches until stopped, pausing to stay within the budgets."""
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                read_bytes = self.run_once()
+            except Exception as e:
+                print(f"Error scrubbing blockchain storage: {e}")
+                read_bytes = 0
+            busy = time.perf_counter() - started
+
+            if read_bytes == 0:
+                pause = self.idle_seconds
+            else:
+                pause = busy * (1.0 - self.cpu_fraction) / self.cpu_fraction
+                if self.io_bytes_per_second:
+                    pause = max(pause, read_bytes / self.io_bytes_per_second - busy)
+            self._stop.wait(pause)
+
+    def start(self) -> None:
+        """Start scrubbing in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="block-scrubber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread after its current batch.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread (None = no limit)
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scrubber statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            "running": self.running,
+            "next_height": self.next_height,
+            "last_scrubbed_height": self.last_scrubbed_height,
+            "completed_passes": self.completed_passes,
+            "blocks_scrubbed": self.blocks_scrubbed,
+            "bytes_scrubbed": self.bytes_scrubbed,
+            "anomalies": self.anomaly_count,
+            "io_bytes_per_second": self.io_bytes_per_second,
+            "cpu_fraction": self.cpu_fraction,
+        }
+
+    def __repr__(self) -> str:
+        """String representation of scrubber."""
+        return (f"IntegrityScrubber(next_height={self.next_height}, "
+                f"passes={self.completed_passes}, anomalies={self.anomaly_count})")
@@ -0,0 +1,1067 @@
+"""
+Append-only segmented record log.
+Records are length-prefixed and checksummed, and located through a
+fixed-width offset index so the log can be opened without parsing it.
+Reads go through memory maps of the segments and the index, so single
+records can be decoded without loading the rest of the log.
+Sealed segments outside the hot tail can be recompressed record by record
+into cold segment files that are decompressed on demand.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .compression import RecordCompressor, train_dictionary, CODEC_ZLIB, COMPRESSION_MASK
+from .durability import GroupCommitter, FSYNC_INTERVAL, FSYNC_OS
+
+
+class StorageError(Exception):
+    """Exception raised for storage engine failures."""
+    pass
+
+
+class CorruptRecordError(StorageError):
+    """Exception raised when a stored record fails its checksum."""
+
+    def __init__(self, message: str, segment: Optional[int] = None, offset: Optional[int] = None):
+        """
+        Initialize corrupt record error.
+
+        Args:
+            message: Error message
+            segment: Segment holding the corrupt record
+            offset: Byte offset of the corrupt record
+        """
+        super().__init__(message)
+        self.segment = segment
+        self.offset = offset
+
+
+# Record header: format byte, payload length, CRC32 of format + length + payload
+RECORD_HEADER = struct.Struct('>BII')
+
+# Index entry: segment number, record offset, record length (header + payload), key
+INDEX_ENTRY = struct.Struct('>IQI32s')
+INDEX_KEY_OFFSET = 16
+
+# Flag set on the segment number of index entries that point into a cold segment
+COLD_SEGMENT_FLAG = 0x80000000
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Key file entry: 8-byte key prefix and record number, stored as two arrays
+KEY_FILE_ENTRY_BYTES = 16
+
+
+def _key_prefix(key: bytes) -> int:
+    """Get the in-memory lookup prefix of an index key."""
+    return int.from_bytes(key[:8], 'big')
+
+
+def _record_checksum(record_format: int, payload: bytes) -> int:
+    """
+    Calculate the checksum stored in a record header.
+
+    Args:
+        record_format: Record format byte
+        payload: Record payload
+
+    Returns:
+        CRC32 value
+    """
+    prefix = struct.pack('>BI', record_format, len(payload))
+    return zlib.crc32(payload, zlib.crc32(prefix))
+
+
+class SegmentedLog:
+    """
+    Append-only log of records split across rolling segment files.
+
+    Every record is written as a single sequential append to the active
+    segment, followed by a fixed-width entry in the offset index. Record
+    numbers are dense and start at 0, so record ``n`` is index entry ``n``.
+    Neither the index nor the segments are held in memory; both are
+    memory-mapped and remapped as the log grows. Key lookups binary-search
+    a sorted key file written for each sealed segment on first use, and a
+    table of the active segment's key prefixes.
+
+    Appends are made durable by a GroupCommitter according to the fsync
+    policy. A torn record at the end of the last segment (left behind by a
+    crash mid-append) is truncated when the log is opened.
+
+    With compression enabled, every time the active segment rolls over a
+    background thread rewrites the sealed segments older than the
+    ``hot_segments`` newest ones as cold segments whose record payloads are
+    compressed individually, so random reads still only decompress the
+    record they need. Decompressed cold records are kept in a small LRU
+    cache.
+    """
+
+    SEGMENT_PREFIX = "segment_"
+    SEGMENT_SUFFIX = ".log"
+    COLD_SEGMENT_SUFFIX = ".zlog"
+    INDEX_FILE = "records.idx"
+    DICTIONARY_FILE = "compression.zdict"
+    KEY_FILE_PREFIX = "keys_"
+    KEY_FILE_SUFFIX = ".idx"
+
+    def __init__(self, directory: str, max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+                 fsync_policy: str = FSYNC_INTERVAL, fsync_interval_ms: float = 50.0,
+                 compression: Optional[str] = None, compression_level: Optional[int] = None,
+                 compression_dictionary: bool = True, hot_segments: int = 2,
+                 read_cache_size: int = 1024):
+        """
+        Open (or create) a segmented log.
+
+        Args:
+            directory: Directory holding segment and index files
+            max_segment_bytes: Size at which the active segment is rolled over
+            fsync_policy: When appends are fsynced ("always", "interval" or "os")
+            fsync_interval_ms: Maximum commit delay for the "interval" policy
+            compression: Codec for cold segments ("zlib", "lzma" or None to
+                keep every segment uncompressed)
+            compression_level: Codec compression level (codec default if None)
+            compression_dictionary: Train a shared zlib dictionary from the
+                first segment that is compressed
+            hot_segments: Number of newest segments (including the active
+                one) that are never compressed
+            read_cache_size: Maximum number of decompressed cold records cached
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.truncated_bytes = 0
+        self.compression = compression
+        self.compression_dictionary = compression_dictionary
+        self.hot_segments = max(1, hot_segments)
+        self.read_cache_size = read_cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._count = 0
+        self._segment_sizes: List[int] = []
+        self._cold_segments = set()
+        self._writer = None
+        self._index_writer = None
+        self._index_map: Optional[mmap.mmap] = None
+        # Key lookups: a sorted key file per sealed segment, mapped on first
+        # use, and a table of the active segment's keys by 8-byte prefix
+        self._key_lock = threading.Lock()
+        self._key_files: Dict[int, Tuple[Optional[mmap.mmap], Any, int]] = {}
+        self._active_keys: Optional[Dict[int, int]] = None
+        self._segment_maps = {}
+        self._read_cache: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        # Guards the memory maps: a map is only remapped, closed or swapped for
+        # a cold segment's while no reader is copying out of it
+        self._map_lock = threading.RLock()
+
+        # Background compaction requested on segment rollover
+        self._compaction_condition = threading.Condition()
+        self._compaction_requested = False
+        self._compacting = False
+        self._compactor: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._compressor = RecordCompressor(compression or CODEC_ZLIB, level=compression_level,
+                                            dictionary=self._load_dictionary())
+
+        self._open()
+        self.committer = GroupCommitter(self._sync, policy=fsync_policy,
+                                        interval_ms=fsync_interval_ms, durable_count=self._count)
+
+    # ------------------------------------------------------------------
+    # Opening and recovery
+    # ------------------------------------------------------------------
+
+    def segment_path(self, segment: int, cold: bool = False) -> Path:
+        """
+        Get the file path of a segment.
+
+        Args:
+            segment: Segment number
+            cold: Get the path of the compressed cold segment file
+
+        Returns:
+            Segment file path
+        """
+        suffix = self.COLD_SEGMENT_SUFFIX if cold else self.SEGMENT_SUFFIX
+        return self.directory / f"{self.SEGMENT_PREFIX}{segment:08d}{suffix}"
+
+    def _entry_path(self, segment_field: int) -> Path:
+        """Get the segment file an index entry's segment field points into."""
+        return self.segment_path(segment_field & ~COLD_SEGMENT_FLAG,
+                                 cold=bool(segment_field & COLD_SEGMENT_FLAG))
+
+    @property
+    def dictionary_path(self) -> Path:
+        """Path of the shared compression dictionary."""
+        return self.directory / self.DICTIONARY_FILE
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the offset index file."""
+        return self.directory / self.INDEX_FILE
+
+    def _list_segments(self) -> Tuple[List[int], List[int]]:
+        """List hot and cold segment numbers present on disk, in order."""
+        hot, cold = [], []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.startswith(self.SEGMENT_PREFIX):
+                    continue
+                for suffix, numbers in ((self.SEGMENT_SUFFIX, hot), (self.COLD_SEGMENT_SUFFIX, cold)):
+                    if name.endswith(suffix):
+                        number = name[len(self.SEGMENT_PREFIX):-len(suffix)]
+                        if number.isdigit():
+                            numbers.append(int(number))
+        return sorted(hot), sorted(cold)
+
+    def _open(self) -> None:
+        """Load the offset index and recover any records it is missing."""
+        hot, cold = self._list_segments()
+        segments = sorted(set(hot) | set(cold))
+        if segments and segments != list(range(len(segments))):
+            raise StorageError(f"Missing segment files in {self.directory}: found {segments}")
+
+        self._cold_segments = set(cold)
+        self._segment_sizes = [self.segment_path(s, cold=s not in hot).stat().st_size for s in segments]
+
+        self.index_path.touch()
+        self._count = self.index_path.stat().st_size // INDEX_ENTRY.size
+
+        # Drop index entries whose records are missing or torn on disk
+        while self._count:
+            segment_field, offset, length, _ = self._entry(self._count - 1)
+            segment = segment_field & ~COLD_SEGMENT_FLAG
+            if segment < len(self._segment_sizes) and \
+                    offset + length <= self._entry_path(segment_field).stat().st_size \
+                    and self._is_valid_record(segment_field, offset, length):
+                break
+            self._count -= 1
+
+        index_valid_bytes = self._count * INDEX_ENTRY.size
+        if self.index_path.stat().st_size != index_valid_bytes:
+            self._close_index_map()
+            os.truncate(self.index_path, index_valid_bytes)
+
+        # Finish compactions interrupted after the cold segment was written
+        for segment in sorted(set(hot) & set(cold)):
+            self._install_cold_segment(segment)
+        for temp_path in self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.COLD_SEGMENT_SUFFIX}.tmp"):
+            temp_path.unlink()
+
+        self._recover_tail()
+
+        # Key files are only kept for sealed segments; drop stale ones
+        active = len(self._segment_sizes) - 1
+        for path in self.directory.glob(f"{self.KEY_FILE_PREFIX}*{self.KEY_FILE_SUFFIX}*"):
+            number = path.name[len(self.KEY_FILE_PREFIX):].split('.')[0]
+            if path.name.endswith(".tmp") or not number.isdigit() or int(number) >= active:
+                path.unlink()
+
+    def _recover_tail(self) -> None:
+        """
+        Scan records written after the last index entry and index them.
+        The index is written after the record, so a crash can leave records
+        on disk that the index does not know about yet.
+        """
+        if self._count:
+            segment, offset, length, _ = self._entry(self._count - 1)
+            position = offset + length
+            if segment & COLD_SEGMENT_FLAG:
+                # Cold segments are sealed; anything newer starts a later segment
+                segment, position = (segment & ~COLD_SEGMENT_FLAG) + 1, 0
+        else:
+            segment, position = 0, 0
+
+        recovered = []
+        while segment < len(self._segment_sizes):
+            try:
+                for offset, length, record_format, payload in self._scan_segment(segment, position):
+                    recovered.append((segment, offset, length, self.key_from_payload(record_format, payload)))
+            except CorruptRecordError as e:
+                if segment != len(self._segment_sizes) - 1 or not self._is_torn_tail(segment, e.offset):
+                    raise
+                self._truncate_segment(segment, e.offset)
+            segment += 1
+            position = 0
+
+        if recovered:
+            with open(self.index_path, 'ab') as f:
+                for entry in recovered:
+                    f.write(INDEX_ENTRY.pack(*entry))
+            self._count += len(recovered)
+
+    def _is_valid_record(self, segment_field: int, offset: int, length: int) -> bool:
+        """Check the checksum of a record referenced by the index."""
+        with open(self._entry_path(segment_field), 'rb') as f:
+            f.seek(offset)
+            try:
+                self._decode_record(f.read(length), segment_field & ~COLD_SEGMENT_FLAG, offset)
+            except CorruptRecordError:
+                return False
+        return True
+
+    def _is_torn_tail(self, segment: int, offset: int) -> bool:
+        """
+        Check whether a corrupt record is an interrupted final append.
+        That is the case when the record runs past the end of the file or
+        everything from it to the end of the file is zero-filled.
+
+        Args:
+            segment: Segment number
+            offset: Offset of the corrupt record
+
+        Returns:
+            True if the tail can safely be truncated
+        """
+        size = self._segment_sizes[segment]
+        with open(self.segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return True
+
+            _, length, _ = RECORD_HEADER.unpack(header)
+            if offset + RECORD_HEADER.size + length > size:
+                return True
+
+            f.seek(offset)
+            return not f.read().strip(b'\x00')
+
+    def _truncate_segment(self, segment: int, offset: int) -> None:
+        """Cut a segment back to the end of its last complete record."""
+        self.truncated_bytes += self._segment_sizes[segment] - offset
+        os.truncate(self.segment_path(segment), offset)
+        self._segment_sizes[segment] = offset
+
+    def key_from_payload(self, record_format: int, payload: bytes) -> bytes:
+        """
+        Derive the 32-byte index key of a record from its payload.
+        Only used when rebuilding index entries; subclasses override this.
+
+        Args:
+            record_format: Record format byte
+            payload: Record payload
+
+        Returns:
+            Index key
+        """
+        return bytes(32)
+
+    def _scan_segment(self, segment: int, start: int = 0,
+                      cold: bool = False) -> Iterator[Tuple[int, int, int, bytes]]:
+        """
+        Sequentially read raw records from a segment.
+
+        Args:
+            segment: Segment number
+            start: Byte offset to start reading from
+            cold: Read the compressed cold segment file
+
+        Yields:
+            Tuples of (offset, record_length, record_format, payload)
+        """
+        with open(self.segment_path(segment, cold=cold), 'rb') as f:
+            yield from self._scan_file(f, segment, start)
+
+    @staticmethod
+    def _scan_file(f, segment: int, start: int = 0) -> Iterator[Tuple[int, int, int, bytes]]:
+        """
+        Sequentially read raw records from an open segment file.
+
+        Args:
+            f: Segment file opened for binary reading
+            segment: Segment number (for error reports)
+            start: Byte offset to start reading from
+
+        Yields:
+            Tuples of (offset, record_length, record_format, payload)
+        """
+        name = Path(f.name).name
+        f.seek(start)
+        offset = start
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if not header:
+                return
+            if len(header) < RECORD_HEADER.size:
+                raise CorruptRecordError(f"Truncated record header in {name} at offset {offset}",
+                                         segment, offset)
+
+            record_format, length, checksum = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or _record_checksum(record_format, payload) != checksum:
+                raise CorruptRecordError(f"Corrupt record in {name} at offset {offset}",
+                                         segment, offset)
+
+            record_length = RECORD_HEADER.size + length
+            yield offset, record_length, record_format, payload
+            offset += record_length
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, payload: bytes, key: bytes, record_format: int) -> int:
+        """
+        Append a record to the log.
+        The record is handed to the OS before returning; whether it has
+        also been fsynced depends on the fsync policy.
+
+        Args:
+            payload: Record payload
+            key: 32-byte key stored in the offset index
+            record_format: Format byte describing the payload encoding
+
+        Returns:
+            Record number of the appended record
+        """
+        if len(key) != 32:
+            raise ValueError("Index key must be exactly 32 bytes")
+
+        record = RECORD_HEADER.pack(record_format, len(payload),
+                                    _record_checksum(record_format, payload)) + payload
+
+        rolled = False
+        with self._write_lock:
+            segment = len(self._segment_sizes) - 1
+            if segment < 0 or (self._segment_sizes[segment] > 0 and
+                               self._segment_sizes[segment] + len(record) > self.max_segment_bytes):
+                segment = self._roll_segment()
+                rolled = segment > 0
+                if self._active_keys is not None:
+                    self._active_keys = {}
+
+            writer = self._get_writer(segment)
+            offset = self._segment_sizes[segment]
+            writer.write(record)
+            writer.flush()
+            self._segment_sizes[segment] += len(record)
+
+            index_writer = self._get_index_writer()
+            index_writer.write(INDEX_ENTRY.pack(segment, offset, len(record), key))
+            index_writer.flush()
+
+            if self._active_keys is not None:
+                self._active_keys.setdefault(_key_prefix(key), self._count)
+            self._count += 1
+            count = self._count
+
+        self.committer.record_write(count)
+        if rolled and self.compression:
+            self._request_compaction()
+        return count - 1
+
+    def _sync(self) -> None:
+        """Fsync the active segment and the offset index."""
+        with self._write_lock:
+            for handle in (self._writer, self._index_writer):
+                if handle is not None:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+
+    def sync(self, count: Optional[int] = None) -> None:
+        """
+        Make appended records durable now.
+
+        Args:
+            count: Number of records that must be durable (None = all)
+        """
+        self.committer.commit(count)
+
+    def get_commit_stats(self) -> Dict[str, Any]:
+        """
+        Get group commit statistics.
+
+        Returns:
+            Statistics dictionary including commit latency percentiles
+        """
+        stats = self.committer.get_stats()
+        stats["truncated_bytes"] = self.truncated_bytes
+        return stats
+
+    def _roll_segment(self) -> int:
+        """Start a new active segment and return its number (write lock held)."""
+        if self._writer is not None:
+            # The closed segment must be durable before later records are
+            if self.committer.policy != FSYNC_OS:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+            self._writer.close()
+            self._writer = None
+
+        segment = len(self._segment_sizes)
+        self.segment_path(segment).touch()
+        self._segment_sizes.append(0)
+        return segment
+
+    def _get_writer(self, segment: int):
+        """Get the append handle of the active segment."""
+        if self._writer is None:
+            self._writer = open(self.segment_path(segment), 'ab')
+        return self._writer
+
+    def _get_index_writer(self):
+        """Get the append handle of the offset index."""
+        if self._index_writer is None:
+            self._index_writer = open(self.index_path, 'ab')
+        return self._index_writer
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Number of records in the log."""
+        return self._count
+
+    def _map_file(self, path: Path, current: Optional[mmap.mmap], needed: int) -> mmap.mmap:
+        """
+        Return a read-only map of a file covering at least ``needed`` bytes.
+        Must be called with the map lock held, as it may close ``current``.
+
+        Args:
+            path: File to map
+            current: Existing map of the file, if any
+            needed: Number of bytes that must be mapped
+
+        Returns:
+            Memory map of the file
+        """
+        if current is not None and len(current) >= needed:
+            return current
+        if current is not None:
+            current.close()
+
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _entry(self, number: int) -> Tuple[int, int, int, bytes]:
+        """
+        Read an entry from the memory-mapped offset index.
+
+        Args:
+            number: Record number
+
+        Returns:
+            Tuple of (segment, offset, record_length, key)
+        """
+        position = number * INDEX_ENTRY.size
+        with self._map_lock:
+            self._index_map = self._map_file(self.index_path, self._index_map, position + INDEX_ENTRY.size)
+            return INDEX_ENTRY.unpack_from(self._index_map, position)
+
+    def _close_index_map(self) -> None:
+        """Release the memory map of the offset index."""
+        with self._map_lock:
+            if self._index_map is not None:
+                self._index_map.close()
+                self._index_map = None
+
+    def _check_number(self, number: int) -> None:
+        """Raise IndexError for record numbers outside the log."""
+        if not 0 <= number < self._count:
+            raise IndexError(f"Record {number} out of range")
+
+    def key(self, number: int) -> bytes:
+        """
+        Get the index key of a record.
+
+        Args:
+            number: Record number
+
+        Returns:
+            32-byte key
+        """
+        self._check_number(number)
+        return self._entry(number)[3]
+
+    def find_key(self, key: bytes) -> Optional[int]:
+        """
+        Find the first record with the given index key.
+        Sealed segments are searched through their sorted key files and the
+        active segment through an in-memory table of its key prefixes, so
+        memory use is bounded by the size of one segment. Every match is
+        confirmed against the full key in the index entry.
+
+        Args:
+            key: 32-byte key
+
+        Returns:
+            Record number or None if not found
+        """
+        if not self._count:
+            return None
+
+        prefix = _key_prefix(key)
+        with self._write_lock:
+            active = len(self._segment_sizes) - 1
+            if self._active_keys is None:
+                self._active_keys = {}
+                for key_prefix, number in self._read_keys(self._first_record(active), self._count):
+                    self._active_keys.setdefault(key_prefix, number)
+            number = self._active_keys.get(prefix)
+            count = self._count
+
+        # Oldest segment first, so the first record with the key is found
+        for segment in range(active):
+            _, values, size = self._segment_keys(segment)
+            position = bisect_left(values, prefix, 0, size)
+            while position < size and values[position] == prefix:
+                if self._entry(values[size + position])[3] == key:
+                    return values[size + position]
+                position += 1
+
+        if number is None:
+            return None
+        if self._entry(number)[3] == key:
+            return number
+        # Another key shares the prefix; search the active segment's entries
+        return self._search_index(key, self._first_record(active), count)
+
+    def key_file_path(self, segment: int) -> Path:
+        """
+        Get the path of a sealed segment's sorted key file.
+
+        Args:
+            segment: Segment number
+
+        Returns:
+            Key file path
+        """
+        return self.directory / f"{self.KEY_FILE_PREFIX}{segment:08d}{self.KEY_FILE_SUFFIX}"
+
+    def _read_keys(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """
+        Read the key prefixes of a range of index entries.
+
+        Args:
+            start: First record number
+            stop: Record number to stop before
+
+        Returns:
+            List of (key prefix, record number) in record order
+        """
+        if stop <= start:
+            return []
+        with self._map_lock:
+            self._index_map = self._map_file(self.index_path, self._index_map, stop * INDEX_ENTRY.size)
+            entries = memoryview(self._index_map)[start * INDEX_ENTRY.size:stop * INDEX_ENTRY.size]
+            try:
+                return [(_key_prefix(key), number)
+                        for number, (_, _, _, key) in enumerate(INDEX_ENTRY.iter_unpack(entries), start)]
+            finally:
+                entries.release()
+
+    def _segment_keys(self, segment: int) -> Tuple[Optional[mmap.mmap], Any, int]:
+        """
+        Get the key file contents of a sealed segment, writing the file if
+        it is missing or does not cover the segment's records.
+
+        Args:
+            segment: Sealed segment number
+
+        Returns:
+            Tuple of (key file map, values, record count), where values holds
+            the sorted key prefixes followed by their record numbers
+        """
+        with self._key_lock:
+            keys = self._key_files.get(segment)
+            if keys is not None:
+                return keys
+
+            first, stop = self._first_record(segment), self._first_record(segment + 1)
+            path = self.key_file_path(segment)
+            if not path.exists() or path.stat().st_size != (stop - first) * KEY_FILE_ENTRY_BYTES:
+                self._write_key_file(path, first, stop)
+
+            if stop == first:
+                keys = (None, (), 0)
+            elif sys.byteorder == 'little':
+                with open(path, 'rb') as f:
+                    key_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                keys = (key_map, memoryview(key_map).cast('Q'), stop - first)
+            else:
+                values = array('Q', path.read_bytes())
+                values.byteswap()
+                keys = (None, values, stop - first)
+            self._key_files[segment] = keys
+            return keys
+
+    def _write_key_file(self, path: Path, start: int, stop: int) -> None:
+        """
+        Write the key file of a sealed segment: its key prefixes in sorted
+        order followed by their record numbers, as little-endian 64-bit
+        integers.
+
+        Args:
+            path: Key file path
+            start: First record number of the segment
+            stop: Record number to stop before
+        """
+        keys = sorted(self._read_keys(start, stop))
+        prefixes = array('Q', (prefix for prefix, _ in keys))
+        numbers = array('Q', (number for _, number in keys))
+        if sys.byteorder != 'little':
+            prefixes.byteswap()
+            numbers.byteswap()
+
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(prefixes.tobytes())
+            f.write(numbers.tobytes())
+        os.replace(temp_path, path)
+
+    def _close_key_files(self) -> None:
+        """Release the memory maps of the key files."""
+        with self._key_lock:
+            for key_map, values, _ in self._key_files.values():
+                if key_map is not None:
+                    values.release()
+                    key_map.close()
+            self._key_files.clear()
+
+    def _search_index(self, key: bytes, start: int, stop: int) -> Optional[int]:
+        """
+        Search a range of the mapped index for the first entry with a key.
+
+        Args:
+            key: 32-byte key
+            start: First record number
+            stop: Record number to stop before
+
+        Returns:
+            Record number or None if not found
+        """
+        index_bytes = stop * INDEX_ENTRY.size
+        with self._map_lock:
+            self._index_map = self._map_file(self.index_path, self._index_map, index_bytes)
+
+            position = self._index_map.find(key, start * INDEX_ENTRY.size + INDEX_KEY_OFFSET, index_bytes)
+            while position != -1:
+                if (position - INDEX_KEY_OFFSET) % INDEX_ENTRY.size == 0:
+                    return (position - INDEX_KEY_OFFSET) // INDEX_ENTRY.size
+                position = self._index_map.find(key, position + 1, index_bytes)
+        return None
+
+    def read(self, number: int) -> Tuple[int, bytes]:
+        """
+        Read a single record through the segment's memory map.
+        Records in cold segments are decompressed (or served from the
+        read cache).
+
+        Args:
+            number: Record number
+
+        Returns:
+            Tuple of (record_format, payload)
+        """
+        self._check_number(number)
+
+        with self._cache_lock:
+            cached = self._read_cache.get(number)
+            if cached is not None:
+                self._read_cache.move_to_end(number)
+                self.cache_hits += 1
+                return cached
+
+        segment_field, record_format, payload = self._read_raw(number)
+
+        if not segment_field & COLD_SEGMENT_FLAG:
+            return record_format, payload
+
+        record = self._decompress(record_format, payload)
+        with self._cache_lock:
+            self.cache_misses += 1
+            if self.read_cache_size > 0:
+                self._read_cache[number] = record
+                while len(self._read_cache) > self.read_cache_size:
+                    self._read_cache.popitem(last=False)
+        return record
+
+    def _read_raw(self, number: int) -> Tuple[int, int, bytes]:
+        """Read and checksum a stored record without decompressing it."""
+        with self._map_lock:
+            segment_field, offset, length, _ = self._entry(number)
+            segment_map = self._map_file(self._entry_path(segment_field),
+                                         self._segment_maps.get(segment_field), offset + length)
+            self._segment_maps[segment_field] = segment_map
+            record = segment_map[offset:offset + length]
+
+        record_format, payload = self._decode_record(record, segment_field & ~COLD_SEGMENT_FLAG, offset)
+        return segment_field, record_format, payload
+
+    def _decompress(self, record_format: int, payload: bytes) -> Tuple[int, bytes]:
+        """Strip the compression flag from a record and decompress its payload."""
+        flag = record_format & COMPRESSION_MASK
+        if not flag:
+            return record_format, payload
+        try:
+            return record_format & ~COMPRESSION_MASK, self._compressor.decompress(flag, payload)
+        except Exception as e:
+            raise StorageError(f"Failed to decompress record: {e}") from e
+
+    def _decode_record(self, record: bytes, segment: int, offset: int) -> Tuple[int, bytes]:
+        """Check and split a raw record into format and payload."""
+        if len(record) < RECORD_HEADER.size:
+            raise CorruptRecordError(f"Truncated record in segment {segment} at offset {offset}",
+                                     segment, offset)
+
+        record_format, length, checksum = RECORD_HEADER.unpack_from(record)
+        payload = record[RECORD_HEADER.size:RECORD_HEADER.size + length]
+        if len(payload) != length or _record_checksum(record_format, payload) != checksum:
+            raise CorruptRecordError(f"Corrupt record in segment {segment} at offset {offset}",
+                                     segment, offset)
+
+        return record_format, payload
+
+    def scan(self, start: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Sequentially read records, segment by segment.
+
+        Args:
+            start: First record number to read
+
+        Yields:
+            Tuples of (record_number, record_format, payload)
+        """
+        number = start
+        while number < self._count:
+            # Resolve and open the segment together, so a cold swap cannot
+            # remove the hot file in between (an open file stays readable)
+            with self._map_lock:
+                segment_field, offset, _, _ = self._entry(number)
+                f = open(self._entry_path(segment_field), 'rb')
+            segment = segment_field & ~COLD_SEGMENT_FLAG
+            cold = bool(segment_field & COLD_SEGMENT_FLAG)
+
+            with f:
+                for _, _, record_format, payload in self._scan_file(f, segment, offset):
+                    if number >= self._count:
+                        return
+                    if cold:
+                        record_format, payload = self._decompress(record_format, payload)
+                    yield number, record_format, payload
+                    number += 1
+
+    # ------------------------------------------------------------------
+    # Cold segment compression
+    # ------------------------------------------------------------------
+
+    def _load_dictionary(self) -> Optional[bytes]:
+        """Load the shared compression dictionary, if one has been trained."""
+        try:
+            return self.dictionary_path.read_bytes() or None
+        except FileNotFoundError:
+            return None
+
+    def _train_dictionary(self, segment: int) -> None:
+        """Train and persist the shared dictionary from a segment's records."""
+        samples = [payload for _, _, _, payload in self._scan_segment(segment)]
+        step = max(1, len(samples) // 512)
+        dictionary = train_dictionary(samples[::step])
+        if not dictionary:
+            return
+
+        temp_path = self.dictionary_path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(dictionary)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.dictionary_path)
+        self._compressor.dictionary = dictionary
+
+    def _request_compaction(self) -> None:
+        """Ask the background compactor to run, starting it if needed."""
+        with self._compaction_condition:
+            if self._closed:
+                return
+            self._compaction_requested = True
+            if self._compactor is None:
+                self._compactor = threading.Thread(target=self._run_compactor,
+                                                   name="segment-compactor", daemon=True)
+                self._compactor.start()
+            self._compaction_condition.notify_all()
+
+    def _run_compactor(self) -> None:
+        """Compact segments whenever requested until the log is closed."""
+        while True:
+            with self._compaction_condition:
+                self._compaction_condition.wait_for(lambda: self._compaction_requested or self._closed)
+                if self._closed:
+                    return
+                self._compaction_requested = False
+                self._compacting = True
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Error compacting segments in {self.directory}: {e}")
+            finally:
+                with self._compaction_condition:
+                    self._compacting = False
+                    self._compaction_condition.notify_all()
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until requested background compactions have finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if no compaction is pending, False on timeout
+        """
+        with self._compaction_condition:
+            return self._compaction_condition.wait_for(
+                lambda: self._closed or not (self._compaction_requested or self._compacting), timeout)
+
+    def compact(self) -> int:
+        """
+        Compress every sealed segment outside the hot tail.
+
+        Returns:
+            Number of segments compressed
+        """
+        if not self.compression:
+            return 0
+
+        with self._compact_lock:
+            cold_limit = len(self._segment_sizes) - self.hot_segments
+            pending = [s for s in range(cold_limit) if s not in self._cold_segments]
+            for segment in pending:
+                self._compact_segment(segment)
+        return len(pending)
+
+    def _compact_segment(self, segment: int) -> None:
+        """
+        Rewrite a sealed segment as a compressed cold segment.
+        The cold file is made durable before the index is switched to it,
+        and the hot file is only removed after that, so a crash at any point
+        leaves a readable log (see ``_install_cold_segment``).
+
+        Args:
+            segment: Segment number
+        """
+        if self.compression == CODEC_ZLIB and self.compression_dictionary and \
+                self._compressor.dictionary is None:
+            self._train_dictionary(segment)
+
+        cold_path = self.segment_path(segment, cold=True)
+        temp_path = cold_path.with_name(cold_path.name + '.tmp')
+        with open(temp_path, 'wb') as f:
+            for _, _, record_format, payload in self._scan_segment(segment):
+                flag, compressed = self._compressor.compress(payload)
+                cold_format = record_format | flag
+                f.write(RECORD_HEADER.pack(cold_format, len(compressed),
+                                           _record_checksum(cold_format, compressed)))
+                f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, cold_path)
+
+        self._install_cold_segment(segment)
+
+    def _first_record(self, segment: int) -> int:
+        """Find the number of the first record stored in a segment."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] & ~COLD_SEGMENT_FLAG < segment:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _install_cold_segment(self, segment: int) -> None:
+        """
+        Point the index entries of a segment at its cold file and remove
+        the hot file.
+
+        Args:
+            segment: Segment number
+        """
+        first = self._first_record(segment)
+        entries = []
+        for position, (offset, length, _, _) in enumerate(self._scan_segment(segment, cold=True)):
+            number = first + position
+            if number >= self._count or self._entry(number)[0] & ~COLD_SEGMENT_FLAG != segment:
+                raise StorageError(f"Cold segment {segment} does not match the offset index")
+            entries.append(INDEX_ENTRY.pack(segment | COLD_SEGMENT_FLAG, offset, length,
+                                            self._entry(number)[3]))
+
+        with self._write_lock, self._map_lock:
+            with open(self.index_path, 'r+b') as f:
+                f.seek(first * INDEX_ENTRY.size)
+                f.write(b"".join(entries))
+                f.flush()
+                os.fsync(f.fileno())
+
+            segment_map = self._segment_maps.pop(segment, None)
+            if segment_map is not None:
+                segment_map.close()
+            self.segment_path(segment).unlink()
+            cold_path = self.segment_path(segment, cold=True)
+            self._segment_sizes[segment] = cold_path.stat().st_size
+            self._cold_segments.add(segment)
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """
+        Get cold segment compression statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        cold_bytes = sum(self._segment_sizes[s] for s in self._cold_segments)
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "compression": self.compression,
+            "hot_segments": len(self._segment_sizes) - len(self._cold_segments),
+            "cold_segments": len(self._cold_segments),
+            "hot_bytes": sum(self._segment_sizes) - cold_bytes,
+            "cold_bytes": cold_bytes,
+            "dictionary_bytes": len(self._compressor.dictionary or b""),
+            "read_cache_hits": self.cache_hits,
+            "read_cache_misses": self.cache_misses,
+            "read_cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Commit outstanding records and close all file handles and memory maps."""
+        with self._compaction_condition:
+            self._closed = True
+            self._compaction_condition.notify_all()
+        if self._compactor is not None:
+            # Let a running compaction finish before its files are closed
+            self._compactor.join()
+            self._compactor = None
+
+        self.committer.close()
+        with self._map_lock:
+            for handle in [self._writer, self._index_writer, *self._segment_maps.values()]:
+                if handle is not None:
+                    handle.close()
+            self._segment_maps.clear()
+            self._close_index_map()
+        self._close_key_files()
+        self._writer = None
+        self._index_writer = None
+        self._segment_maps = {}
+        self._read_cache.clear()
+
+    def __repr__(self) -> str:
+        """String representation of the log."""
+        return f"SegmentedLog(records={self._count}, segments={len(self._segment_sizes)})"
@@ -0,0 +1,306 @@
+"""
+SQLite block storage engine.
+Keeps the whole ledger in a single database file with indexed block and
+transaction tables, so lookups by wallet, module or type are answered by
+index queries instead of scanning every block. Transaction hashes and IDs
+are looked up through the chain's transaction index, like every backend.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..blockchain.block import Block
+from ..blockchain.transaction import Transaction
+from .block_store import BlockStore, FORMAT_JSON
+from .durability import CommitStats, FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS, FSYNC_POLICIES
+from .segment_log import StorageError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    height INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL,
+    previous_hash TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_blocks_hash ON blocks (block_hash);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    height INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    transaction_hash TEXT,
+    transaction_id TEXT,
+    from_wallet TEXT,
+    module TEXT,
+    transaction_type TEXT,
+    timestamp REAL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (height, position)
+);
+DROP INDEX IF EXISTS idx_transactions_hash;
+DROP INDEX IF EXISTS idx_transactions_id;
+CREATE INDEX IF NOT EXISTS idx_transactions_wallet ON transactions (from_wallet, height, position);
+CREATE INDEX IF NOT EXISTS idx_transactions_module ON transactions (module, height, position);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions (transaction_type, height, position);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions (timestamp);
+"""
+
+# SQLite synchronous mode used for each fsync policy
+SYNCHRONOUS_MODES = {
+    FSYNC_ALWAYS: "FULL",
+    FSYNC_INTERVAL: "NORMAL",
+    FSYNC_OS: "OFF",
+}
+
+
+def _dumps(data: Any) -> str:
+    """Serialize a value to compact JSON."""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+class SQLiteBlockStore(BlockStore):
+    """
+    Stores block headers and transactions in indexed SQLite tables.
+    """
+
+    indexed = True
+
+    def __init__(self, database_path: str, fsync_policy: str = FSYNC_INTERVAL, batch_size: int = 256):
+        """
+        Open (or create) a SQLite block store.
+
+        Args:
+            database_path: Path of the database file
+            fsync_policy: Durability policy ("always", "interval" or "os")
+            batch_size: Number of blocks fetched per query when iterating
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy. Must be one of: {', '.join(FSYNC_POLICIES)}")
+
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_policy = fsync_policy
+        self.batch_size = batch_size
+        self.stats = CommitStats()
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.database_path), check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={SYNCHRONOUS_MODES[fsync_policy]}")
+        self._connection.executescript(SCHEMA)
+
+        row = self._connection.execute("SELECT MAX(height) FROM blocks").fetchone()
+        self._count = row[0] + 1 if row[0] is not None else 0
+
+    def __len__(self) -> int:
+        """Number of stored blocks."""
+        return self._count
+
+    def append_block(self, block: Block) -> None:
+        """
+        Append a block and its transactions in a single database transaction.
+
+        Args:
+            block: Block to append (must be the next index)
+        """
+        if block.index != self._count:
+            raise StorageError(f"Expected block index {self._count}, got {block.index}")
+
+        header = block.to_dict()
+        transactions = header.pop('transactions')
+        transaction_rows = [
+            (block.index, position, tx['transaction_hash'], tx['transaction_id'], tx['from_wallet'],
+             tx['module'], tx['transaction_type'], tx['timestamp'], _dumps(tx))
+            for position, tx in enumerate(transactions)
+        ]
+
+        started = time.perf_counter()
+        with self._lock:
+            try:
+                self._connection.execute("BEGIN")
+                self._connection.execute(
+                    "INSERT INTO blocks (height, block_hash, previous_hash, timestamp, header) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (block.index, block.block_hash, block.previous_hash, block.timestamp, _dumps(header)))
+                self._connection.executemany(
+                    "INSERT INTO transactions (height, position, transaction_hash, transaction_id, "
+                    "from_wallet, module, transaction_type, timestamp, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    transaction_rows)
+                self._connection.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._connection.execute("ROLLBACK")
+                raise StorageError(f"Failed to store block {block.index}: {e}") from e
+
+            self._count += 1
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.stats.record(elapsed_ms, elapsed_ms, 1)
+
+    def _build_block(self, header: str, bodies: List[str]) -> Block:
+        """Reassemble a block from its stored header and transaction bodies."""
+        data = json.loads(header)
+        data['transactions'] = [json.loads(body) for body in bodies]
+        return Block.from_dict(data)
+
+    def read_block(self, index: int) -> Optional[Block]:
+        """
+        Read a single block by index.
+
+        Args:
+            index: Block index
+
+        Returns:
+            Block or None if not stored
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT header FROM blocks WHERE height = ?", (index,)).fetchone()
+            if row is None:
+                return None
+            bodies = [body for (body,) in self._connection.execute(
+                "SELECT body FROM transactions WHERE height = ? ORDER BY position", (index,))]
+
+        return self._build_block(row[0], bodies)
+
+    def iter_blocks(self, start: int = 0) -> Iterator[Block]:
+        """
+        Iterate stored blocks in order, fetching them in batches.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Blocks in index order
+        """
+        for _, header, bodies in self._iter_rows(start):
+            yield self._build_block(header, bodies)
+
+    def _iter_rows(self, start: int) -> Iterator[Tuple[int, str, List[str]]]:
+        """Iterate stored header and transaction body rows, fetched in batches."""
+        height = start
+        while height < self._count:
+            end = min(height + self.batch_size, self._count)
+            with self._lock:
+                headers = self._connection.execute(
+                    "SELECT height, header FROM blocks WHERE height >= ? AND height < ? ORDER BY height",
+                    (height, end)).fetchall()
+                bodies: Dict[int, List[str]] = {}
+                for tx_height, body in self._connection.execute(
+                        "SELECT height, body FROM transactions WHERE height >= ? AND height < ? "
+                        "ORDER BY height, position", (height, end)):
+                    bodies.setdefault(tx_height, []).append(body)
+
+            for block_height, header in headers:
+                yield block_height, header, bodies.get(block_height, [])
+            height = end
+
+    def iter_block_payloads(self, start: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Iterate stored blocks as JSON payloads without decoding them.
+        The stored header and transaction bodies are spliced together as text.
+
+        Args:
+            start: First block index
+
+        Yields:
+            Tuples of (block_index, record_format, payload)
+        """
+        for height, header, bodies in self._iter_rows(start):
+            payload = f'{header[:-1]},"transactions":[{",".join(bodies)}]}}'
+            yield height, FORMAT_JSON, payload.encode('utf-8')
+
+    def find_block(self, block_hash: str) -> Optional[int]:
+        """
+        Find the index of a block by its hash.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Block index or None if not found
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT height FROM blocks WHERE block_hash = ?", (block_hash,)).fetchone()
+        return row[0] if row else None
+
+    def read_transaction(self, index: int, position: int) -> Optional[Transaction]:
+        """
+        Read a single transaction without loading the rest of its block.
+
+        Args:
+            index: Index of the containing block
+            position: Position of the transaction within the block
+
+        Returns:
+            Transaction or None if not stored
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body FROM transactions WHERE height = ? AND position = ?",
+                (index, position)).fetchone()
+        return Transaction.from_dict(json.loads(row[0])) if row else None
+
+    def find_transactions(self, field: str, value: str) -> List[Tuple[int, int]]:
+        """
+        Find the locations of transactions by an indexed field.
+
+        Args:
+            field: One of TRANSACTION_INDEX_FIELDS
+            value: Field value to match
+
+        Returns:
+            List of (block_index, position) tuples in chain order
+        """
+        if field not in self.TRANSACTION_INDEX_FIELDS:
+            raise ValueError(f"Invalid field. Must be one of: {', '.join(self.TRANSACTION_INDEX_FIELDS)}")
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT height, position FROM transactions WHERE {field} = ? ORDER BY height, position",
+                (value,)).fetchall()
+        return [(height, position) for height, position in rows]
+
+    def sync(self, count: Optional[int] = None) -> None:
+        """
+        Make committed blocks durable by checkpointing the write-ahead log.
+
+        Args:
+            count: Ignored; every committed block is made durable
+        """
+        if self.fsync_policy == FSYNC_ALWAYS:
+            return
+        with self._lock:
+            self._connection.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Statistics dictionary including commit latency numbers
+        """
+        with self._lock:
+            stats = self.stats.to_dict()
+        stats.update({
+            "backend": "sqlite",
+            "fsync_policy": self.fsync_policy,
+            "database_path": str(self.database_path),
+            "stored_blocks": self._count,
+        })
+        return stats
+
+    def close(self) -> None:
+        """Checkpoint and close the database."""
+        self.sync()
+        self._connection.close()
+
+    def __repr__(self) -> str:
+        """String representation of the store."""
+        return f"SQLiteBlockStore(path={self.database_path}, blocks={self._count})"
@@ -0,0 +1,447 @@
+"""
+Transaction location indexes.
+TransactionIndex maps every chained transaction hash and transaction ID to
+the block height and position that hold it, and WalletIndex keeps the
+postings of each wallet in chain order, so lookups and audit trail pages
+cost dictionary probes instead of a scan over every block. Keys are 16-byte
+BLAKE2b digests, and each entry is one fixed-width record appended to a
+file next to the block store in chain order, so an index is reloaded
+without decoding blocks and cut back by height when the stored chain is
+shorter. Only the lookup tables are held in memory; record fields are read
+through a memory map of the file.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..blockchain.block import Block
+
+
+def index_key(value: str) -> bytes:
+    """
+    Get the index key of a transaction hash or ID.
+
+    Args:
+        value: Transaction hash or ID
+
+    Returns:
+        16-byte key
+    """
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+
+
+def normalize_wallet(wallet_address: str) -> str:
+    """
+    Normalize a wallet address for indexing (addresses are case-insensitive).
+
+    Args:
+        wallet_address: Wallet address as submitted
+
+    Returns:
+        Normalized address
+    """
+    return wallet_address.strip().lower()
+
+
+class _RecordIndex(ABC):
+    """
+    Append-only file of fixed-width records in chain order, loaded into
+    lookup tables by subclasses. File-backed records are read through a
+    memory map of the file instead of being copied into memory.
+    """
+
+    FILE_NAME = ""
+    RECORD: struct.Struct
+    # Position of the block height within a record
+    HEIGHT_FIELD = 2
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, loading the records already stored at a path.
+        A partially written tail (after a crash) is dropped.
+
+        Args:
+            path: Record file path (None keeps the index in memory only)
+        """
+        self.path = Path(path) if path else None
+        # Records of an index kept in memory only
+        self._records = bytearray()
+        self._count = 0
+        # Guards the memory map: it is only remapped or closed while no
+        # reader is unpacking from it
+        self._lock = threading.RLock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.touch()
+            size = self.path.stat().st_size
+            complete = size - size % self.RECORD.size
+            if complete != size:
+                with open(self.path, 'ab') as f:
+                    f.truncate(complete)
+            self._file = open(self.path, 'ab')
+            self._count = complete // self.RECORD.size
+            if complete:
+                records = memoryview(self._mapped(complete))[:complete]
+                try:
+                    for number, record in enumerate(self.RECORD.iter_unpack(records)):
+                        self._insert(number, *record)
+                finally:
+                    records.release()
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return self._count
+
+    @abstractmethod
+    def _insert(self, number: int, *record) -> None:
+        """Add a record to the lookup tables."""
+        pass
+
+    @abstractmethod
+    def _remove(self, number: int, *record) -> None:
+        """Remove the latest record from the lookup tables."""
+        pass
+
+    @abstractmethod
+    def _block_records(self, block: Block) -> List[tuple]:
+        """Get the records of a block."""
+        pass
+
+    @abstractmethod
+    def tail_matches(self, block: Block) -> bool:
+        """
+        Check the last record against the stored block at its height.
+
+        Args:
+            block: Stored block at indexed_height
+
+        Returns:
+            True if the record still describes the block
+        """
+        pass
+
+    def _mapped(self, needed: int) -> mmap.mmap:
+        """
+        Return a map of the record file covering at least ``needed`` bytes,
+        flushing appended records and remapping the file if it has grown.
+        Must be called with the lock held.
+        """
+        if self._map is not None and len(self._map) >= needed:
+            return self._map
+        self._close_map()
+        self._file.flush()
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _close_map(self) -> None:
+        """Release the memory map of the record file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _record(self, number: int) -> tuple:
+        """Unpack a record by number."""
+        offset = number * self.RECORD.size
+        with self._lock:
+            if self.path is None:
+                return self.RECORD.unpack_from(self._records, offset)
+            return self.RECORD.unpack_from(self._mapped(offset + self.RECORD.size), offset)
+
+    def last_record(self) -> Optional[tuple]:
+        """
+        Get the last record.
+
+        Returns:
+            Record fields or None if empty
+        """
+        with self._lock:
+            return self._record(self._count - 1) if self._count else None
+
+    @property
+    def indexed_height(self) -> int:
+        """Height of the last block with records (-1 if none)."""
+        last = self.last_record()
+        return last[self.HEIGHT_FIELD] if last else -1
+
+    def add_block(self, block: Block) -> None:
+        """
+        Index the transactions of the next block.
+
+        Args:
+            block: Block appended to the chain
+        """
+        records = bytearray()
+        with self._lock:
+            for record in self._block_records(block):
+                records += self.RECORD.pack(*record)
+                self._insert(self._count, *record)
+                self._count += 1
+            if self._file is not None:
+                self._file.write(records)
+            else:
+                self._records += records
+
+    def truncate(self, block_count: int) -> None:
+        """
+        Drop the records of every block at or after an index.
+
+        Args:
+            block_count: Number of blocks to keep
+        """
+        with self._lock:
+            # Records are in chain order, so search for the first one to drop
+            low, high = 0, len(self)
+            while low < high:
+                middle = (low + high) // 2
+                if self._record(middle)[self.HEIGHT_FIELD] < block_count:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low < len(self):
+                self._truncate_records(low)
+
+    def _truncate_records(self, count: int) -> None:
+        """Cut the record list (and file) down to a record count."""
+        for number in range(self._count - 1, count - 1, -1):
+            self._remove(number, *self._record(number))
+        self._count = count
+
+        if self.path is None:
+            del self._records[count * self.RECORD.size:]
+            return
+
+        # The map must not outlive the bytes it covers
+        self._close_map()
+        self._file.flush()
+        with open(self.path, 'ab') as f:
+            f.truncate(count * self.RECORD.size)
+
+    def sync(self) -> None:
+        """Flush appended records to the record file and fsync it."""
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the record file."""
+        if self._file is not None:
+            self.sync()
+            with self._lock:
+                self._close_map()
+                self._file.close()
+                self._file = None
+
+
+class TransactionIndex(_RecordIndex):
+    """
+    Hash and ID index of chained transactions, optionally file-backed.
+    """
+
+    FILE_NAME = "tx_index.dat"
+    # Hash key, ID key, block height, position in block
+    RECORD = struct.Struct('>16s16sQI')
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, loading the records already stored at a path.
+
+        Args:
+            path: Record file path (None keeps the index in memory only)
+        """
+        self._by_hash: Dict[bytes, int] = {}
+        self._by_id: Dict[bytes, int] = {}
+        super().__init__(path)
+
+    def _insert(self, number: int, hash_key: bytes, id_key: bytes, height: int, position: int) -> None:
+        """Add a record to the lookup tables (the first occurrence wins)."""
+        location = height << 32 | position
+        self._by_hash.setdefault(hash_key, location)
+        self._by_id.setdefault(id_key, location)
+
+    def _remove(self, number: int, hash_key: bytes, id_key: bytes, height: int, position: int) -> None:
+        """Remove a record from the lookup tables if it is the indexed occurrence."""
+        location = height << 32 | position
+        if self._by_hash.get(hash_key) == location:
+            del self._by_hash[hash_key]
+        if self._by_id.get(id_key) == location:
+            del self._by_id[id_key]
+
+    def _block_records(self, block: Block) -> List[tuple]:
+        """Get the records of a block."""
+        return [(index_key(tx.transaction_hash), index_key(tx.transaction_id), block.index, position)
+                for position, tx in enumerate(block.transactions)]
+
+    def tail_matches(self, block: Block) -> bool:
+        """
+        Check the last record against the stored block at its height.
+
+        Args:
+            block: Stored block at indexed_height
+
+        Returns:
+            True if the record still describes the block
+        """
+        hash_key, _, _, position = self.last_record()
+        return (position < len(block.transactions)
+                and index_key(block.transactions[position].transaction_hash) == hash_key)
+
+    @staticmethod
+    def _location(packed: Optional[int]) -> Optional[Tuple[int, int]]:
+        """Unpack a stored location."""
+        return None if packed is None else (packed >> 32, packed & 0xFFFFFFFF)
+
+    def find(self, transaction_hash: str) -> Optional[Tuple[int, int]]:
+        """
+        Find the location of a transaction by hash.
+
+        Args:
+            transaction_hash: Transaction hash
+
+        Returns:
+            Tuple of (block_index, position) or None if not indexed
+        """
+        return self._location(self._by_hash.get(index_key(transaction_hash)))
+
+    def find_id(self, transaction_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Find the location of a transaction by ID.
+
+        Args:
+            transaction_id: Transaction ID
+
+        Returns:
+            Tuple of (block_index, position) or None if not indexed
+        """
+        return self._location(self._by_id.get(index_key(transaction_id)))
+
+    def __repr__(self) -> str:
+        """String representation of the index."""
+        return f"TransactionIndex(transactions={len(self)}, indexed_height={self.indexed_height})"
+
+
+class WalletIndex(_RecordIndex):
+    """
+    Per-wallet posting lists of chained transactions, optionally file-backed.
+
+    Each wallet's postings are the numbers of its records in chain order, so
+    pages are read newest-first from the end of the list and the posting
+    fields (block timestamp, block index, position) are read from the record
+    file. A cursor is the number of the wallet's postings older than the
+    next page; it stays valid while new blocks are appended.
+    """
+
+    FILE_NAME = "wallet_index.dat"
+    # Wallet key, block timestamp, block height, position in block
+    RECORD = struct.Struct('>16sdQI')
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, loading the records already stored at a path.
+
+        Args:
+            path: Record file path (None keeps the index in memory only)
+        """
+        self._postings: Dict[bytes, array] = {}
+        super().__init__(path)
+
+    def _insert(self, number: int, wallet_key: bytes, timestamp: float, height: int, position: int) -> None:
+        """Append a posting to the wallet's list."""
+        postings = self._postings.get(wallet_key)
+        if postings is None:
+            postings = self._postings[wallet_key] = array('Q')
+        postings.append(number)
+
+    def _remove(self, number: int, wallet_key: bytes, timestamp: float, height: int, position: int) -> None:
+        """Drop the wallet's latest posting."""
+        postings = self._postings[wallet_key]
+        postings.pop()
+        if not postings:
+            del self._postings[wallet_key]
+
+    def _block_records(self, block: Block) -> List[tuple]:
+        """Get the records of a block."""
+        return [(index_key(normalize_wallet(tx.from_wallet)), block.timestamp, block.index, position)
+                for position, tx in enumerate(block.transactions)]
+
+    def tail_matches(self, block: Block) -> bool:
+        """
+        Check the last record against the stored block at its height.
+
+        Args:
+            block: Stored block at indexed_height
+
+        Returns:
+            True if the record still describes the block
+        """
+        wallet_key, timestamp, _, position = self.last_record()
+        return (position < len(block.transactions) and timestamp == block.timestamp
+                and index_key(normalize_wallet(block.transactions[position].from_wallet)) == wallet_key)
+
+    def count(self, wallet_address: str) -> int:
+        """
+        Count the postings of a wallet.
+
+        Args:
+            wallet_address: Wallet address (any case)
+
+        Returns:
+            Number of transactions initiated by the wallet
+        """
+        postings = self._postings.get(index_key(normalize_wallet(wallet_address)))
+        return len(postings) if postings else 0
+
+    def page(self, wallet_address: str, limit: int = 50,
+             cursor: Optional[int] = None) -> Tuple[List[Tuple[float, int, int]], Optional[int]]:
+        """
+        Get a page of a wallet's postings, newest first.
+
+        Args:
+            wallet_address: Wallet address (any case)
+            limit: Maximum postings per page
+            cursor: Cursor returned with the previous page (None = newest)
+
+        Returns:
+            Tuple of (postings as (timestamp, block_index, position), next
+            cursor or None after the oldest posting)
+        """
+        postings = self._postings.get(index_key(normalize_wallet(wallet_address)))
+        if postings is None or limit <= 0:
+            return [], None
+
+        with self._lock:
+            end = len(postings) if cursor is None else max(0, min(cursor, len(postings)))
+            start = max(0, end - limit)
+            page = [self._record(postings[number])[1:] for number in range(end - 1, start - 1, -1)]
+        return page, (start if start > 0 else None)
+
+    def iter_postings(self, wallet_address: str) -> Iterator[Tuple[float, int, int]]:
+        """
+        Iterate a wallet's postings in chain order.
+
+        Args:
+            wallet_address: Wallet address (any case)
+
+        Yields:
+            Tuples of (timestamp, block_index, position)
+        """
+        postings = self._postings.get(index_key(normalize_wallet(wallet_address)))
+        if postings is None:
+            return
+        for number in range(len(postings)):
+            yield self._record(postings[number])[1:]
+
+    def __repr__(self) -> str:
+        """String representation of the index."""
+        return f"WalletIndex(wallets={len(self._postings)}, postings={len(self)})"
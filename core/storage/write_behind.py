@@ -0,0 +1,152 @@
+"""
+Write-behind persistence for sealed blocks.
+A background thread drains a bounded queue of blocks into the block store
+so sealing a block does not wait for disk I/O.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..blockchain.block import Block
+from .block_store import BlockStore
+from .segment_log import StorageError
+
+
+class WriteBehindWriter:
+    """
+    Persists blocks in order from a background thread.
+
+    ``submit`` returns as soon as the block is queued (blocking only when the
+    queue is full). ``flush`` and ``wait_durable`` let callers that need a
+    durability guarantee wait for the writer to catch up.
+    """
+
+    def __init__(self, store: BlockStore, max_queue: int = 1024):
+        """
+        Initialize and start the writer.
+
+        Args:
+            store: Block store to persist into
+            max_queue: Maximum number of blocks waiting to be written
+        """
+        self.store = store
+        self.max_queue = max_queue
+
+        self._queue: "queue.Queue[Optional[Block]]" = queue.Queue(maxsize=max_queue)
+        self._condition = threading.Condition()
+        self._submitted_height = len(store) - 1
+        self._persisted_height = len(store) - 1
+        self._submitted_at: Dict[int, float] = {}
+        self._error: Optional[Exception] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="block-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, block: Block) -> None:
+        """
+        Queue a block for persistence.
+
+        Args:
+            block: Block to persist (must be the next index)
+        """
+        self._raise_if_failed()
+        if self._closed:
+            raise StorageError("Write-behind writer is closed")
+
+        with self._condition:
+            if block.index != self._submitted_height + 1:
+                raise StorageError(f"Expected block index {self._submitted_height + 1}, got {block.index}")
+            self._submitted_height = block.index
+            self._submitted_at[block.index] = time.perf_counter()
+
+        self._queue.put(block)
+
+    def _run(self) -> None:
+        """Write queued blocks until a stop marker is received."""
+        while True:
+            block = self._queue.get()
+            try:
+                if block is None:
+                    return
+                if self._error is None:
+                    self.store.append_block(block)
+            except Exception as e:
+                self._error = e
+            finally:
+                if block is not None:
+                    with self._condition:
+                        if self._error is None:
+                            self._persisted_height = block.index
+                        self._submitted_at.pop(block.index, None)
+                        self._condition.notify_all()
+                self._queue.task_done()
+
+    def _raise_if_failed(self) -> None:
+        """Raise the error that stopped the writer, if any."""
+        if self._error is not None:
+            raise StorageError(f"Write-behind persistence failed: {self._error}") from self._error
+
+    def wait_durable(self, height: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every block up to a height is written and fsynced.
+
+        Args:
+            height: Block index that must be durable
+            timeout: Maximum seconds to wait for the writer (None = no limit)
+
+        Returns:
+            True if the block is durable, False on timeout
+        """
+        with self._condition:
+            reached = self._condition.wait_for(
+                lambda: self._persisted_height >= height or self._error is not None, timeout)
+
+        self._raise_if_failed()
+        if not reached:
+            return False
+
+        self.store.sync(height + 1)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted block is durable.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer (None = no limit)
+
+        Returns:
+            True if all submitted blocks are durable, False on timeout
+        """
+        return self.wait_durable(self._submitted_height, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer statistics.
+
+        Returns:
+            Dictionary with queue depth and writer lag
+        """
+        with self._condition:
+            oldest = min(self._submitted_at.values()) if self._submitted_at else None
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_queue,
+                "submitted_height": self._submitted_height,
+                "persisted_height": self._persisted_height,
+                "lag_blocks": self._submitted_height - self._persisted_height,
+                "lag_ms": (time.perf_counter() - oldest) * 1000.0 if oldest is not None else 0.0,
+                "failed": self._error is not None,
+            }
+
+    def close(self) -> None:
+        """Write all queued blocks and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_if_failed()
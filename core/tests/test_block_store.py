@@ -0,0 +1,75 @@
+"""
+Tests for the segmented block store.
+"""
+
+import os
+
+import pytest
+
+from core.blockchain.block import BlockBuilder
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.block_store import SegmentBlockStore
+from core.storage.compression import CODECS
+
+
+def _blocks(count):
+    """Build a linked run of blocks with two journal entries each."""
+    blocks = []
+    previous_hash = "0" * 64
+    for index in range(count):
+        builder = BlockBuilder(index=index).set_previous_hash(previous_hash).set_created_by("0xabc")
+        for i in range(2):
+            builder.add_transaction(TransactionBuilder()
+                                    .set_type("journal_entry")
+                                    .set_module("accounting")
+                                    .set_data({"block": index, "entry": i})
+                                    .set_wallet("0xabc")
+                                    .set_signature("signature")
+                                    .build())
+        block = builder.build()
+        previous_hash = block.block_hash
+        blocks.append(block)
+    return blocks
+
+
+def test_lost_index_entries_are_rebuilt_with_block_hash_keys(tmp_path):
+    blocks = _blocks(30)
+    store = SegmentBlockStore(str(tmp_path), max_segment_bytes=4096)
+    for block in blocks:
+        store.append_block(block)
+    index_path = store.log.index_path
+    store.close()
+
+    os.truncate(index_path, 0)
+
+    store = SegmentBlockStore(str(tmp_path), max_segment_bytes=4096)
+    try:
+        assert len(store) == len(blocks)
+        assert all(store.find_block(block.block_hash) == block.index for block in blocks)
+        assert store.read_block(len(blocks) - 1).block_hash == blocks[-1].block_hash
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize("compression", CODECS)
+def test_compressed_cold_segments_read_back_unchanged(tmp_path, compression):
+    blocks = _blocks(40)
+    store = SegmentBlockStore(str(tmp_path), max_segment_bytes=4096, compression=compression)
+    try:
+        for block in blocks:
+            store.append_block(block)
+        assert store.log.wait_for_compaction(timeout=30)
+
+        stats = store.log.get_compression_stats()
+        assert stats["compression"] == compression and stats["cold_segments"] > 0
+        assert [store.read_block(block.index).block_hash for block in blocks] == \
+            [block.block_hash for block in blocks]
+    finally:
+        store.close()
+
+    store = SegmentBlockStore(str(tmp_path), max_segment_bytes=4096, compression=compression)
+    try:
+        assert [block.to_dict() for block in store.iter_blocks()] == [block.to_dict() for block in blocks]
+        assert store.find_block(blocks[0].block_hash) == 0
+    finally:
+        store.close()
@@ -0,0 +1,103 @@
+"""
+Tests for blocks and the blockchain.
+"""
+
+import pickle
+
+from core.blockchain.block import BlockBuilder
+from core.blockchain.chain import Blockchain
+from core.blockchain.hash_utils import HASH_BLAKE2B
+from core.blockchain.merkle_tree import MerkleMultiproof, MerkleTree
+from core.blockchain.transaction import TransactionBuilder
+
+
+def _transaction(i, algorithm):
+    """Build a signed journal entry hashed with an algorithm."""
+    return TransactionBuilder() \
+        .set_type("journal_entry") \
+        .set_module("accounting") \
+        .set_data({"entry": i}) \
+        .set_wallet("0xabc") \
+        .set_signature("signature") \
+        .set_hash_algorithm(algorithm) \
+        .build()
+
+
+def test_transaction_inclusion_on_blake2b_block():
+    transactions = [_transaction(i, HASH_BLAKE2B) for i in range(5)]
+    block = BlockBuilder(index=1) \
+        .set_previous_hash("0" * 64) \
+        .set_created_by("0xabc") \
+        .set_version("2.0.0") \
+        .add_transactions(transactions) \
+        .build()
+
+    assert block.hash_algorithm == HASH_BLAKE2B
+    assert len(block.transactions) == 5
+    for tx in transactions:
+        assert block.verify_transaction_inclusion(tx.transaction_hash)
+    assert not block.verify_transaction_inclusion("f" * 64)
+
+
+def test_chain_stats_count_transactions_without_reading_blocks(tmp_path):
+    blockchain = Blockchain(str(tmp_path))
+    try:
+        for i in range(3):
+            for j in range(2):
+                blockchain.add_transaction(_transaction(i * 2 + j, blockchain.hash_algorithm))
+            blockchain.create_block("0xabc")
+
+        stats = blockchain.get_chain_stats()
+
+        assert stats["total_blocks"] == 4
+        assert stats["total_transactions"] == 6
+        assert stats["total_transactions"] == sum(len(block.transactions) for block in blockchain.chain)
+    finally:
+        blockchain.close()
+
+
+def test_pending_lookup_follows_approval_rehash(tmp_path):
+    blockchain = Blockchain(str(tmp_path))
+    try:
+        tx = TransactionBuilder() \
+            .set_type("journal_entry") \
+            .set_module("accounting") \
+            .set_data({"entry": 1}) \
+            .set_wallet("0xabc") \
+            .set_signature("signature") \
+            .set_approval_requirements(True, 1) \
+            .build()
+        assert blockchain.add_transaction(tx)
+        old_hash = tx.transaction_hash
+
+        tx.add_approval("0xdef", "approval signature", "manager")
+
+        assert tx.transaction_hash != old_hash
+        assert blockchain.get_pending_transaction(tx.transaction_hash) is tx
+        assert blockchain.get_pending_transaction(old_hash) is None
+        # The rehash callback is not pickled with the transaction
+        assert pickle.loads(pickle.dumps(tx)) == tx
+
+        blockchain.create_block("0xabc")
+        assert blockchain.get_pending_transaction(tx.transaction_hash) is None
+    finally:
+        blockchain.close()
+
+
+def test_inclusion_multiproof_verifies_against_block_root(tmp_path):
+    blockchain = Blockchain(str(tmp_path))
+    try:
+        transactions = [_transaction(i, blockchain.hash_algorithm) for i in range(7)]
+        for tx in transactions:
+            blockchain.add_transaction(tx)
+        block = blockchain.create_block("0xabc")
+        sample = [transactions[5].transaction_hash, transactions[1].transaction_hash]
+
+        result = blockchain.get_inclusion_multiproof(block.index, sample)
+
+        proof = MerkleMultiproof.from_dict(result["multiproof"])
+        assert sorted(result["transaction_hashes"]) == sorted(sample)
+        assert MerkleTree.verify_multiproof(result["transaction_hashes"], proof, block.merkle_root)
+        assert blockchain.get_inclusion_multiproof(block.index, sample + ["f" * 64]) is None
+    finally:
+        blockchain.close()
@@ -0,0 +1,98 @@
+"""
+Tests for NDJSON chain export and import.
+"""
+
+from core.blockchain.block import BlockBuilder
+from core.blockchain.chain import Blockchain
+from core.blockchain.hash_utils import HASH_BLAKE2B
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.chain_export import export_ndjson
+
+
+def _transaction(i, algorithm=None):
+    """Build a signed journal entry."""
+    builder = TransactionBuilder() \
+        .set_type("journal_entry") \
+        .set_module("accounting") \
+        .set_data({"entry": i}) \
+        .set_wallet("0xabc") \
+        .set_signature("signature")
+    if algorithm is not None:
+        builder.set_hash_algorithm(algorithm)
+    return builder.build()
+
+
+def _add_blocks(blockchain, count):
+    """Append blocks of two transactions each."""
+    for i in range(count):
+        blockchain.add_transaction(_transaction(2 * i))
+        blockchain.add_transaction(_transaction(2 * i + 1))
+        blockchain.create_block("0xabc")
+
+
+def test_incremental_export_round_trip(tmp_path):
+    source = Blockchain(str(tmp_path / "source"), checkpoint_interval=2)
+    try:
+        _add_blocks(source, 3)
+        first = source.export_ndjson(str(tmp_path / "first.ndjson"))
+        assert first.block_count == 4
+
+        replica = Blockchain.from_ndjson(str(tmp_path / "first.ndjson"), str(tmp_path / "replica"))
+        try:
+            _add_blocks(source, 4)
+            second = source.export_ndjson(str(tmp_path / "second.ndjson"), start=len(replica.chain))
+            assert second.first_index == 4 and second.block_count == 4
+            assert second.state_digest == source.state_digest
+
+            assert replica.import_ndjson(str(tmp_path / "second.ndjson"))
+            assert replica.get_latest_block().block_hash == source.get_latest_block().block_hash
+            assert replica.state_digest == source.state_digest
+            assert replica.verify_chain()
+        finally:
+            replica.close()
+    finally:
+        source.close()
+
+
+def test_import_without_manifest_leaves_chain_unchanged(tmp_path):
+    source = Blockchain(str(tmp_path / "source"))
+    try:
+        _add_blocks(source, 2)
+        source.export_ndjson(str(tmp_path / "first.ndjson"))
+        replica = Blockchain.from_ndjson(str(tmp_path / "first.ndjson"), str(tmp_path / "replica"))
+        try:
+            _add_blocks(source, 3)
+            export_path = tmp_path / "second.ndjson"
+            source.export_ndjson(str(export_path), start=len(replica.chain))
+            lines = export_path.read_bytes().splitlines(keepends=True)
+            export_path.write_bytes(b"".join(lines[:-1]))
+
+            assert not replica.import_ndjson(str(export_path))
+            assert len(replica.chain) == 3
+            assert len(replica.store) == 3
+            assert not list((tmp_path / "replica").glob("import_*"))
+        finally:
+            replica.close()
+    finally:
+        source.close()
+
+
+def test_import_rejects_block_with_another_hash_algorithm(tmp_path):
+    blockchain = Blockchain(str(tmp_path / "chain"))
+    try:
+        _add_blocks(blockchain, 1)
+        tip = blockchain.get_latest_block()
+        block = BlockBuilder(index=tip.index + 1) \
+            .set_previous_hash(tip.block_hash) \
+            .set_created_by("0xabc") \
+            .set_version("2.0.0") \
+            .add_transactions([_transaction(i, HASH_BLAKE2B) for i in range(2)]) \
+            .build()
+        assert block.hash_algorithm == HASH_BLAKE2B
+        export_path = str(tmp_path / "blake2b.ndjson")
+        export_ndjson([block], export_path, previous_state_digest=blockchain.state_digest)
+
+        assert not blockchain.import_ndjson(export_path)
+        assert len(blockchain.chain) == 2
+    finally:
+        blockchain.close()
@@ -0,0 +1,92 @@
+"""
+Tests for trusting verified checkpoints when a chain is loaded.
+"""
+
+import json
+
+from core.blockchain.chain import Blockchain
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.checkpoint import CheckpointManager
+
+INTERVAL = 4
+BLOCKS = 10
+
+
+def _build_chain(path):
+    """Build a chain with a checkpoint every INTERVAL blocks and return its state digest."""
+    blockchain = Blockchain(str(path), checkpoint_interval=INTERVAL)
+    try:
+        for i in range(BLOCKS):
+            blockchain.add_transaction(TransactionBuilder()
+                                       .set_type("journal_entry")
+                                       .set_module("accounting")
+                                       .set_data({"entry": i})
+                                       .set_wallet("0xabc")
+                                       .set_signature("signature")
+                                       .build())
+            blockchain.create_block("0xabc")
+        return blockchain.state_digest
+    finally:
+        blockchain.close()
+
+
+def _verified_starts(monkeypatch):
+    """Record the first block index of every sequential verification."""
+    starts = []
+    verify_blocks = Blockchain._verify_blocks
+
+    def recording(self, start, stop, deep=False):
+        starts.append(start)
+        return verify_blocks(self, start, stop, deep)
+
+    monkeypatch.setattr(Blockchain, "_verify_blocks", recording)
+    return starts
+
+
+def test_load_only_verifies_blocks_after_the_latest_checkpoint(tmp_path, monkeypatch):
+    state_digest = _build_chain(tmp_path)
+    assert CheckpointManager(str(tmp_path)).list_heights() == [4, 8]
+    starts = _verified_starts(monkeypatch)
+
+    blockchain = Blockchain(str(tmp_path), checkpoint_interval=INTERVAL)
+    try:
+        assert blockchain.checkpoint_height == 8
+        assert blockchain.verified_height == BLOCKS
+        assert blockchain.state_digest == state_digest
+        assert starts == [9]
+    finally:
+        blockchain.close()
+
+
+def test_altered_checkpoint_file_is_not_trusted(tmp_path):
+    state_digest = _build_chain(tmp_path)
+    path = CheckpointManager(str(tmp_path)).directory / "checkpoint_000000000008.json"
+    data = json.loads(path.read_text())
+    data["state_digest"] = "0" * 64
+    path.write_text(json.dumps(data))
+
+    blockchain = Blockchain(str(tmp_path), checkpoint_interval=INTERVAL)
+    try:
+        assert blockchain.checkpoint_height == 4
+        assert blockchain.state_digest == state_digest
+    finally:
+        blockchain.close()
+
+
+def test_full_verification_drops_a_checkpoint_that_does_not_match_the_chain(tmp_path, monkeypatch):
+    _build_chain(tmp_path)
+    checkpoints = CheckpointManager(str(tmp_path))
+    # Well-formed, but not the digest of the stored chain
+    checkpoints.write(8, checkpoints.load(8).tip_hash, "0" * 64)
+
+    blockchain = Blockchain(str(tmp_path), checkpoint_interval=INTERVAL)
+    try:
+        assert blockchain.checkpoint_height == 8
+        assert not blockchain.reverify_chain()
+        assert blockchain.checkpoint_height == -1
+
+        starts = _verified_starts(monkeypatch)
+        assert blockchain.load_chain(full_verification=True) is False
+        assert starts == [0]
+    finally:
+        blockchain.close()
@@ -0,0 +1,111 @@
+"""
+Tests for the binary block codec and block record formats.
+"""
+
+import pytest
+
+from core.blockchain import codec
+from core.blockchain.block import BlockBuilder
+from core.blockchain.codec import CodecError
+from core.blockchain.hash_utils import HASH_BLAKE2B
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.block_store import (
+    FORMAT_BINARY,
+    FORMAT_JSON,
+    RECORD_FORMATS,
+    SegmentBlockStore,
+    decode_block,
+    encode_block,
+)
+
+# Values covering every encoded type, including ones the codec special-cases
+ENTRY_DATA = {
+    "description": "Büroausstattung ✓",
+    "amount": 1234.5,
+    "quantity": -3,
+    "large": 2 ** 70,
+    "posted": True,
+    "reference": None,
+    "lines": [{"account": "1000", "debit": 0.1}, {"account": "2000", "credit": 0.1}],
+    "invoice_hash": "ab" * 32,
+    "almost_hash": "AB" * 32,
+    "customer_id": "123e4567-e89b-12d3-a456-426614174000",
+}
+
+
+def _block(index=1, previous_hash="0" * 64, version=None, algorithm=None):
+    """Build a block with varied transaction data and an approval."""
+    transactions = []
+    for i in range(3):
+        builder = TransactionBuilder() \
+            .set_type("journal_entry") \
+            .set_module("accounting") \
+            .set_data(dict(ENTRY_DATA, entry=i)) \
+            .set_wallet("0xabc") \
+            .set_signature("signature") \
+            .set_metadata({"source": "import"}) \
+            .set_approval_requirements(True, 1)
+        if algorithm is not None:
+            builder.set_hash_algorithm(algorithm)
+        tx = builder.build()
+        tx.add_approval("0xdef", "approval-signature", "manager")
+        transactions.append(tx)
+
+    builder = BlockBuilder(index=index) \
+        .set_previous_hash(previous_hash) \
+        .set_created_by("0xabc") \
+        .add_transactions(transactions)
+    if version is not None:
+        builder.set_version(version)
+    return builder.build()
+
+
+@pytest.mark.parametrize("record_format", RECORD_FORMATS)
+def test_block_record_round_trip(record_format):
+    for block in (_block(), _block(version="2.0.0", algorithm=HASH_BLAKE2B)):
+        decoded = decode_block(record_format, encode_block(block, record_format))
+
+        assert decoded.to_dict() == block.to_dict()
+        assert decoded.verify_integrity(deep=True)
+        assert all(tx.verify_integrity(deep=True) for tx in decoded.transactions)
+
+
+def test_binary_encoding_is_smaller_and_deterministic():
+    block = _block()
+    payload = codec.encode_block(block)
+
+    assert payload == codec.encode_block(codec.decode_block(payload))
+    assert len(payload) < len(encode_block(block, FORMAT_JSON))
+
+    transaction = block.transactions[0]
+    assert codec.decode_transaction(codec.encode_transaction(transaction)).to_dict() == transaction.to_dict()
+
+
+def test_block_stream_round_trip_and_truncation():
+    blocks = [_block(index) for index in range(1, 4)]
+    data = b"".join(codec.write_block_stream(blocks))
+
+    assert [block.to_dict() for block in codec.read_block_stream(data)] == [block.to_dict() for block in blocks]
+    with pytest.raises(CodecError):
+        list(codec.read_block_stream(data[:-1]))
+
+
+def test_store_reads_records_of_both_formats(tmp_path):
+    first = _block(index=0)
+    second = _block(index=1, previous_hash=first.block_hash)
+
+    store = SegmentBlockStore(str(tmp_path), record_format=FORMAT_JSON)
+    try:
+        store.append_block(first)
+    finally:
+        store.close()
+
+    store = SegmentBlockStore(str(tmp_path), record_format=FORMAT_BINARY)
+    try:
+        store.append_block(second)
+        assert [record_format for _, record_format, _ in store.iter_block_payloads()] == \
+            [FORMAT_JSON, FORMAT_BINARY]
+        assert [block.to_dict() for block in store.iter_blocks()] == [first.to_dict(), second.to_dict()]
+        assert store.find_block(second.block_hash) == 1
+    finally:
+        store.close()
@@ -0,0 +1,65 @@
+"""
+Tests for Merkle multiproofs.
+"""
+
+import hashlib
+import random
+
+import pytest
+
+from core.blockchain.hash_utils import HASH_ALGORITHMS
+from core.blockchain.merkle_tree import MERKLE_SCHEMES, MerkleMultiproof, MerkleTree
+
+
+def _hashes(count):
+    """Distinct hex leaf hashes."""
+    return [hashlib.sha256(b"leaf %d" % i).hexdigest() for i in range(count)]
+
+
+@pytest.mark.parametrize("scheme", MERKLE_SCHEMES)
+@pytest.mark.parametrize("algorithm", HASH_ALGORITHMS)
+def test_multiproofs_verify_for_every_tree_shape(scheme, algorithm):
+    rng = random.Random(7)
+    for count in range(1, 18):
+        hashes = _hashes(count)
+        tree = MerkleTree(hashes, scheme, algorithm)
+        root = tree.get_root_hash()
+        for size in range(1, count + 1):
+            sample = rng.sample(hashes, size)
+            proof = tree.get_multiproof(sample)
+            proven = [hashes[index] for index in proof.indices]
+
+            assert MerkleTree.verify_multiproof(proven, proof, root)
+            # Shared siblings are sent once
+            assert len(proof.hashes) <= sum(len(tree.get_proof(tx_hash)) for tx_hash in sample)
+
+
+def test_multiproof_rejects_tampering():
+    hashes = _hashes(11)
+    tree = MerkleTree(hashes)
+    root = tree.get_root_hash()
+    proof = tree.get_multiproof([hashes[2], hashes[7], hashes[8]])
+    proven = [hashes[index] for index in proof.indices]
+    assert MerkleTree.verify_multiproof(proven, MerkleMultiproof.from_dict(proof.to_dict()), root)
+
+    assert not MerkleTree.verify_multiproof([proven[0], hashes[3], proven[2]], proof, root)
+    assert not MerkleTree.verify_multiproof(proven[::-1], proof, root)
+    assert not MerkleTree.verify_multiproof(proven[:2], proof, root)
+
+    missing = MerkleMultiproof.from_dict(dict(proof.to_dict(), hashes=proof.hashes[:-1]))
+    assert not MerkleTree.verify_multiproof(proven, missing, root)
+    extra = MerkleMultiproof.from_dict(dict(proof.to_dict(), hashes=proof.hashes + [hashes[0]]))
+    assert not MerkleTree.verify_multiproof(proven, extra, root)
+    too_small = MerkleMultiproof.from_dict(dict(proof.to_dict(), leaf_count=8))
+    assert not MerkleTree.verify_multiproof(proven, too_small, root)
+
+
+def test_multiproof_of_unknown_or_no_leaves():
+    hashes = _hashes(4)
+    tree = MerkleTree(hashes)
+
+    assert tree.get_multiproof([hashes[0], "f" * 64]) is None
+    with pytest.raises(ValueError):
+        tree.get_multiproof([])
+    with pytest.raises(IndexError):
+        tree.get_multiproof_at([4])
@@ -0,0 +1,94 @@
+"""
+Tests for the Merkle Mountain Range block accumulator.
+"""
+
+import hashlib
+
+from core.blockchain.chain import Blockchain
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.mmr import MMRProof, MerkleMountainRange
+
+
+def _hashes(count):
+    """Distinct hex block hashes."""
+    return [hashlib.sha256(b"block %d" % i).hexdigest() for i in range(count)]
+
+
+def test_proofs_verify_at_every_historical_size():
+    hashes = _hashes(33)
+    mmr = MerkleMountainRange()
+    for block_hash in hashes:
+        mmr.append(block_hash)
+
+    for leaf_count in range(1, len(hashes) + 1):
+        root = mmr.get_root(leaf_count)
+        for leaf_index in range(leaf_count):
+            proof = MMRProof.from_dict(mmr.get_proof(leaf_index, leaf_count).to_dict())
+            assert MerkleMountainRange.verify_proof(hashes[leaf_index], proof, root)
+            assert len(proof.path) + len(proof.peaks) <= 2 * leaf_count.bit_length()
+
+    assert mmr.get_proof(33) is None
+    assert mmr.get_proof(5, leaf_count=5) is None
+
+
+def test_proof_rejects_wrong_leaf_root_or_path():
+    hashes = _hashes(21)
+    mmr = MerkleMountainRange()
+    for block_hash in hashes:
+        mmr.append(block_hash)
+    root = mmr.get_root()
+    proof = mmr.get_proof(9)
+
+    assert MerkleMountainRange.verify_proof(hashes[9], proof, root)
+    assert not MerkleMountainRange.verify_proof(hashes[10], proof, root)
+    assert not MerkleMountainRange.verify_proof(hashes[9], proof, mmr.get_root(20))
+    short = MMRProof.from_dict(dict(proof.to_dict(), path=proof.path[:-1]))
+    assert not MerkleMountainRange.verify_proof(hashes[9], short, root)
+    moved = MMRProof.from_dict(dict(proof.to_dict(), leaf_index=8))
+    assert not MerkleMountainRange.verify_proof(hashes[9], moved, root)
+
+
+def test_file_backed_range_survives_reopen_truncation_and_torn_tail(tmp_path):
+    path = tmp_path / MerkleMountainRange.FILE_NAME
+    hashes = _hashes(19)
+    mmr = MerkleMountainRange(str(path))
+    for block_hash in hashes:
+        mmr.append(block_hash)
+    roots = [mmr.get_root(leaf_count) for leaf_count in range(1, len(hashes) + 1)]
+    mmr.close()
+
+    # A crash mid-append leaves part of a node behind
+    with open(path, 'ab') as f:
+        f.write(b"\x00" * 40)
+    mmr = MerkleMountainRange(str(path))
+    try:
+        assert len(mmr) == len(hashes)
+        assert mmr.get_root() == roots[-1]
+        mmr.truncate(12)
+        assert len(mmr) == 12 and mmr.get_root() == roots[11]
+        assert mmr.get_leaf(11) == hashes[11] and mmr.get_leaf(12) is None
+    finally:
+        mmr.close()
+
+
+def test_block_proof_from_chain(tmp_path):
+    blockchain = Blockchain(str(tmp_path))
+    try:
+        for i in range(6):
+            blockchain.add_transaction(TransactionBuilder()
+                                       .set_type("journal_entry")
+                                       .set_module("accounting")
+                                       .set_data({"entry": i})
+                                       .set_wallet("0xabc")
+                                       .set_signature("signature")
+                                       .build())
+            blockchain.create_block("0xabc")
+
+        result = blockchain.get_block_proof(2, height=4)
+
+        assert result["block_hash"] == blockchain.chain[2].block_hash
+        assert MerkleMountainRange.verify_proof(result["block_hash"], MMRProof.from_dict(result["proof"]),
+                                                result["root"])
+        assert blockchain.get_block_proof(5, height=4) is None
+    finally:
+        blockchain.close()
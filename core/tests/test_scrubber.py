@@ -0,0 +1,135 @@
+"""
+Tests for the background integrity scrubber.
+"""
+
+import threading
+
+from core.blockchain.block import BlockBuilder
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.block_store import SegmentBlockStore, encode_block
+from core.storage.scrubber import IntegrityScrubber
+
+BLOCKS = 8
+
+
+def _build_store(path):
+    """Store a linked run of blocks and return the store and their hashes."""
+    store = SegmentBlockStore(str(path))
+    previous_hash = "0" * 64
+    hashes = []
+    for index in range(BLOCKS):
+        block = BlockBuilder(index=index) \
+            .set_previous_hash(previous_hash) \
+            .set_created_by("0xabc") \
+            .add_transaction(TransactionBuilder()
+                             .set_type("journal_entry")
+                             .set_module("accounting")
+                             .set_data({"block": index})
+                             .set_wallet("0xabc")
+                             .set_signature("signature")
+                             .build()) \
+            .build()
+        store.append_block(block)
+        previous_hash = block.block_hash
+        hashes.append(block.block_hash)
+    return store, hashes
+
+
+def _findings(scrubber):
+    """Findings reported so far, as (block index, finding) pairs."""
+    return [(anomaly["metadata"]["block_index"], anomaly["metadata"]["finding"])
+            for anomaly in scrubber.findings]
+
+
+def test_clean_store_completes_a_pass_without_findings(tmp_path):
+    store, hashes = _build_store(tmp_path)
+    try:
+        scrubber = IntegrityScrubber(store, dict(enumerate(hashes)).get)
+        while scrubber.completed_passes == 0:
+            scrubber.run_once(max_blocks=3)
+
+        assert not scrubber.findings
+        assert scrubber.blocks_scrubbed == BLOCKS
+        assert scrubber.last_scrubbed_height == BLOCKS - 1
+    finally:
+        store.close()
+
+
+def test_blocks_differing_from_recorded_hashes_are_reported(tmp_path):
+    store, hashes = _build_store(tmp_path)
+    try:
+        recorded = dict(enumerate(hashes))
+        recorded[3] = "f" * 64
+        scrubber = IntegrityScrubber(store, recorded.get)
+        scrubber.run_once(max_blocks=BLOCKS)
+
+        assert _findings(scrubber) == [(3, "recorded_hash_mismatch"), (4, "chain_break")]
+    finally:
+        store.close()
+
+
+def test_modified_transaction_is_reported(tmp_path):
+    store, hashes = _build_store(tmp_path)
+    try:
+        block = store.read_block(2)
+        block.transactions[0].data["block"] = 99
+        scrubber = IntegrityScrubber(store, dict(enumerate(hashes)).get)
+
+        anomalies = scrubber.verify_record(2, store.record_format, encode_block(block))
+
+        assert [anomaly["metadata"]["finding"] for anomaly in anomalies] == ["transaction_hash_mismatch"]
+        assert anomalies[0]["anomaly_type"] == "hash_chain_break"
+        assert anomalies[0]["transaction_reference"] == block.transactions[0].transaction_hash
+    finally:
+        store.close()
+
+
+def test_corrupt_record_is_reported_and_skipped(tmp_path):
+    store, hashes = _build_store(tmp_path)
+    store.close()
+    segment = store.log.segment_path(0)
+    data = bytearray(segment.read_bytes())
+    position = data.index(hashes[5].encode())
+    data[position] ^= 0x01
+    segment.write_bytes(bytes(data))
+
+    store = SegmentBlockStore(str(tmp_path))
+    try:
+        scrubber = IntegrityScrubber(store, dict(enumerate(hashes)).get)
+        while scrubber.completed_passes == 0:
+            scrubber.run_once()
+
+        assert (5, "corrupt_record") in _findings(scrubber)
+        assert scrubber.blocks_scrubbed == BLOCKS
+    finally:
+        store.close()
+
+
+def test_position_is_resumed_from_the_state_file(tmp_path):
+    store, hashes = _build_store(tmp_path / "chain")
+    try:
+        scrubber = IntegrityScrubber(store, dict(enumerate(hashes)).get, str(tmp_path))
+        scrubber.run_once(max_blocks=3)
+
+        resumed = IntegrityScrubber(store, dict(enumerate(hashes)).get, str(tmp_path))
+        assert resumed.next_height == 3
+        assert resumed.last_scrubbed_height == 2
+    finally:
+        store.close()
+
+
+def test_background_thread_reports_anomalies(tmp_path):
+    store, hashes = _build_store(tmp_path)
+    reported = threading.Event()
+    recorded = dict(enumerate(hashes))
+    recorded[BLOCKS - 1] = "f" * 64
+    scrubber = IntegrityScrubber(store, recorded.get, io_bytes_per_second=None, cpu_fraction=1.0,
+                                 idle_seconds=0.01, on_anomaly=lambda anomaly: reported.set())
+    try:
+        scrubber.start()
+        assert reported.wait(10)
+        assert scrubber.running
+    finally:
+        scrubber.stop(timeout=10)
+        store.close()
+    assert not scrubber.running
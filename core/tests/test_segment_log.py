@@ -0,0 +1,98 @@
+"""
+Tests for the segmented record log.
+"""
+
+import os
+
+from core.storage.segment_log import SegmentedLog
+
+
+def _keys(count):
+    """Random 32-byte index keys."""
+    return [os.urandom(32) for _ in range(count)]
+
+
+def test_find_key_across_sealed_and_active_segments(tmp_path):
+    keys = _keys(300)
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    try:
+        for number, key in enumerate(keys):
+            log.append(b"record %d" % number * 4, key, 1)
+
+        assert all(log.find_key(key) == number for number, key in enumerate(keys))
+        assert log.find_key(os.urandom(32)) is None
+    finally:
+        log.close()
+
+    # Sealed segments are searched through their key files after reopening
+    assert list(tmp_path.glob(f"{SegmentedLog.KEY_FILE_PREFIX}*"))
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    try:
+        assert log.find_key(keys[123]) == 123
+    finally:
+        log.close()
+
+
+def test_find_key_returns_first_record_and_handles_shared_prefixes(tmp_path):
+    keys = _keys(100)
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    try:
+        for key in keys:
+            log.append(b"x" * 64, key, 1)
+        log.append(b"duplicate", keys[10], 1)
+        shared = keys[20][:8] + os.urandom(24)
+        number = log.append(b"shared prefix", shared, 1)
+
+        assert log.find_key(keys[10]) == 10
+        assert log.find_key(shared) == number
+        assert log.find_key(keys[20][:8] + os.urandom(24)) is None
+    finally:
+        log.close()
+
+
+def _fill(log, count):
+    """Append numbered records and return their payloads."""
+    payloads = [b"record %d " % number * 8 for number in range(count)]
+    for payload in payloads:
+        log.append(payload, os.urandom(32), 1)
+    return payloads
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    payloads = _fill(log, 50)
+    log.close()
+
+    # An append interrupted after part of its record was written
+    last_segment = sorted(tmp_path.glob(f"{SegmentedLog.SEGMENT_PREFIX}*{SegmentedLog.SEGMENT_SUFFIX}"))[-1]
+    intact_size = last_segment.stat().st_size
+    with open(last_segment, 'ab') as f:
+        f.write(b"\x01\x02\x03")
+
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    try:
+        assert len(log) == len(payloads)
+        assert log.truncated_bytes == 3
+        assert last_segment.stat().st_size == intact_size
+        assert log.read(len(payloads) - 1) == (1, payloads[-1])
+        assert log.append(b"after recovery", os.urandom(32), 1) == len(payloads)
+    finally:
+        log.close()
+
+
+def test_missing_index_entries_are_rebuilt_from_segments(tmp_path):
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    payloads = _fill(log, 50)
+    index_path = log.index_path
+    log.close()
+
+    # Lose the index entries of records appended before a crash
+    os.truncate(index_path, index_path.stat().st_size // 3)
+
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1024)
+    try:
+        assert len(log) == len(payloads)
+        assert [payload for _, _, payload in log.scan()] == payloads
+        assert log.read(len(payloads) - 1) == (1, payloads[-1])
+    finally:
+        log.close()
@@ -0,0 +1,77 @@
+"""
+Tests for the SQLite storage backend.
+"""
+
+import pytest
+
+from core.blockchain.block import Block
+from core.blockchain.chain import Blockchain
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.segment_log import StorageError
+from core.storage.sqlite_store import SQLiteBlockStore
+
+
+def _transaction(i):
+    """Build a signed entry alternating between two modules and wallets."""
+    return TransactionBuilder() \
+        .set_type("journal_entry" if i % 2 else "invoice") \
+        .set_module("accounting" if i % 2 else "sales") \
+        .set_data({"entry": i}) \
+        .set_wallet("0xaaa" if i % 2 else "0xbbb") \
+        .set_signature("signature") \
+        .build()
+
+
+def _add_blocks(blockchain, count):
+    """Append blocks of two transactions each."""
+    for i in range(count):
+        blockchain.add_transaction(_transaction(2 * i))
+        blockchain.add_transaction(_transaction(2 * i + 1))
+        blockchain.create_block("0xabc")
+
+
+def test_sqlite_chain_round_trip_and_indexed_queries(tmp_path):
+    blockchain = Blockchain(str(tmp_path), storage_backend="sqlite")
+    try:
+        _add_blocks(blockchain, 5)
+        tip_hash = blockchain.get_latest_block().block_hash
+    finally:
+        blockchain.close()
+
+    reopened = Blockchain(str(tmp_path), storage_backend="sqlite")
+    try:
+        assert reopened.get_latest_block().block_hash == tip_hash
+        assert reopened.verify_chain()
+        assert reopened.store.find_block(tip_hash) == 5
+        assert reopened.store.find_transactions("module", "sales") == [(i, 0) for i in range(1, 6)]
+        assert reopened.locate_transactions("from_wallet", "0xaaa") == [(i, 1) for i in range(1, 6)]
+        assert [tx.data["entry"] for tx in reopened.get_transactions_by_type("invoice")] == [0, 2, 4, 6, 8]
+
+        tx = reopened.store.read_transaction(3, 1)
+        assert tx.transaction_hash == reopened.chain[3].transactions[1].transaction_hash
+    finally:
+        reopened.close()
+
+
+def test_failed_append_is_rolled_back(tmp_path):
+    source = Blockchain(str(tmp_path / "source"))
+    store = SQLiteBlockStore(str(tmp_path / "ledger.db"))
+    try:
+        _add_blocks(source, 2)
+        store.append_block(source.chain[0])
+        with pytest.raises(StorageError, match="Expected block index 1"):
+            store.append_block(source.chain[2])
+
+        # A block whose hash is already stored violates the unique hash index
+        duplicate = source.chain[1].to_dict()
+        duplicate["block_hash"] = source.chain[0].block_hash
+        with pytest.raises(StorageError):
+            store.append_block(Block.from_dict(duplicate))
+        assert len(store) == 1
+        assert store.read_transaction(1, 0) is None
+
+        store.append_block(source.chain[1])
+        assert store.read_block(1).block_hash == source.chain[1].block_hash
+    finally:
+        store.close()
+        source.close()
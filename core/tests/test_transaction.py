@@ -0,0 +1,54 @@
+"""
+Tests for transactions and their hash cache.
+"""
+
+import pytest
+
+from core.blockchain.immutable import ImmutableError
+from core.blockchain.transaction import TransactionBuilder
+from core.blockchain.validator import BlockchainValidator
+
+
+def _transaction():
+    """Build a signed journal entry."""
+    return TransactionBuilder() \
+        .set_type("journal_entry") \
+        .set_module("accounting") \
+        .set_data({"amount": 100}) \
+        .set_wallet("0xabc") \
+        .set_signature("signature") \
+        .build()
+
+
+def test_in_place_mutation_fails_integrity_before_sealing():
+    tx = _transaction()
+    assert tx.verify_integrity()
+
+    tx.data["amount"] = 999
+
+    assert not tx.verify_integrity()
+    assert not tx.verify_integrity(deep=True)
+    # A deep check does not make the next shallow check pass
+    assert not tx.verify_integrity()
+    is_valid, error = BlockchainValidator.validate_transaction(tx)
+    assert not is_valid
+    assert error == "Transaction hash integrity check failed"
+
+
+def test_recalculated_hash_is_valid_after_mutation():
+    tx = _transaction()
+    tx.data["amount"] = 999
+    tx.invalidate_hash_cache()
+    tx.recalculate_hash()
+
+    assert tx.verify_integrity()
+
+
+def test_sealed_transaction_rejects_mutation():
+    tx = _transaction().seal()
+
+    with pytest.raises(ImmutableError):
+        tx.status = "approved"
+    with pytest.raises(ImmutableError):
+        tx.data["amount"] = 999
+    assert tx.verify_integrity()
@@ -0,0 +1,52 @@
+"""
+Tests for the transaction and wallet indexes.
+"""
+
+from core.blockchain.block import BlockBuilder
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.tx_index import WalletIndex
+
+WALLETS = ("0xAAA", "0xBBB")
+
+
+def _block(index):
+    """Build a block with one journal entry per wallet."""
+    builder = BlockBuilder(index=index).set_previous_hash("0" * 64).set_created_by("0xabc")
+    for wallet in WALLETS:
+        builder.add_transaction(TransactionBuilder()
+                                .set_type("journal_entry")
+                                .set_module("accounting")
+                                .set_data({"block": index})
+                                .set_wallet(wallet)
+                                .set_signature("signature")
+                                .build())
+    return builder.build()
+
+
+def _all_pages(index, wallet, limit):
+    """Collect every page of a wallet's postings."""
+    postings, cursor = index.page(wallet, limit)
+    while cursor is not None:
+        page, cursor = index.page(wallet, limit, cursor)
+        postings.extend(page)
+    return postings
+
+
+def test_wallet_pages_are_read_from_the_record_file(tmp_path):
+    path = tmp_path / WalletIndex.FILE_NAME
+    blocks = [_block(i) for i in range(1, 11)]
+    index = WalletIndex(str(path))
+    for block in blocks:
+        index.add_block(block)
+    index.truncate(8)
+    index.close()
+
+    reopened = WalletIndex(str(path))
+    try:
+        assert reopened.indexed_height == 7
+        assert reopened.count("0xaaa") == 7
+        expected = [(block.timestamp, block.index, 0) for block in reversed(blocks[:7])]
+        assert _all_pages(reopened, "0xAAA", limit=3) == expected
+        assert list(reopened.iter_postings("0xaaa")) == expected[::-1]
+    finally:
+        reopened.close()
@@ -0,0 +1,86 @@
+"""
+Tests for chain validation from storage.
+"""
+
+from core.blockchain.block import Block
+from core.blockchain.chain import Blockchain
+from core.blockchain.transaction import TransactionBuilder
+from core.blockchain.validator import BlockchainValidator
+from core.storage.parallel_loader import ParallelChainLoader
+
+CHUNK_SIZE = 4
+# Last block of the first chunk of a full validation
+CORRUPT_INDEX = CHUNK_SIZE - 1
+
+
+def _build_chain(path, blocks):
+    """Build a chain with one journal entry per block after genesis."""
+    blockchain = Blockchain(str(path))
+    for i in range(blocks):
+        blockchain.add_transaction(TransactionBuilder()
+                                   .set_type("journal_entry")
+                                   .set_module("accounting")
+                                   .set_data({"entry": i})
+                                   .set_wallet("0xabc")
+                                   .set_signature("signature")
+                                   .build())
+        blockchain.create_block("0xabc")
+    return blockchain
+
+
+def _corrupt_payload(monkeypatch, store, index):
+    """Make the stored payload of one block undecodable."""
+    iter_block_payloads = store.iter_block_payloads
+
+    def corrupted(start=0):
+        for block_index, record_format, payload in iter_block_payloads(start):
+            if block_index == index:
+                payload = payload[:len(payload) // 2]
+            yield block_index, record_format, payload
+
+    monkeypatch.setattr(store, "iter_block_payloads", corrupted)
+
+
+def test_validation_links_the_block_after_an_undecodable_chunk_end(tmp_path, monkeypatch):
+    blockchain = _build_chain(tmp_path, 3 * CHUNK_SIZE)
+    try:
+        _corrupt_payload(monkeypatch, blockchain.store, CORRUPT_INDEX)
+
+        is_valid, errors = BlockchainValidator.validate_chain(
+            blockchain, full=True, workers=2, chunk_size=CHUNK_SIZE)
+
+        assert not is_valid
+        assert errors == [f"Block {CORRUPT_INDEX}: Stored block cannot be decoded"]
+        assert blockchain.validated_height == CORRUPT_INDEX - 1
+    finally:
+        blockchain.close()
+
+
+def test_validation_checks_the_link_after_an_undecodable_chunk_end(tmp_path, monkeypatch):
+    blockchain = _build_chain(tmp_path, 3 * CHUNK_SIZE)
+    try:
+        _corrupt_payload(monkeypatch, blockchain.store, CORRUPT_INDEX)
+        # The next range starts with a block that does not link to the chain
+        unlinked = blockchain.chain[CORRUPT_INDEX].to_dict()
+        unlinked["block_hash"] = "f" * 64
+        blockchain.chain[CORRUPT_INDEX] = Block.from_dict(unlinked)
+
+        _, errors = BlockchainValidator.validate_chain(
+            blockchain, full=True, workers=2, chunk_size=CHUNK_SIZE)
+
+        assert f"Block {CORRUPT_INDEX + 1}: Previous hash mismatch" in errors
+    finally:
+        blockchain.close()
+
+
+def test_parallel_load_stops_at_an_undecodable_chunk_end(tmp_path, monkeypatch):
+    blockchain = _build_chain(tmp_path, 3 * CHUNK_SIZE)
+    try:
+        _corrupt_payload(monkeypatch, blockchain.store, CORRUPT_INDEX)
+
+        result = ParallelChainLoader(blockchain.store, workers=2, chunk_size=CHUNK_SIZE).load()
+
+        assert result.invalid_index == CORRUPT_INDEX
+        assert [header[0] for header in result.headers] == list(range(CORRUPT_INDEX))
+    finally:
+        blockchain.close()
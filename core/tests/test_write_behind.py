@@ -0,0 +1,81 @@
+"""
+Tests for write-behind block persistence.
+"""
+
+import pytest
+
+from core.blockchain.chain import Blockchain
+from core.blockchain.transaction import TransactionBuilder
+from core.storage.block_store import SegmentBlockStore
+from core.storage.segment_log import StorageError
+from core.storage.write_behind import WriteBehindWriter
+
+
+def _add_blocks(blockchain, count):
+    """Append blocks of one journal entry each."""
+    for i in range(count):
+        blockchain.add_transaction(TransactionBuilder()
+                                   .set_type("journal_entry")
+                                   .set_module("accounting")
+                                   .set_data({"entry": i})
+                                   .set_wallet("0xabc")
+                                   .set_signature("signature")
+                                   .build())
+        blockchain.create_block("0xabc")
+
+
+def test_blocks_sealed_behind_the_writer_are_persisted(tmp_path):
+    blockchain = Blockchain(str(tmp_path), write_behind=True)
+    try:
+        _add_blocks(blockchain, 20)
+        assert blockchain.flush(timeout=10)
+        stats = blockchain.get_storage_stats()["write_behind"]
+        assert stats["persisted_height"] == 20 and stats["lag_blocks"] == 0
+        tip_hash = blockchain.get_latest_block().block_hash
+    finally:
+        blockchain.close()
+
+    reopened = Blockchain(str(tmp_path))
+    try:
+        assert len(reopened.chain) == 21
+        assert reopened.get_latest_block().block_hash == tip_hash
+        assert reopened.verify_chain()
+    finally:
+        reopened.close()
+
+
+def test_writer_failure_is_raised_to_callers(tmp_path, monkeypatch):
+    store = SegmentBlockStore(str(tmp_path))
+    blockchain = Blockchain(str(tmp_path / "source"))
+    try:
+        _add_blocks(blockchain, 2)
+        writer = WriteBehindWriter(store)
+
+        def fail(block):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(store, "append_block", fail)
+        writer.submit(blockchain.chain[0])
+        with pytest.raises(StorageError, match="disk full"):
+            writer.flush(timeout=10)
+        with pytest.raises(StorageError):
+            writer.submit(blockchain.chain[1])
+        with pytest.raises(StorageError):
+            writer.close()
+    finally:
+        blockchain.close()
+        store.close()
+
+
+def test_writer_rejects_blocks_out_of_order(tmp_path):
+    store = SegmentBlockStore(str(tmp_path))
+    blockchain = Blockchain(str(tmp_path / "source"))
+    writer = WriteBehindWriter(store)
+    try:
+        _add_blocks(blockchain, 2)
+        with pytest.raises(StorageError, match="Expected block index 0"):
+            writer.submit(blockchain.chain[1])
+    finally:
+        writer.close()
+        blockchain.close()
+        store.close()
@@ -5,18 +5,21 @@ FastAPI-based REST API for the blockchain accounting system
 
 from fastapi import FastAPI, HTTPException, Depends, Body, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import sys
 import os
+import json
 
 # Add parent directory to path to import core modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.main import Web3AccountingSystem
 from core.wallet.signature_verification import SignatureVerifier
+from core.blockchain.codec import write_block_stream, CODEC_VERSION
+from core.blockchain.validator import BlockchainValidator
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -37,7 +40,29 @@ app.add_middleware(
 )
 
 # Initialize the Web3 Accounting System
-system = Web3AccountingSystem()
+# API replicas can set BLOCKCHAIN_MEMORY_MAPPED=1 to serve blocks from the
+# memory-mapped store without loading the whole chain, and
+# BLOCKCHAIN_FULL_VERIFICATION=1 to verify every block instead of trusting
+# the latest checkpoint on startup. BLOCKCHAIN_WRITE_BEHIND=1 persists new
+# blocks from a background writer so block creation does not wait on disk.
+# BLOCKCHAIN_STORAGE_BACKEND selects the storage engine ("segment" or "sqlite")
+# and BLOCKCHAIN_COMPRESSION the codec for cold segments ("zlib" or "lzma").
+# BLOCKCHAIN_LOAD_WORKERS sets the processes used to verify the chain on
+# startup (0 = one per CPU), and BLOCKCHAIN_HASH_ALGORITHM the hash algorithm
+# of a new chain ("SHA-256" or "BLAKE2b"). BLOCKCHAIN_SCRUB=1 re-verifies
+# stored blocks in the background, reading at most BLOCKCHAIN_SCRUB_IO_BYTES
+# per second.
+system = Web3AccountingSystem(
+    memory_mapped=os.environ.get("BLOCKCHAIN_MEMORY_MAPPED", "0") == "1",
+    full_verification=os.environ.get("BLOCKCHAIN_FULL_VERIFICATION", "0") == "1",
+    write_behind=os.environ.get("BLOCKCHAIN_WRITE_BEHIND", "0") == "1",
+    storage_backend=os.environ.get("BLOCKCHAIN_STORAGE_BACKEND", "segment"),
+    compression=os.environ.get("BLOCKCHAIN_COMPRESSION") or None,
+    load_workers=int(os.environ.get("BLOCKCHAIN_LOAD_WORKERS", "1")),
+    hash_algorithm=os.environ.get("BLOCKCHAIN_HASH_ALGORITHM") or None,
+    scrub=os.environ.get("BLOCKCHAIN_SCRUB", "0") == "1",
+    scrub_io_bytes_per_second=float(os.environ.get("BLOCKCHAIN_SCRUB_IO_BYTES", str(4 * 1024 * 1024)))
+)
 
 # Pydantic Models
 class WalletAuth(BaseModel):
@@ -65,6 +90,9 @@ class TransactionRequest(BaseModel):
     wallet_address: str
     signature: str
 
+class InclusionProofRequest(BaseModel):
+    transaction_hashes: Optional[List[str]] = Field(None, description="Hashes to prove (omit for every transaction)")
+
 class ApprovalRequest(BaseModel):
     transaction_hash: str
     approver_wallet: str
@@ -276,8 +304,41 @@ async def get_blockchain_info():
         return {
             "chain_length": len(blockchain.chain),
             "pending_transactions": len(blockchain.pending_transactions),
-            "last_block": blockchain.get_latest_block(),
-            "is_valid": blockchain.is_chain_valid()
+            "last_block": blockchain.get_latest_block().to_dict(),
+            "is_valid": blockchain.verify_chain(),
+            "verified_height": blockchain.verified_height
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/blockchain/verify")
+async def reverify_blockchain(from_disk: bool = False):
+    """Run a full re-verification of the blockchain from genesis"""
+    try:
+        blockchain = get_blockchain()
+        is_valid = blockchain.reverify_chain(from_disk=from_disk)
+
+        return {
+            "is_valid": is_valid,
+            "from_disk": from_disk,
+            "verified_height": blockchain.verified_height,
+            "chain_length": len(blockchain.chain)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/blockchain/scrubber")
+async def get_scrubber_status(limit: int = 100):
+    """Get background scrubber progress and its most recent findings"""
+    try:
+        blockchain = get_blockchain()
+        if blockchain.scrubber is None:
+            return {"running": False, "findings": []}
+
+        findings = list(blockchain.scrubber.findings)
+        return {
+            **blockchain.scrubber.get_stats(),
+            "findings": findings[-limit:] if limit > 0 else []
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -287,10 +348,10 @@ async def get_blocks(limit: int = 10, offset: int = 0):
     """Get blocks from blockchain"""
     try:
         blockchain = get_blockchain()
-        blocks = blockchain.chain[offset:offset + limit]
+        blocks = blockchain.get_blocks(offset=offset, limit=limit)
 
         return {
-            "blocks": blocks,
+            "blocks": [block.to_dict() for block in blocks],
             "total": len(blockchain.chain),
             "limit": limit,
             "offset": offset
@@ -298,18 +359,88 @@ async def get_blocks(limit: int = 10, offset: int = 0):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/replication/blocks")
+async def get_replication_blocks(start: int = 0, limit: int = 100):
+    """Get blocks in the binary codec for replica transfer"""
+    try:
+        blockchain = get_blockchain()
+        blocks = blockchain.get_blocks(offset=start, limit=limit)
+
+        return Response(
+            content=b"".join(write_block_stream(blocks)),
+            media_type="application/octet-stream",
+            headers={
+                "X-Codec-Version": str(CODEC_VERSION),
+                "X-Block-Count": str(len(blocks)),
+                "X-Chain-Length": str(len(blockchain.chain))
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/blockchain/block/{block_index}")
 async def get_block(block_index: int):
     """Get specific block by index"""
     try:
         blockchain = get_blockchain()
+        block = blockchain.get_block_by_index(block_index)
 
-        if block_index < 0 or block_index >= len(blockchain.chain):
+        if block is None:
             raise HTTPException(status_code=404, detail="Block not found")
 
         return {
-            "block": blockchain.chain[block_index]
+            "block": block.to_dict()
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/blockchain/block/{block_index}/proofs")
+async def get_inclusion_proofs(block_index: int, proof_request: InclusionProofRequest):
+    """Get Merkle inclusion proofs for transactions of a block"""
+    try:
+        blockchain = get_blockchain()
+        result = blockchain.get_inclusion_proofs(block_index, proof_request.transaction_hashes)
+
+        if result is None:
+            raise HTTPException(status_code=404, detail="Block not found")
+
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/blockchain/block/{block_index}/multiproof")
+async def get_inclusion_multiproof(block_index: int, proof_request: InclusionProofRequest):
+    """Get one Merkle multiproof for a sample of a block's transactions"""
+    try:
+        blockchain = get_blockchain()
+        result = blockchain.get_inclusion_multiproof(block_index, proof_request.transaction_hashes or [])
+
+        if result is None:
+            raise HTTPException(status_code=404, detail="Block or transaction not found")
+
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/blockchain/block/{block_index}/chain-proof")
+async def get_block_chain_proof(block_index: int, height: Optional[int] = None):
+    """Get a Merkle Mountain Range proof that a block is part of the chain at a height"""
+    try:
+        blockchain = get_blockchain()
+        result = blockchain.get_block_proof(block_index, height)
+
+        if result is None:
+            raise HTTPException(status_code=404, detail="Block not found at this height")
+
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -332,55 +463,69 @@ async def get_transaction(tx_hash: str):
     try:
         blockchain = get_blockchain()
 
-        # Search in all blocks
-        for block in blockchain.chain:
-            for tx in block["transactions"]:
-                if tx["hash"] == tx_hash:
-                    return {
-                        "transaction": tx,
-                        "block_index": block["index"]
-                    }
-
-        # Search in pending transactions
-        for tx in blockchain.pending_transactions:
-            if tx["hash"] == tx_hash:
-                return {
-                    "transaction": tx,
-                    "status": "pending"
-                }
+        # Look up chained transactions in the transaction index
+        location = blockchain.locate_transaction(tx_hash)
+        if location is not None:
+            block_index, position = location
+            return {
+                "transaction": blockchain.get_transaction_at(block_index, position).to_dict(),
+                "block_index": block_index
+            }
+
+        # Then in the pending pool
+        tx = blockchain.get_pending_transaction(tx_hash)
+        if tx is not None:
+            return {
+                "transaction": tx.to_dict(),
+                "status": "pending"
+            }
 
         raise HTTPException(status_code=404, detail="Transaction not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/audit/trail/{wallet_address}")
-async def get_audit_trail(wallet_address: str, limit: int = 50):
-    """Get audit trail for specific wallet"""
+async def get_audit_trail(wallet_address: str, limit: int = 50, cursor: Optional[int] = None):
+    """Get audit trail for specific wallet, most recent first (pass next_cursor for older entries)"""
     try:
         blockchain = get_blockchain()
-        audit_trail = []
 
-        # Search all blocks for transactions by this wallet
-        for block in blockchain.chain:
-            for tx in block["transactions"]:
-                if tx.get("wallet_address") == wallet_address:
-                    audit_trail.append({
-                        "transaction": tx,
-                        "block_index": block["index"],
-                        "block_timestamp": block["timestamp"]
-                    })
-
-        # Sort by timestamp (most recent first)
-        audit_trail.sort(key=lambda x: x["block_timestamp"], reverse=True)
+        # Page through the wallet's posting list
+        audit_trail, next_cursor = blockchain.get_wallet_history(wallet_address, limit=limit, cursor=cursor)
+        for entry in audit_trail:
+            entry["transaction"] = entry["transaction"].to_dict()
 
         return {
             "wallet_address": wallet_address,
-            "audit_trail": audit_trail[:limit],
-            "total_transactions": len(audit_trail)
+            "audit_trail": audit_trail,
+            "total_transactions": blockchain.wallet_index.count(wallet_address),
+            "next_cursor": next_cursor
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/audit/tamper-scan")
+async def scan_tampering(deep: bool = False):
+    """Stream tamper findings as newline-delimited JSON, ending with a summary"""
+    try:
+        blockchain = get_blockchain()
+        findings = BlockchainValidator.scan_tampering(blockchain, deep=deep)
+
+        def stream():
+            # The scan runs while the response is sent, after this handler has
+            # returned, so a failure is reported as the last line
+            try:
+                for finding in findings:
+                    yield json.dumps(finding) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/contracts/list")
 async def list_contracts():
     """List all available smart contracts"""